@@ -0,0 +1,241 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.middleware.csrf import get_token
+from django.urls import path
+from django.utils import timezone
+
+from . import crud, query_budget, search, versioning
+from .pagination import get_page_size
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson está en requirements.txt
+    orjson = None
+
+
+def dumps(data):
+    """
+    Serializa a JSON con ``orjson`` si está instalado, o con ``json`` en su defecto.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+
+
+def loads(body):
+    """
+    Interpreta el cuerpo JSON de la solicitud.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def json_response(data, status=200):
+    """
+    Devuelve una respuesta JSON serializada con ``dumps``.
+    """
+    return HttpResponse(dumps(data), status=status, content_type="application/json")
+
+
+def api_fields(model):
+    """
+    Devuelve los campos que expone la API para un modelo.
+    """
+    return ["id", *model.editable_fields(), "updated_at"]
+
+
+def get_crud(name):
+    """
+    Devuelve la declaración CRUD registrada con ese nombre o responde 404.
+    """
+    try:
+        return crud.registry[name]
+    except KeyError as error:
+        raise Http404(f"Recurso desconocido: {name}") from error
+
+
+def as_form_data(item):
+    """
+    Convierte un objeto JSON a los textos que validan las reglas del formulario.
+    """
+    return {key: "" if value is None else str(value) for key, value in item.items()}
+
+
+def is_id(value):
+    """
+    Indica si el valor es un id: un entero que no sea ``true`` ni ``false``.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def current_data(instance):
+    """
+    Devuelve los campos editables de un registro como datos de formulario.
+    """
+    return as_form_data({field: getattr(instance, field) for field in instance.editable_fields()})
+
+
+def get_instances(model, items):
+    """
+    Lee con una sola consulta los registros que actualiza el lote.
+
+    Devuelve las instancias por id, o None junto con los errores si algún objeto
+    no tiene id o el registro no existe.
+    """
+    errors = {
+        str(index): {"id": "Se esperaba el id del registro"}
+        for index, item in enumerate(items)
+        if not isinstance(item, dict) or not is_id(item.get("id"))
+    }
+    if errors:
+        return None, errors
+
+    instances = model.objects.in_bulk([item["id"] for item in items])
+    missing = {
+        str(index): {"id": "El registro no existe"}
+        for index, item in enumerate(items)
+        if item["id"] not in instances
+    }
+    if missing:
+        return None, missing
+    return instances, None
+
+
+def validate_items(model, items):
+    """
+    Valida cada objeto del lote y devuelve sus errores indexados por posición.
+    """
+    errors = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[str(index)] = {"__all__": "Se esperaba un objeto"}
+            continue
+        item_errors = model.validate(as_form_data(item))
+        if item_errors:
+            errors[str(index)] = item_errors
+    return errors
+
+
+def list_objects(model, request):
+    """
+    Devuelve una página de registros leída con ``values()`` y paginada por cursor,
+    sin instanciar objetos del modelo.
+    """
+    page_size = get_page_size(request)
+    queryset = model.objects.order_by("id")
+    after = request.GET.get("after")
+    if after and after.isdigit():
+        queryset = queryset.filter(id__gt=int(after))
+
+    rows = list(queryset.values(*api_fields(model))[:page_size + 1])
+    next_cursor = rows[page_size - 1]["id"] if len(rows) > page_size else None
+    return {"results": rows[:page_size], "next": next_cursor}
+
+
+def create_objects(model, items):
+    """
+    Crea todos los objetos del lote con un solo ``bulk_create``.
+    """
+    instances = [model(**model.fields_from_data(as_form_data(item))) for item in items]
+    created = model.objects.bulk_create(instances)
+    search.index_documents([search.build_document(instance) for instance in created])
+    return [instance.pk for instance in created]
+
+
+def update_objects(model, items, instances):
+    """
+    Actualiza los registros del lote, ya leídos por ``get_instances``, con un solo
+    ``bulk_update``.
+    """
+    now = timezone.now()
+    for item in items:
+        instance = instances[item["id"]]
+        instance.assign_data(as_form_data(item))
+        instance.updated_at = now
+
+    model.objects.bulk_update(instances.values(), [*model.editable_fields(), "updated_at"])
+    search.index_documents([search.build_document(instance) for instance in instances.values()])
+    return list(instances)
+
+
+def read_batch(request):
+    """
+    Lee el lote de objetos del cuerpo de la solicitud; acepta un objeto o un arreglo.
+    """
+    data = loads(request.body or b"[]")
+    return data if isinstance(data, list) else [data]
+
+
+def resource(request, name):
+    """
+    API JSON de un modelo registrado en el motor CRUD.
+
+    - ``GET`` devuelve una página de registros (``?after=<id>&page_size=<n>``).
+    - ``POST`` crea un arreglo de objetos.
+    - ``PUT`` reemplaza un arreglo de objetos con su ``id``; los campos opcionales
+      que no se envían quedan vacíos.
+    - ``PATCH`` modifica sólo los campos enviados de cada objeto con su ``id``.
+    - ``DELETE`` elimina un arreglo de ids.
+
+    Cada lote se valida completo con las reglas de los formularios y se escribe en
+    una sola transacción con consultas masivas: si un objeto tiene errores no se
+    guarda ninguno y se responden los errores indexados por posición.
+
+    Como los formularios, las escrituras requieren el token CSRF (encabezado
+    ``X-CSRFToken`` con el valor de la cookie ``csrftoken``). Las respuestas a
+    ``GET`` envían esa cookie, así que un cliente de la API la obtiene sin pasar
+    por una página HTML.
+    """
+    model = get_crud(name).model
+
+    if request.method == "GET":
+        get_token(request)
+        return json_response(list_objects(model, request))
+
+    if request.method not in ("POST", "PATCH", "PUT", "DELETE"):
+        return json_response({"error": "Método no permitido"}, status=405)
+
+    try:
+        items = read_batch(request)
+    except ValueError:
+        return json_response({"error": "El cuerpo no es JSON válido"}, status=400)
+
+    if request.method == "DELETE":
+        if not all(is_id(object_id) for object_id in items):
+            return json_response({"error": "Se esperaba un arreglo de ids"}, status=400)
+        return json_response({"deleted": model.delete_ids(items)})
+
+    if request.method != "POST":
+        with query_budget.bulk_operation():
+            instances, errors = get_instances(model, items)
+        if errors:
+            return json_response({"errors": errors}, status=400)
+        if request.method == "PATCH":
+            # Los campos que no se envían conservan su valor y se valida el
+            # registro completo que resulta.
+            items = [{**current_data(instances[item["id"]]), **item} for item in items]
+
+    errors = validate_items(model, items)
+    if errors:
+        return json_response({"errors": errors}, status=400)
+
+    with query_budget.bulk_operation(), transaction.atomic():
+        if request.method == "POST":
+            ids = create_objects(model, items)
+        else:
+            ids = update_objects(model, items, instances)
+
+    versioning.bump_version(model)
+    results = list(model.objects.filter(pk__in=ids).order_by("id").values(*api_fields(model)))
+    return json_response({"results": results}, status=201 if request.method == "POST" else 200)
+
+
+def urlpatterns():
+    """
+    Devuelve las rutas de la API para los modelos registrados.
+    """
+    return [path("api/<str:name>/", view=resource, name="api")]
@@ -1,6 +1,37 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
 
 
 class AppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        """
+        Registra los modelos del motor CRUD, conecta el perfil de rendimiento de
+        SQLite y la medición de consultas a cada conexión nueva, y el guardado de
+        métricas al final de cada solicitud.
+        """
+        # ``entities`` registra los modelos en ``crud.registry`` al importarse.
+        from . import (  # noqa: F401
+            entities,
+            metrics,
+            query_budget,
+            sqlite_profile,
+            timing,
+        )
+
+        connection_created.connect(
+            sqlite_profile.configure_connection,
+            dispatch_uid="app.sqlite_profile",
+        )
+        connection_created.connect(
+            timing.install_query_timer,
+            dispatch_uid="app.timing",
+        )
+        connection_created.connect(
+            query_budget.install_query_inspector,
+            dispatch_uid="app.query_budget",
+        )
+        request_finished.connect(metrics.flush, dispatch_uid="app.metrics")
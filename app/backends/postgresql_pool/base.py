@@ -0,0 +1,95 @@
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+
+from app import pool
+
+
+def check_connection(connection):
+    """
+    Verifica que una conexión inactiva siga respondiendo.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def reset_connection(connection):
+    """
+    Deshace cualquier transacción abierta y restablece los parámetros de sesión.
+    """
+    connection.reset()
+
+
+def pool_key(conn_params):
+    """
+    Identifica los parámetros de conexión: dos conexiones sólo comparten pool si
+    apuntan a la misma base, con el mismo usuario y las mismas opciones.
+    """
+    return tuple(sorted((name, repr(value)) for name, value in conn_params.items()))
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """
+    Postgres no permite copiar ni borrar una base con sesiones abiertas, y las
+    conexiones "cerradas" siguen abiertas en el pool: se cierran los pools antes.
+    """
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        self.connection.close()
+        pool.close_pools()
+        super()._clone_test_db(suffix, verbosity, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        pool.close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Backend de Postgres que toma las conexiones de un pool del proceso en lugar
+    de abrir una conexión nueva (TCP + autenticación) en cada solicitud.
+
+    Se configura con la clave ``POOL`` de la base de datos (``MIN_SIZE``,
+    ``MAX_SIZE``, ``TIMEOUT``, ``CHECK_INTERVAL`` y ``MAX_LIFETIME``) y debe
+    usarse con ``CONN_MAX_AGE = 0``: al terminar cada solicitud Django "cierra"
+    la conexión, que en realidad vuelve al pool del que salió.
+    """
+
+    creation_class = DatabaseCreation
+
+    # Pool del que se tomó la conexión actual.
+    connection_pool = None
+
+    def get_pool(self, conn_params, connect):
+        """Devuelve el pool compartido para estos parámetros, creándolo la primera vez."""
+        options = {
+            key.lower(): value for key, value in self.settings_dict.get("POOL", {}).items()
+        }
+        return pool.get_pool(
+            self.alias,
+            pool_key(conn_params),
+            lambda: pool.ConnectionPool(
+                connect=connect,
+                check=check_connection,
+                reset=reset_connection,
+                **options,
+            ),
+        )
+
+    def get_new_connection(self, conn_params):
+        """Toma una conexión del pool, abriendo una nueva sólo si hace falta."""
+        # Las conexiones sin base (creación y borrado de la base de tests) son
+        # ocasionales y no deben quedar abiertas en un pool.
+        if self.alias == NO_DB_ALIAS:
+            return super().get_new_connection(conn_params)
+
+        def connect():
+            return super(DatabaseWrapper, self).get_new_connection(conn_params)
+
+        self.connection_pool = self.get_pool(conn_params, connect)
+        return self.connection_pool.acquire(connect=connect)
+
+    def _close(self):
+        if self.connection is None or self.connection_pool is None:
+            return super()._close()
+        connection_pool, self.connection_pool = self.connection_pool, None
+        connection_pool.release(self.connection, broken=bool(self.connection.closed))
@@ -0,0 +1,68 @@
+from collections import namedtuple
+
+from . import validation
+
+ColumnarResult = namedtuple("ColumnarResult", ["mask", "errors"])
+
+
+def column_length(columns):
+    """
+    Devuelve la cantidad de filas de las columnas recibidas, que deben ser todas iguales.
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("Todas las columnas deben tener la misma cantidad de filas")
+    return lengths.pop() if lengths else 0
+
+
+def python_messages(values, empty_message, check):
+    """
+    Calcula el mensaje de error de cada valor de una columna en Python puro.
+
+    Cada valor distinto se valida una sola vez.
+    """
+    cache = {"": empty_message}
+    messages = []
+    for value in values:
+        try:
+            message = cache[value]
+        except KeyError:
+            message = cache[value] = check(value) if check is not None else None
+        messages.append(message)
+    return messages
+
+
+def validate_columns(columns, required_fields):
+    """
+    Valida columnas completas (``{campo: [valores...]}``) con las reglas de
+    ``validate_fields``.
+
+    Devuelve un ``ColumnarResult`` con la máscara de filas con errores y un
+    diccionario ``{fila: errores}`` cuyos mensajes son idénticos a los de la
+    validación fila por fila. Cada valor distinto de una columna se valida una
+    sola vez.
+    """
+    size = column_length(columns)
+    schema = validation.compile_schema(required_fields)
+
+    field_messages = []
+    for key, empty_message, check in schema.checks:
+        values = columns.get(key)
+        if values is None:
+            values = [""] * size
+        field_messages.append((key, python_messages(values, empty_message, check)))
+
+    mask = [
+        any(messages[row] is not None for _key, messages in field_messages)
+        for row in range(size)
+    ]
+    errors = {
+        row: {
+            key: messages[row]
+            for key, messages in field_messages
+            if messages[row] is not None
+        }
+        for row in range(size)
+        if mask[row]
+    }
+    return ColumnarResult(mask, errors)
@@ -1,37 +1,119 @@
+from functools import cache
+
 from django.urls import reverse
 
-links = [
-    {"label": "Home", "href": reverse("home"), "icon": "bi bi-house-door"},
-    {"label": "Clientes", "href": reverse("clients_repo"), "icon": "bi bi-people"},
-    {"label": "Animales", "href": reverse("pets_repo"), "icon": "fas fa-dog"},
-    {"label": "Medicamentes", "href": reverse("medicines_repo"), "icon": "fas fa-pills"},
-    {"label": "Veterinarios", "href": reverse("vets_repo"), "icon": "fas fa-user-md"},
-    {"label": "Productos", "href": reverse("products_repo"), "icon": "fas fa-paw"},
-]
+# Enlaces declarados por nombre de URL; se resuelven una sola vez por proceso.
+NAVBAR_LINKS = (
+    ("Home", "home", "bi bi-house-door"),
+    ("Clientes", "clients_repo", "bi bi-people"),
+    ("Animales", "pets_repo", "fas fa-dog"),
+    ("Medicamentes", "medicines_repo", "fas fa-pills"),
+    ("Veterinarios", "vets_repo", "fas fa-user-md"),
+    ("Productos", "products_repo", "fas fa-paw"),
+)
 
-def navbar(request):
-    """Genera los enlaces de la barra de navegación activos basados en la solicitud.
+HOME_ITEMS = (
+    ("Clientes", "clients_repo", "bi bi-people"),
+    ("Animales", "pets_repo", "fas fa-dog"),
+    ("Medicamentos", "medicines_repo", "fas fa-pills"),
+    ("Veterinarios", "vets_repo", "fas fa-user-md"),
+    ("Productos", "products_repo", "fas fa-paw"),
+)
+
+
+def section_prefix(path):
+    """
+    Devuelve la sección de una ruta: ``/clientes/nuevo/`` -> ``/clientes/``.
+
+    Las rutas sin una segunda barra (``/`` o ``/clientes``) se devuelven completas.
+    """
+    end = path.find("/", 1)
+    return path if end == -1 else path[:end + 1]
+
+
+@cache
+def navbar_variants():
+    """
+    Precalcula la barra de navegación con cada enlace marcado como activo.
+
+    Devuelve la barra sin ningún enlace activo y un diccionario que asocia la
+    sección de cada enlace con su variante. Cada enlace es una sección de primer
+    nivel (``/`` o ``/clientes/``), así que el enlace activo de una solicitud se
+    obtiene buscando la sección de su ruta.
+    """
+    links = [
+        {"label": label, "href": reverse(name), "icon": icon}
+        for label, name, icon in NAVBAR_LINKS
+    ]
+    inactive = tuple({**link, "active": False} for link in links)
+    by_prefix = {
+        link["href"]: tuple(
+            {**other, "active": position == index} for position, other in enumerate(links)
+        )
+        for index, link in enumerate(links)
+    }
+    return inactive, by_prefix
+
+
+@cache
+def home_links():
+    """
+    Precalcula los elementos de la página de inicio.
+    """
+    return tuple(
+        {"label": label, "href": reverse(name), "icon": icon}
+        for label, name, icon in HOME_ITEMS
+    )
+
+
+class NavbarLinks:
     """
-    def add_active(link):
-        copy = link.copy()
+    Enlaces de la barra de navegación de una solicitud.
 
-        if copy["href"] == "/":
-            copy["active"] = request.path == "/"
-        else:
-            copy["active"] = request.path.startswith(copy.get("href", ""))
+    El enlace activo se busca recién cuando la plantilla recorre los enlaces.
+    """
+
+    __slots__ = ("path",)
+
+    def __init__(self, path):
+        self.path = path
+
+    def resolve(self):
+        """Devuelve la variante precalculada que corresponde a la ruta."""
+        inactive, by_prefix = navbar_variants()
+        return by_prefix.get(section_prefix(self.path), inactive)
+
+    def __iter__(self):
+        return iter(self.resolve())
+
+    def __len__(self):
+        return len(NAVBAR_LINKS)
+
+
+class HomeItems:
+    """
+    Elementos de la página de inicio, resueltos recién cuando la plantilla los recorre.
+    """
 
-        return copy
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(home_links())
+
+    def __len__(self):
+        return len(HOME_ITEMS)
+
+
+HOME_ITEMS_CONTEXT = {"home_items": HomeItems()}
+
+
+def navbar(request):
+    """Genera los enlaces de la barra de navegación activos basados en la solicitud.
+    """
+    return {"links": NavbarLinks(request.path)}
 
-    return {"links": map(add_active, links)}
 
 def home_items(request):
     """ Genera los elementos para mostrar en la página de inicio.
     """
-    items = [
-        {"label": "Clientes", "href": reverse("clients_repo"), "icon": "bi bi-people"},
-        {"label": "Animales", "href": reverse("pets_repo"), "icon": "fas fa-dog"},
-        {"label": "Medicamentos", "href": reverse("medicines_repo"), "icon": "fas fa-pills"},
-        {"label": "Veterinarios", "href": reverse("vets_repo"), "icon": "fas fa-user-md"},
-        {"label": "Productos", "href": reverse("products_repo"), "icon": "fas fa-paw"},
-    ]
-    return {"home_items": items}
+    return HOME_ITEMS_CONTEXT
@@ -0,0 +1,295 @@
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, redirect, render, reverse
+from django.template.loader import get_template
+from django.urls import path
+
+from . import export, fragments, imports, routers, versioning
+from .pagination import apaginate
+from .streaming import stream_repository, wants_streaming
+
+registry = {}
+
+
+class Crud:
+    """
+    Declaración de un modelo administrado por el motor CRUD de Vetsoft.
+
+    A partir de la declaración se generan las rutas, las vistas de repositorio,
+    formulario y eliminación, y el contexto de las plantillas genéricas de
+    ``crud/``. Las mejoras de rendimiento de los repositorios (paginación por
+    cursor, streaming, proyección de columnas, GET condicional y caché de filas)
+    se aplican aquí para todos los modelos registrados.
+    """
+
+    row_template = "crud/row.html"
+
+    def __init__(self, model, name, path, item_name, title, singular, columns,
+                 template_dir=None, form_context=None, prepare_instance=None):
+        self.model = model
+        self.name = name
+        self.path = path
+        self.item_name = item_name
+        self.title = title
+        self.singular = singular
+        self.columns = columns
+        self.template_dir = template_dir or name
+        self.form_context = form_context
+        self.prepare_instance = prepare_instance
+        self.url_names = {
+            action: f"{name}_{action}"
+            for action in ("repo", "form", "edit", "delete", "bulk_delete", "export", "import")
+        }
+
+    @property
+    def list_name(self):
+        """Nombre de la variable de contexto con la lista de registros."""
+        return f"{self.item_name}s"
+
+    @property
+    def delete_field(self):
+        """Nombre del campo del formulario de eliminación que lleva el id."""
+        return f"{self.item_name}_id"
+
+    @property
+    def column_names(self):
+        """Campos del modelo que se muestran en el repositorio."""
+        return [name for name, _label in self.columns]
+
+    @property
+    def repository_template(self):
+        """Plantilla del repositorio; puede extender a ``crud/repository.html``."""
+        return f"{self.template_dir}/repository.html"
+
+    @property
+    def import_template(self):
+        """Plantilla de la importación de archivos."""
+        return "crud/import.html"
+
+    @property
+    def form_template(self):
+        """Plantilla del formulario de alta y edición."""
+        return f"{self.template_dir}/form.html"
+
+    def get_queryset(self):
+        """Consulta del repositorio, limitada a las columnas que se muestran."""
+        return self.model.objects.only("id", "updated_at", *self.column_names)
+
+    def render_row(self, instance, csrf_token):
+        """
+        Renderiza la fila de una instancia en el repositorio.
+
+        El HTML se guarda en la caché de fragmentos con la clave
+        ``(modelo, pk, updated_at)``, así que sólo se vuelve a renderizar una fila
+        cuando el registro cambió.
+        """
+        html = fragments.render_cached(
+            (self.name, instance.pk, instance.updated_at),
+            lambda: get_template(self.row_template).render({
+                "crud": self,
+                "object": instance,
+                "csrf_token": fragments.CSRF_PLACEHOLDER,
+            }),
+        )
+        return html.replace(fragments.CSRF_PLACEHOLDER, csrf_token)
+
+    def get_context(self, **context):
+        """Contexto común a las plantillas de este modelo."""
+        return {"crud": self, **context}
+
+    def get_form_context(self, request, **context):
+        """Contexto del formulario, con el contexto adicional declarado."""
+        if self.form_context is not None:
+            context.update(self.form_context(request))
+        return self.get_context(**context)
+
+    async def repository(self, request):
+        """
+        Vista para mostrar el repositorio del modelo.
+
+        Muestra una página por cursor o, con ``?stream=1``, la tabla completa en streaming.
+        Si el cliente ya tiene la versión actual del modelo responde 304 sin consultar
+        la tabla ni renderizar la plantilla. Las páginas que muestran mensajes
+        pendientes no usan GET condicional, porque el mensaje se muestra una sola vez.
+        """
+        has_messages = len(messages.get_messages(request)) > 0
+        version = await versioning.aget_version(self.model)
+        if not has_messages:
+            not_modified = versioning.conditional_response(request, version)
+            if not_modified is not None:
+                return versioning.set_conditional_headers(not_modified, request, version)
+
+        queryset = self.get_queryset()
+        if routers.written_recently(version.timestamp):
+            # El ETag corresponde a la última escritura: si una réplica todavía no la
+            # tiene, el navegador guardaría filas viejas con el ETag nuevo.
+            queryset = queryset.using(routers.PRIMARY)
+
+        if wants_streaming(request):
+            response = stream_repository(
+                request, queryset, self.repository_template, "objects",
+                self.render_row, context=self.get_context(),
+            )
+        else:
+            page = await apaginate(queryset, request)
+            response = render(
+                request,
+                self.repository_template,
+                self.get_context(**{self.list_name: page, "objects": page, "page": page}),
+            )
+
+        if has_messages:
+            return response
+        return versioning.set_conditional_headers(response, request, version)
+
+    async def form(self, request, id=None):
+        """
+        Vista para mostrar y procesar el formulario del modelo.
+
+        Si se recibe una solicitud POST, la vista intenta guardar o actualizar el registro
+        según los datos recibidos. Si se recibe una solicitud GET, la vista muestra el
+        formulario para crear un nuevo registro o para actualizar uno existente.
+        """
+        if request.method == "POST":
+            instance_id = request.POST.get("id", "")
+
+            if instance_id == "":
+                saved, errors = await self.model.acreate_from_data(request.POST)
+            else:
+                # Sólo se leen las columnas editables, necesarias para calcular
+                # qué campos cambiaron.
+                instance = await aget_object_or_404(
+                    self.model.objects.only("id", *self.model.editable_fields()),
+                    pk=instance_id,
+                )
+                saved, errors = await instance.aupdate_from_data(request.POST)
+
+            if saved:
+                return redirect(reverse(self.url_names["repo"]))
+
+            return render(
+                request,
+                self.form_template,
+                self.get_form_context(
+                    request, **{"errors": errors, self.item_name: request.POST},
+                ),
+            )
+
+        instance = None
+        if id is not None:
+            instance = await aget_object_or_404(self.model, pk=id)
+            if self.prepare_instance is not None:
+                self.prepare_instance(instance)
+
+        return render(
+            request,
+            self.form_template,
+            self.get_form_context(request, **{self.item_name: instance}),
+        )
+
+    async def delete(self, request):
+        """
+        Vista para eliminar un registro según el ID recibido en la solicitud POST.
+        """
+        instance_id = request.POST.get(self.delete_field)
+        # ``delete_ids`` borra el registro y su documento de búsqueda en una sola
+        # transacción.
+        if not await self.model.adelete_ids([int(instance_id)]):
+            raise Http404(f"No existe el registro {instance_id}")
+
+        return redirect(reverse(self.url_names["repo"]))
+
+    async def bulk_delete(self, request):
+        """
+        Vista para eliminar todos los registros seleccionados en el repositorio.
+
+        Borra los ids recibidos en ``ids`` con una sola consulta e informa cuántos
+        registros se eliminaron.
+        """
+        ids = [int(value) for value in request.POST.getlist("ids") if value.isdigit()]
+        deleted = await self.model.adelete_ids(ids) if ids else 0
+        messages.success(request, f"Se eliminaron {deleted} de {len(ids)} {self.title.lower()} seleccionados")
+
+        return redirect(reverse(self.url_names["repo"]))
+
+    async def export(self, request):
+        """
+        Vista para descargar todos los registros del modelo en CSV o JSON Lines.
+
+        El formato se elige con ``?format=csv|jsonl`` y ``?gzip=1`` comprime la salida.
+        Las filas se leen por bloques y se envían a medida que se generan.
+        """
+        fmt = request.GET.get("format", "csv")
+        if fmt not in export.FORMATS:
+            raise Http404(f"Formato de exportación desconocido: {fmt}")
+
+        compress = request.GET.get("gzip") == "1"
+        filename = f"{self.path}.{fmt}" + (".gz" if compress else "")
+
+        response = StreamingHttpResponse(
+            export.aiter_export(self.model.objects.all(), fmt, compress),
+            content_type="application/gzip" if compress else export.FORMATS[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    async def import_file(self, request):
+        """
+        Vista para importar registros desde un archivo CSV o JSON Lines.
+
+        Las filas se validan con las mismas reglas que el formulario y se insertan
+        por lotes; las filas con errores se informan sin interrumpir la importación.
+        """
+        context = {"formats": imports.FORMATS}
+
+        if request.method == "POST":
+            file = request.FILES.get("file")
+            fmt = request.POST.get("format") or None
+            if file is None:
+                context["errors"] = {"file": "Por favor seleccione un archivo"}
+            elif fmt is not None and fmt not in imports.FORMATS:
+                context["errors"] = {"format": f"Formato de importación desconocido: {fmt}"}
+            else:
+                try:
+                    context["result"] = await sync_to_async(imports.import_file)(
+                        self.model, file, fmt,
+                    )
+                except imports.InvalidFile as error:
+                    context["errors"] = {"file": str(error)}
+                    if error.created:
+                        context["result"] = imports.ImportResult(error.created, [])
+
+        return render(request, self.import_template, self.get_context(**context))
+
+    def urls(self):
+        """Devuelve las rutas del modelo."""
+        return [
+            path(f"{self.path}/", view=self.repository, name=self.url_names["repo"]),
+            path(f"{self.path}/nuevo/", view=self.form, name=self.url_names["form"]),
+            path(f"{self.path}/editar/<int:id>/", view=self.form, name=self.url_names["edit"]),
+            path(f"{self.path}/eliminar/", view=self.delete, name=self.url_names["delete"]),
+            path(
+                f"{self.path}/eliminar-seleccionados/",
+                view=self.bulk_delete,
+                name=self.url_names["bulk_delete"],
+            ),
+            path(f"{self.path}/exportar/", view=self.export, name=self.url_names["export"]),
+            path(f"{self.path}/importar/", view=self.import_file, name=self.url_names["import"]),
+        ]
+
+
+def register(model, **options):
+    """
+    Registra un modelo en el motor CRUD y devuelve su declaración.
+    """
+    crud = Crud(model, **options)
+    registry[crud.name] = crud
+    return crud
+
+
+def urlpatterns():
+    """
+    Devuelve las rutas de todos los modelos registrados.
+    """
+    return [url for crud in registry.values() for url in crud.urls()]
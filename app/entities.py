@@ -0,0 +1,101 @@
+"""
+Modelos administrados por el motor CRUD.
+
+Se importa desde ``AppConfig.ready()``, así ``crud.registry`` está completo en
+cuanto Django termina de cargar las aplicaciones, sin depender de que se hayan
+importado las vistas o las URLs.
+"""
+from datetime import date
+
+from . import crud
+from .models import Client, Medicine, Pet, Product, Vet
+
+
+def pets_form_context(request):
+    """
+    Contexto adicional del formulario de mascota: la fecha de hoy como máximo de nacimiento.
+    """
+    return {"today": date.today().strftime('%Y-%m-%d')}
+
+
+def prepare_pet(pet):
+    """
+    Formatea la fecha de nacimiento de la mascota para el campo de tipo fecha.
+    """
+    pet.birthday = pet.birthday.strftime('%Y-%m-%d')
+
+
+clients = crud.register(
+    Client,
+    name="clients",
+    path="clientes",
+    item_name="client",
+    title="Clientes",
+    singular="Cliente",
+    columns=[
+        ("name", "Nombre"),
+        ("phone", "Teléfono"),
+        ("email", "Email"),
+        ("address", "Dirección"),
+    ],
+)
+
+pets = crud.register(
+    Pet,
+    name="pets",
+    path="animales",
+    item_name="pet",
+    title="Animales",
+    singular="Animal",
+    columns=[
+        ("name", "Nombre"),
+        ("breed", "Raza"),
+        ("birthday", "Fecha de nacimiento"),
+        ("weight", "Peso"),
+    ],
+    form_context=pets_form_context,
+    prepare_instance=prepare_pet,
+)
+
+medicines = crud.register(
+    Medicine,
+    name="medicines",
+    path="medicamentos",
+    item_name="medicine",
+    title="Medicamentos",
+    singular="Medicamento",
+    columns=[
+        ("name", "Nombre"),
+        ("description", "Descripción"),
+        ("dose", "Dosis"),
+    ],
+)
+
+vets = crud.register(
+    Vet,
+    name="vets",
+    path="veterinarios",
+    item_name="vet",
+    title="Veterinarios",
+    singular="Veterinario",
+    columns=[
+        ("name", "Nombre"),
+        ("email", "Correo electrónico"),
+        ("phone", "Teléfono"),
+    ],
+    template_dir="vet",
+)
+
+products = crud.register(
+    Product,
+    name="products",
+    path="productos",
+    item_name="product",
+    title="Productos",
+    singular="Producto",
+    columns=[
+        ("name", "Nombre"),
+        ("type", "Tipo"),
+        ("price", "Precio"),
+    ],
+)
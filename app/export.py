@@ -0,0 +1,129 @@
+import csv
+import json
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+DEFAULT_CHUNK_SIZE = 2000
+
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+
+class _Echo:
+    """Pseudo-buffer para ``csv.writer`` que devuelve lo escrito en lugar de guardarlo."""
+
+    def write(self, value):
+        """Devuelve la línea recibida."""
+        return value
+
+
+def get_chunk_size():
+    """
+    Devuelve la cantidad de filas que se leen por bloque al exportar.
+    """
+    return getattr(settings, "EXPORT_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def export_fields(model):
+    """
+    Devuelve los nombres de las columnas que se exportan de un modelo.
+    """
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def line_encoder(fmt):
+    """
+    Devuelve una función que convierte una fila (diccionario de ``values()``) en una
+    línea de texto.
+    """
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        return lambda row: writer.writerow(row.values())
+
+    return lambda row: json.dumps(row, ensure_ascii=False, cls=DjangoJSONEncoder) + "\n"
+
+
+def header(fmt, fields):
+    """
+    Devuelve la primera línea del archivo exportado (sólo CSV lleva encabezado).
+    """
+    if fmt == "csv":
+        return csv.writer(_Echo()).writerow(fields)
+    return ""
+
+
+class GzipCompressor:
+    """
+    Comprime en formato gzip un flujo de bloques de texto, bloque a bloque.
+    """
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+
+    def compress(self, text):
+        """Comprime un bloque y devuelve los bytes disponibles hasta el momento."""
+        return self._compressor.compress(text.encode())
+
+    def flush(self):
+        """Devuelve los bytes finales del archivo comprimido."""
+        return self._compressor.flush()
+
+
+def iter_export(queryset, fmt="csv", compress=False, chunk_size=None):
+    """
+    Recorre la consulta con ``iterator(chunk_size=...)`` y devuelve el archivo
+    exportado como una secuencia de bloques, uno por cada bloque de filas leídas.
+
+    La memoria usada depende del tamaño del bloque y no de la cantidad de filas.
+    """
+    chunk_size = chunk_size or get_chunk_size()
+    fields = export_fields(queryset.model)
+    encode = line_encoder(fmt)
+    compressor = GzipCompressor() if compress else None
+
+    def emit(text):
+        return compressor.compress(text) if compressor else text.encode()
+
+    yield emit(header(fmt, fields))
+
+    buffer = []
+    for row in queryset.order_by("pk").values(*fields).iterator(chunk_size=chunk_size):
+        buffer.append(encode(row))
+        if len(buffer) >= chunk_size:
+            yield emit("".join(buffer))
+            buffer = []
+    yield emit("".join(buffer))
+
+    if compressor:
+        yield compressor.flush()
+
+
+async def aiter_export(queryset, fmt="csv", compress=False, chunk_size=None):
+    """
+    Versión asíncrona de ``iter_export`` para servir la exportación por ASGI.
+    """
+    chunk_size = chunk_size or get_chunk_size()
+    fields = export_fields(queryset.model)
+    encode = line_encoder(fmt)
+    compressor = GzipCompressor() if compress else None
+
+    def emit(text):
+        return compressor.compress(text) if compressor else text.encode()
+
+    yield emit(header(fmt, fields))
+
+    buffer = []
+    rows = queryset.order_by("pk").values(*fields).aiterator(chunk_size=chunk_size)
+    async for row in rows:
+        buffer.append(encode(row))
+        if len(buffer) >= chunk_size:
+            yield emit("".join(buffer))
+            buffer = []
+    yield emit("".join(buffer))
+
+    if compressor:
+        yield compressor.flush()
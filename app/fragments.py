@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Las filas se guardan con este marcador en lugar del token CSRF, que cambia en
+# cada solicitud, y se reemplaza al momento de enviarlas.
+CSRF_PLACEHOLDER = "VETSOFTCSRFPLACEHOLDER"
+
+
+class FragmentCache:
+    """
+    Caché LRU en memoria de fragmentos de HTML ya renderizados.
+
+    Está acotada tanto por cantidad de entradas como por el tamaño total de los
+    fragmentos (medido en caracteres); al superar cualquiera de los dos límites
+    se descartan primero los fragmentos usados hace más tiempo.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Devuelve el fragmento guardado para ``key`` o None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Guarda un fragmento y descarta los menos usados si se superan los límites."""
+        size = len(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+
+            self._data[key] = value
+            self.size += size
+
+            while len(self._data) > self.max_entries or self.size > self.max_bytes:
+                _key, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        """Vacía la caché y reinicia sus estadísticas."""
+        with self._lock:
+            self._data.clear()
+            self.size = self.hits = self.misses = 0
+
+    def stats(self):
+        """Devuelve las estadísticas de uso de la caché."""
+        return {
+            "entries": len(self._data),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+row_cache = FragmentCache(
+    max_entries=getattr(settings, "FRAGMENT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+    max_bytes=getattr(settings, "FRAGMENT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+)
+
+
+def render_cached(key, render):
+    """
+    Devuelve el fragmento guardado para ``key`` o lo renderiza con ``render`` y lo guarda.
+    """
+    html = row_cache.get(key)
+    if html is None:
+        html = render()
+        row_cache.set(key, html)
+    return html
@@ -0,0 +1,184 @@
+import csv
+import io
+import json
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+
+from . import columnar, search, versioning
+
+DEFAULT_BATCH_SIZE = 1000
+
+FORMATS = ("csv", "jsonl")
+
+ImportResult = namedtuple("ImportResult", ["created", "errors"])
+
+
+class InvalidFile(ValueError):
+    """
+    El archivo no se puede leer: no está en UTF-8 o no es un CSV válido.
+
+    ``created`` indica cuántos registros de los lotes anteriores ya se importaron.
+    """
+
+    def __init__(self, message, created=0):
+        super().__init__(message)
+        self.created = created
+
+
+def get_batch_size():
+    """
+    Devuelve la cantidad de filas que se validan e insertan en cada transacción.
+    """
+    return getattr(settings, "IMPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+
+def guess_format(filename, default="csv"):
+    """
+    Deduce el formato de importación a partir de la extensión del archivo.
+    """
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    if extension == "csv":
+        return "csv"
+    return default
+
+
+def normalize(row):
+    """
+    Convierte los valores de una fila a texto, como llegan desde un formulario.
+    """
+    return {
+        key: "" if value is None else str(value)
+        for key, value in row.items()
+        if key is not None
+    }
+
+
+def read_rows(stream, fmt="csv"):
+    """
+    Recorre las filas de un archivo de texto CSV (con encabezado) o JSON Lines.
+
+    Devuelve pares ``(número de línea, datos)``; las líneas de JSON que no se
+    pueden interpretar se devuelven con ``datos=None``. Lanza ``InvalidFile`` si el
+    archivo no está en UTF-8 o si el CSV está mal formado.
+    """
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(stream, strict=True)
+            try:
+                for row in reader:
+                    yield reader.line_num, normalize(row)
+            except csv.Error as error:
+                # ``line_num`` todavía no cuenta la línea que no se pudo leer.
+                raise InvalidFile(
+                    f"El archivo CSV está mal formado en la línea {reader.line_num + 1}: {error}",
+                ) from error
+            return
+
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, None
+                continue
+            yield line_number, normalize(row) if isinstance(row, dict) else None
+    except UnicodeDecodeError as error:
+        raise InvalidFile("El archivo debe estar codificado en UTF-8") from error
+
+
+def validate_batch(model, batch):
+    """
+    Valida un lote de filas ``(número de línea, datos)`` en modo columnar, con las
+    mismas reglas que el formulario del modelo.
+
+    Devuelve la lista de errores de cada fila, en orden (un diccionario vacío si
+    la fila es válida).
+    """
+    rows = [data for _line_number, data in batch if data is not None]
+    fields = model.get_required_fields()
+    columns = {field: [data.get(field, "") for data in rows] for field in fields}
+    result = columnar.validate_columns(columns, fields)
+
+    errors = []
+    row = 0
+    for _line_number, data in batch:
+        if data is None:
+            errors.append({"__all__": "La línea no es un objeto JSON válido"})
+            continue
+        errors.append(result.errors.get(row, {}))
+        row += 1
+    return errors
+
+
+def insert_batch(model, instances):
+    """
+    Inserta un lote de instancias con ``bulk_create`` y las indexa para la búsqueda,
+    todo dentro de una sola transacción.
+    """
+    with transaction.atomic():
+        created = model.objects.bulk_create(instances)
+        search.index_documents([search.build_document(instance) for instance in created])
+    return len(created)
+
+
+def import_batch(model, batch, errors):
+    """
+    Valida un lote, inserta sus filas válidas y agrega a ``errors`` las inválidas.
+    """
+    instances = []
+    for (line_number, data), row_errors in zip(batch, validate_batch(model, batch)):
+        if row_errors:
+            errors.append((line_number, row_errors))
+        else:
+            instances.append(model(**model.fields_from_data(data)))
+    return insert_batch(model, instances) if instances else 0
+
+
+def import_rows(model, rows, batch_size=None):
+    """
+    Valida e inserta por lotes las filas ``(número de línea, datos)`` recibidas.
+
+    Las filas inválidas no interrumpen la importación: se informan en
+    ``ImportResult.errors`` como pares ``(número de línea, errores)`` y el resto
+    del lote se inserta igual. Si el archivo no se puede leer, los lotes anteriores
+    quedan importados y ``InvalidFile.created`` indica cuántos registros se crearon.
+    """
+    batch_size = batch_size or get_batch_size()
+    created = 0
+    errors = []
+    batch = []
+
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                created += import_batch(model, batch, errors)
+                batch = []
+
+        if batch:
+            created += import_batch(model, batch, errors)
+    except InvalidFile as error:
+        error.created = created
+        raise
+    finally:
+        if created:
+            versioning.bump_version(model)
+
+    return ImportResult(created, errors)
+
+
+def import_file(model, file, fmt=None, batch_size=None):
+    """
+    Importa un archivo subido o abierto en modo binario.
+    """
+    fmt = fmt or guess_format(getattr(file, "name", "") or "")
+    stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        return import_rows(model, read_rows(stream, fmt), batch_size)
+    finally:
+        stream.detach()
@@ -0,0 +1,171 @@
+import re
+from collections import namedtuple
+
+# Formato de las líneas que Django escribe en el logger ``django.db.backends``.
+LOG_LINE = re.compile(
+    r"^\((?P<duration>\d+(?:\.\d+)?)\) (?P<sql>.*?); args=.*; alias=(?P<alias>\w+)$",
+)
+
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE")
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+CLAUSE_END = re.compile(r"\b(ORDER BY|GROUP BY|LIMIT|OFFSET|RETURNING)\b", re.IGNORECASE)
+
+COMPARISON = r"\s*(?:=|<>|!=|<=|>=|<|>|IN\b|IS\b|LIKE\b|BETWEEN\b)"
+
+LoggedQuery = namedtuple("LoggedQuery", ["duration", "sql", "alias"])
+
+QueryStats = namedtuple("QueryStats", ["query", "calls", "total", "maximum"])
+
+Suggestion = namedtuple("Suggestion", ["table", "columns", "query", "plan"])
+
+
+def read_query_log(lines):
+    """
+    Extrae las consultas registradas por el logger ``django.db.backends``.
+    """
+    queries = []
+    for line in lines:
+        match = LOG_LINE.match(line.strip())
+        if match:
+            queries.append(
+                LoggedQuery(float(match["duration"]), match["sql"], match["alias"]),
+            )
+    return queries
+
+
+def normalize(sql):
+    """
+    Reemplaza los valores literales para agrupar las consultas con la misma forma.
+    """
+    return LITERALS.sub("?", sql)
+
+
+def slowest_queries(queries, limit=10):
+    """
+    Agrupa las consultas por su forma y devuelve las que más tiempo consumieron en total.
+
+    De cada grupo se conserva la ejecución más lenta, que es la que se analiza.
+    """
+    groups = {}
+    for query in queries:
+        if not query.sql.lstrip().upper().startswith(EXPLAINABLE):
+            continue
+        key = (query.alias, normalize(query.sql))
+        calls, total, slowest = groups.get(key, (0, 0.0, query))
+        if query.duration >= slowest.duration:
+            slowest = query
+        groups[key] = (calls + 1, total + query.duration, slowest)
+
+    stats = [
+        QueryStats(slowest, calls, total, slowest.duration)
+        for calls, total, slowest in groups.values()
+    ]
+    stats.sort(key=lambda stat: stat.total, reverse=True)
+    return stats[:limit]
+
+
+def explain(sql, conn, params=None):
+    """
+    Devuelve el plan de ejecución de una consulta como una lista de líneas.
+    """
+    if conn.vendor == "sqlite":
+        statement = f"EXPLAIN QUERY PLAN {sql}"
+    elif conn.vendor == "postgresql":
+        statement = f"EXPLAIN {sql}"
+    else:
+        return []
+
+    with conn.cursor() as cursor:
+        cursor.execute(statement, params)
+        rows = cursor.fetchall()
+
+    return [row[-1] for row in rows]
+
+
+def scanned_tables(plan, vendor):
+    """
+    Devuelve las tablas que el plan recorre completas.
+
+    En SQLite ``SCAN ... USING INDEX`` también recorre todas las filas (sólo que en
+    el orden del índice); únicamente ``SEARCH`` usa el índice para filtrar.
+    """
+    if vendor == "sqlite":
+        pattern = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+    else:
+        pattern = re.compile(r"Seq Scan on (\w+)")
+
+    tables = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match and match.group(1) not in tables:
+            tables.append(match.group(1))
+    return tables
+
+
+def filtered_columns(sql, table):
+    """
+    Devuelve las columnas de la tabla usadas en el WHERE y luego en el ORDER BY.
+    """
+    column = rf'"{table}"\."(\w+)"'
+    where = re.split(r"\bWHERE\b", sql, maxsplit=1, flags=re.IGNORECASE)
+    columns = []
+
+    if len(where) == 2:
+        condition = CLAUSE_END.split(where[1], maxsplit=1)[0]
+        columns.extend(re.findall(column + COMPARISON, condition, re.IGNORECASE))
+
+    order = re.split(r"\bORDER BY\b", sql, maxsplit=1, flags=re.IGNORECASE)
+    if len(order) == 2:
+        columns.extend(re.findall(column, CLAUSE_END.split(order[1], maxsplit=1)[0]))
+
+    return list(dict.fromkeys(columns))
+
+
+def existing_indexes(table, conn):
+    """
+    Devuelve las columnas de cada índice (incluida la clave primaria) de la tabla.
+    """
+    with conn.cursor() as cursor:
+        constraints = conn.introspection.get_constraints(cursor, table)
+    return [
+        tuple(constraint["columns"])
+        for constraint in constraints.values()
+        if constraint["index"] or constraint["primary_key"] or constraint["unique"]
+    ]
+
+
+def is_covered(columns, indexes):
+    """
+    Indica si algún índice existente empieza por las columnas sugeridas.
+    """
+    return any(index[:len(columns)] == tuple(columns) for index in indexes)
+
+
+def advise(stats, conn):
+    """
+    Analiza con EXPLAIN las consultas más lentas y sugiere los índices que faltan.
+    """
+    suggestions = []
+    seen = set()
+    for stat in stats:
+        plan = explain(stat.query.sql, conn)
+        for table in scanned_tables(plan, conn.vendor):
+            columns = filtered_columns(stat.query.sql, table)
+            if not columns or columns == ["id"]:
+                continue
+            if (table, tuple(columns)) in seen:
+                continue
+            if is_covered(columns, existing_indexes(table, conn)):
+                continue
+            seen.add((table, tuple(columns)))
+            suggestions.append(Suggestion(table, columns, stat, plan))
+    return suggestions
+
+
+def index_name(table, columns):
+    """
+    Propone un nombre para el índice, dentro del límite de 30 caracteres de Django.
+    """
+    return f"{table}_{'_'.join(columns)}"[:26] + "_idx"
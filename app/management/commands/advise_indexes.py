@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from app import index_advisor
+
+
+class Command(BaseCommand):
+    help = (
+        "Lee el log de consultas de django.db.backends, ejecuta EXPLAIN sobre las más "
+        "lentas y sugiere los índices que faltan"
+    )
+
+    def add_arguments(self, parser):
+        """Define los argumentos del comando."""
+        parser.add_argument("log", help="Archivo con el log de consultas (QUERY_LOG_FILE)")
+        parser.add_argument("--limit", type=int, default=10,
+                            help="Cantidad de consultas a analizar, de la más lenta a la más rápida")
+        parser.add_argument("--database", default=None,
+                            help="Base de datos sobre la que se ejecuta EXPLAIN")
+
+    def handle(self, *args, **options):
+        """Muestra las consultas más lentas y los índices sugeridos."""
+        try:
+            with open(options["log"]) as log:
+                queries = index_advisor.read_query_log(log)
+        except OSError as error:
+            raise CommandError(f"No se pudo leer el log: {error}") from error
+
+        stats = index_advisor.slowest_queries(queries, options["limit"])
+        if not stats:
+            self.stdout.write("El log no tiene consultas para analizar")
+            return
+
+        self.stdout.write("Consultas más lentas (tiempo total, llamadas):")
+        for stat in stats:
+            self.stdout.write(f"  {stat.total:.3f}s  {stat.calls}x  {stat.query.sql}")
+
+        suggestions = []
+        for alias in dict.fromkeys(stat.query.alias for stat in stats):
+            connection = connections[options["database"] or alias]
+            alias_stats = [stat for stat in stats if stat.query.alias == alias]
+            suggestions.extend(index_advisor.advise(alias_stats, connection))
+
+        if not suggestions:
+            self.stdout.write("No se encontraron índices faltantes")
+            return
+
+        self.stdout.write("")
+        self.stdout.write("Índices sugeridos:")
+        for suggestion in suggestions:
+            columns = ", ".join(suggestion.columns)
+            name = index_advisor.index_name(suggestion.table, suggestion.columns)
+            fields = ", ".join(f'"{column}"' for column in suggestion.columns)
+            self.stdout.write("")
+            self.stdout.write(f"  {suggestion.table} ({columns})")
+            self.stdout.write(f"    consulta: {suggestion.query.query.sql}")
+            for line in suggestion.plan:
+                self.stdout.write(f"    plan: {line}")
+            self.stdout.write(f"    CREATE INDEX {name} ON {suggestion.table} ({columns});")
+            self.stdout.write(f'    models.Index(fields=[{fields}], name="{name}")')
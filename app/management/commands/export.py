@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from app import crud, export
+
+
+class Command(BaseCommand):
+    help = "Exporta todos los registros de un modelo en CSV o JSON Lines"
+
+    def add_arguments(self, parser):
+        """Define los argumentos del comando."""
+        parser.add_argument("model", choices=list(crud.registry),
+                            help="Modelo a exportar, con el mismo nombre que en la API y en seed")
+        parser.add_argument("--format", choices=sorted(export.FORMATS), default="csv")
+        parser.add_argument("--gzip", action="store_true", help="Comprime la salida con gzip")
+        parser.add_argument("--output", "-o", help="Archivo de salida (por defecto, la salida estándar)")
+        parser.add_argument("--chunk-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        """Escribe la exportación bloque a bloque en el archivo o la salida estándar."""
+        model = crud.registry[options["model"]].model
+
+        chunks = export.iter_export(
+            model.objects.all(),
+            options["format"],
+            options["gzip"],
+            options["chunk_size"],
+        )
+
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            output = getattr(self.stdout, "buffer", None) or sys.stdout.buffer
+            for chunk in chunks:
+                output.write(chunk)
+            output.flush()
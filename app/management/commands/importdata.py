@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app import crud, imports
+
+
+class Command(BaseCommand):
+    help = "Importa registros de un modelo desde un archivo CSV o JSON Lines"
+
+    def add_arguments(self, parser):
+        """Define los argumentos del comando."""
+        parser.add_argument("model", choices=list(crud.registry),
+                            help="Modelo a importar, con el mismo nombre que en la API y en seed")
+        parser.add_argument("path", help="Archivo CSV (con encabezado) o JSON Lines")
+        parser.add_argument("--format", choices=imports.FORMATS, default=None,
+                            help="Formato del archivo (por defecto, según la extensión)")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        """Importa el archivo e informa las filas creadas y las rechazadas."""
+        model = crud.registry[options["model"]].model
+
+        fmt = options["format"] or imports.guess_format(options["path"])
+        with open(options["path"], "rb") as file:
+            try:
+                result = imports.import_file(model, file, fmt, options["batch_size"])
+            except imports.InvalidFile as error:
+                raise CommandError(
+                    f"{error} ({error.created} registros importados antes del error)",
+                ) from error
+
+        for line_number, errors in result.errors:
+            for field, message in errors.items():
+                self.stderr.write(f"Línea {line_number}: {field}: {message}")
+
+        self.stdout.write(
+            f"{result.created} registros importados, {len(result.errors)} filas con errores",
+        )
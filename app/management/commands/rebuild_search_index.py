@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from app import search
+from app.models import Client, Medicine, Pet, Product, Vet
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de texto completo"
+
+    def handle(self, *args, **options):
+        """Reindexa todos los registros de los modelos buscables."""
+        total = search.rebuild_index([Client, Pet, Medicine, Vet, Product])
+        self.stdout.write(self.style.SUCCESS(f"{total} documentos indexados"))
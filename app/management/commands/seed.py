@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app import seed
+
+DEFAULT_COUNTS = {
+    "clients": 1000,
+    "pets": 1500,
+    "medicines": 200,
+    "vets": 50,
+    "products": 500,
+}
+
+
+class Command(BaseCommand):
+    help = "Genera datos de prueba válidos para clientes, mascotas, medicamentos, veterinarios y productos"
+
+    def add_arguments(self, parser):
+        """Define los argumentos del comando."""
+        for kind, count in DEFAULT_COUNTS.items():
+            parser.add_argument(f"--{kind}", type=int, default=count,
+                                help=f"Cantidad de registros a generar (por defecto {count})")
+        parser.add_argument("--seed", type=int, default=0,
+                            help="Semilla: con la misma semilla y tamaño de lote se generan los mismos datos")
+        parser.add_argument("--batch-size", type=int, default=seed.DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Procesos que generan e insertan lotes en paralelo")
+        parser.add_argument("--skip-index", action="store_true",
+                            help="No indexar para la búsqueda (luego: manage.py rebuild_search_index)")
+
+    def handle(self, *args, **options):
+        """Genera los registros e informa cuántos se crearon de cada modelo."""
+        counts = {kind: options[kind] for kind in DEFAULT_COUNTS}
+        if any(count < 0 for count in counts.values()):
+            raise CommandError("Las cantidades no pueden ser negativas")
+        if options["batch_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--batch-size y --workers deben ser mayores a cero")
+
+        verbose = options["verbosity"] > 1
+        start = time.perf_counter()
+        created = seed.seed(
+            counts,
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            index=not options["skip_index"],
+            progress=(lambda kind, count: self.stdout.write(f"{kind}: +{count}")) if verbose else None,
+        )
+        elapsed = time.perf_counter() - start
+
+        for kind, count in created.items():
+            self.stdout.write(f"{kind}: {count} registros")
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(created.values())} registros generados en {elapsed:.1f}s",
+        ))
@@ -0,0 +1,376 @@
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+
+from . import fragments, pool, timing
+from .pagination import bounded_counts, estimate_counts
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+DEFAULT_ROW_COUNT_LIMIT = 10_000
+
+# Se exporta uno de cada tres buckets de los histogramas de ``timing`` (cada
+# límite casi duplica al anterior): los contadores acumulados siguen siendo
+# exactos y la respuesta no crece demasiado.
+EXPORTED_BUCKETS = list(range(0, len(timing.BUCKETS) - 1, 3))
+
+# Estadísticas de ``pool.ConnectionPool.stats`` que se exportan como contadores
+# (se suman entre workers, incluso los que terminaron) y como valores
+# instantáneos (sólo de los workers vivos).
+POOL_COUNTERS = (
+    ("checkouts", "vetsoft_db_pool_checkouts_total", "Conexiones entregadas por el pool."),
+    ("timeouts", "vetsoft_db_pool_timeouts_total", "Esperas de conexión que vencieron."),
+    ("connections_created", "vetsoft_db_pool_connections_created_total", "Conexiones abiertas por el pool."),
+    ("connections_closed", "vetsoft_db_pool_connections_closed_total", "Conexiones cerradas por el pool."),
+    ("failed_checks", "vetsoft_db_pool_failed_checks_total", "Conexiones descartadas por no responder."),
+    ("wait_time", "vetsoft_db_pool_wait_seconds_total", "Tiempo total esperando una conexión."),
+)
+
+POOL_GAUGES = (
+    ("in_use", "vetsoft_db_pool_connections_in_use", "Conexiones del pool en uso."),
+    ("idle", "vetsoft_db_pool_connections_idle", "Conexiones del pool inactivas."),
+    ("waiting", "vetsoft_db_pool_waiting", "Threads esperando una conexión del pool."),
+    ("max_size", "vetsoft_db_pool_max_size", "Tamaño máximo de los pools."),
+)
+
+HISTOGRAMS = (
+    ("total", "vetsoft_request_duration_seconds", "Duración de las solicitudes."),
+    ("db", "vetsoft_db_duration_seconds", "Tiempo de consultas SQL por solicitud."),
+    ("tpl", "vetsoft_template_duration_seconds", "Tiempo de renderizado por solicitud."),
+)
+
+# Archivo con la suma de los contadores de los workers que terminaron; se lee
+# como el estado de un proceso más, con ``pid`` 0.
+FINISHED_FILE = "finished.json"
+LOCK_FILE = ".lock"
+
+_last_flush = 0.0
+_flush_lock = threading.Lock()
+
+
+def get_directory():
+    """
+    Devuelve el directorio compartido por los workers, o None si hay un solo proceso.
+    """
+    return getattr(settings, "METRICS_DIR", None)
+
+
+def rss_bytes():
+    """
+    Devuelve la memoria residente del proceso en bytes.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        # Fuera de Linux sólo se conoce el máximo (en kilobytes en Linux, en bytes en macOS).
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def process_state():
+    """
+    Devuelve las métricas acumuladas por este proceso.
+    """
+    return {
+        "pid": os.getpid(),
+        "rss": rss_bytes(),
+        "routes": timing.histograms.export(),
+        "cache": fragments.row_cache.stats(),
+        "pools": pool.all_stats(),
+    }
+
+
+def save(path, state):
+    """
+    Guarda un estado de forma atómica, para que los demás workers nunca lean un
+    archivo a medio escribir.
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(state, file)
+    os.replace(temporary, path)
+
+
+def write_state(directory):
+    """
+    Guarda las métricas del proceso en ``<directory>/<pid>.json``.
+    """
+    os.makedirs(directory, exist_ok=True)
+    save(os.path.join(directory, f"{os.getpid()}.json"), process_state())
+
+
+def flush(sender=None, **kwargs):
+    """
+    Receptor de ``request_finished`` que guarda las métricas del proceso, como
+    mucho una vez cada ``METRICS_FLUSH_INTERVAL`` segundos.
+    """
+    global _last_flush
+
+    directory = get_directory()
+    if not directory:
+        return
+
+    interval = getattr(settings, "METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+    now = time.monotonic()
+    if now - _last_flush < interval or not _flush_lock.acquire(blocking=False):
+        return
+    try:
+        _last_flush = now
+        write_state(directory)
+    finally:
+        _flush_lock.release()
+
+
+def is_alive(pid):
+    """
+    Indica si el proceso sigue en ejecución.
+    """
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_states(directory):
+    """
+    Lee las métricas guardadas por todos los workers y devuelve ``{ruta: estado}``.
+    """
+    states = {}
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            with open(path) as file:
+                states[path] = json.load(file)
+        except (OSError, ValueError):
+            continue
+    return states
+
+
+@contextmanager
+def locked(directory):
+    """
+    Bloquea el directorio de métricas entre procesos mientras dura el bloque.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, LOCK_FILE), "a") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def compact(directory, states):
+    """
+    Suma los contadores de los workers que terminaron a ``FINISHED_FILE`` y borra
+    sus archivos, para que el directorio y el costo de cada lectura no crezcan
+    con cada worker que se recicla.
+
+    Recibe los estados de ``read_states`` y devuelve la lista de estados que
+    quedan: el de los workers terminados y el de cada worker vivo. Debe llamarse
+    con el directorio bloqueado.
+    """
+    finished_path = os.path.join(directory, FINISHED_FILE)
+    finished = states.pop(finished_path, None)
+    dead = {
+        path: state for path, state in states.items()
+        if state["pid"] != os.getpid() and not is_alive(state["pid"])
+    }
+    if dead:
+        totals = merge(([finished] if finished else []) + list(dead.values()))
+        finished = {
+            "pid": 0,
+            "rss": 0,
+            "routes": totals["routes"],
+            "cache": totals["cache"],
+            "pools": totals["pools"],
+        }
+        save(finished_path, finished)
+        for path in dead:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    alive = [state for path, state in states.items() if path not in dead]
+    return ([finished] if finished else []) + alive
+
+
+def merge(states):
+    """
+    Suma las métricas de varios procesos.
+
+    Los contadores de los workers que terminaron se conservan, como en cualquier
+    contador de Prometheus; la memoria residente sólo se informa de los vivos.
+    """
+    routes = {}
+    cache = {"hits": 0, "misses": 0}
+    rss = {}
+    pools = {}
+
+    for state in states:
+        for route, stats in state["routes"].items():
+            merged = routes.setdefault(route, {
+                "queries": 0,
+                **{
+                    name: {"counts": [0] * len(timing.BUCKETS), "count": 0, "sum": 0.0}
+                    for name, _metric, _help in HISTOGRAMS
+                },
+            })
+            merged["queries"] += stats["queries"]
+            for name, _metric, _help in HISTOGRAMS:
+                histogram = merged[name]
+                histogram["count"] += stats[name]["count"]
+                histogram["sum"] += stats[name]["sum"]
+                histogram["counts"] = [
+                    a + b for a, b in zip(histogram["counts"], stats[name]["counts"])
+                ]
+        cache["hits"] += state["cache"]["hits"]
+        cache["misses"] += state["cache"]["misses"]
+        alive = state["pid"] == os.getpid() or is_alive(state["pid"])
+        if alive:
+            rss[state["pid"]] = state["rss"]
+        for alias, stats in state.get("pools", {}).items():
+            merged = pools.setdefault(alias, {
+                name: 0 for name, _metric, _help in POOL_COUNTERS + POOL_GAUGES
+            })
+            for name, _metric, _help in POOL_COUNTERS + (POOL_GAUGES if alive else ()):
+                merged[name] += stats[name]
+
+    return {"routes": routes, "cache": cache, "rss": rss, "pools": pools}
+
+
+def collect():
+    """
+    Devuelve las métricas de todos los workers, o sólo las de este proceso si no
+    hay un directorio compartido configurado.
+
+    Antes de sumarlas, los contadores de los workers que terminaron se agrupan en
+    un solo archivo (ver ``compact``).
+    """
+    directory = get_directory()
+    if not directory:
+        return merge([process_state()])
+
+    with _flush_lock:
+        write_state(directory)
+    with locked(directory):
+        states = compact(directory, read_states(directory))
+    return merge(states)
+
+
+def row_counts():
+    """
+    Devuelve la cantidad estimada de filas de cada modelo de la aplicación.
+
+    Se usan las estadísticas de la base, como en la paginación: un ``COUNT(*)``
+    por tabla en cada lectura de las métricas recorrería las tablas completas.
+    Los modelos sin estadísticas (en SQLite, hasta que se ejecute ``ANALYZE``) se
+    cuentan hasta ``METRICS_ROW_COUNT_LIMIT`` filas.
+    """
+    models = list(apps.get_app_config("app").get_models())
+    counts = estimate_counts(models)
+    missing = [model for model in models if model not in counts]
+    if missing:
+        limit = getattr(settings, "METRICS_ROW_COUNT_LIMIT", DEFAULT_ROW_COUNT_LIMIT)
+        counts.update(bounded_counts(missing, limit))
+    return {model.__name__: count for model, count in counts.items()}
+
+
+def escape(value):
+    """
+    Escapa el valor de una etiqueta según el formato de texto de Prometheus.
+    """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def header(lines, metric, kind, help_text):
+    """
+    Agrega las líneas ``HELP`` y ``TYPE`` de una métrica.
+    """
+    lines.append(f"# HELP {metric} {help_text}")
+    lines.append(f"# TYPE {metric} {kind}")
+
+
+def render(data, rows):
+    """
+    Devuelve las métricas en el formato de texto de Prometheus.
+    """
+    lines = []
+    routes = sorted(data["routes"].items())
+
+    header(lines, "vetsoft_requests_total", "counter", "Solicitudes atendidas por URL.")
+    for route, stats in routes:
+        lines.append(f'vetsoft_requests_total{{view="{escape(route)}"}} {stats["total"]["count"]}')
+
+    header(lines, "vetsoft_db_queries_total", "counter", "Consultas SQL ejecutadas por URL.")
+    for route, stats in routes:
+        lines.append(f'vetsoft_db_queries_total{{view="{escape(route)}"}} {stats["queries"]}')
+
+    for name, metric, help_text in HISTOGRAMS:
+        header(lines, metric, "histogram", help_text)
+        for route, stats in routes:
+            label = f'view="{escape(route)}"'
+            histogram = stats[name]
+            cumulative = 0
+            previous = 0
+            for index in EXPORTED_BUCKETS:
+                cumulative += sum(histogram["counts"][previous:index + 1])
+                previous = index + 1
+                bound = timing.BUCKETS[index] / 1000
+                lines.append(f'{metric}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {histogram["count"]}')
+            lines.append(f"{metric}_sum{{{label}}} {histogram['sum'] / 1000}")
+            lines.append(f"{metric}_count{{{label}}} {histogram['count']}")
+
+    header(lines, "vetsoft_model_rows", "gauge", "Filas estimadas de cada modelo.")
+    for model, count in sorted(rows.items()):
+        lines.append(f'vetsoft_model_rows{{model="{model}"}} {count}')
+
+    cache = data["cache"]
+    lookups = cache["hits"] + cache["misses"]
+    header(lines, "vetsoft_fragment_cache_hits_total", "counter", "Aciertos de la caché de filas.")
+    lines.append(f"vetsoft_fragment_cache_hits_total {cache['hits']}")
+    header(lines, "vetsoft_fragment_cache_misses_total", "counter", "Fallos de la caché de filas.")
+    lines.append(f"vetsoft_fragment_cache_misses_total {cache['misses']}")
+    header(lines, "vetsoft_fragment_cache_hit_ratio", "gauge", "Proporción de aciertos de la caché de filas.")
+    lines.append(f"vetsoft_fragment_cache_hit_ratio {cache['hits'] / lookups if lookups else 0}")
+
+    pools = sorted(data["pools"].items())
+    for name, metric, help_text in POOL_COUNTERS:
+        header(lines, metric, "counter", help_text)
+        for alias, stats in pools:
+            lines.append(f'{metric}{{database="{escape(alias)}"}} {stats[name]}')
+    for name, metric, help_text in POOL_GAUGES:
+        header(lines, metric, "gauge", help_text)
+        for alias, stats in pools:
+            lines.append(f'{metric}{{database="{escape(alias)}"}} {stats[name]}')
+
+    header(lines, "vetsoft_process_resident_memory_bytes", "gauge", "Memoria residente de cada worker.")
+    for pid, rss in sorted(data["rss"].items()):
+        lines.append(f'vetsoft_process_resident_memory_bytes{{pid="{pid}"}} {rss}')
+
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    """
+    Expone las métricas de todos los workers en el formato de Prometheus.
+    """
+    return HttpResponse(render(collect(), row_counts()), content_type=CONTENT_TYPE)
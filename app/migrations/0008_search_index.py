@@ -0,0 +1,34 @@
+from django.db import migrations
+
+from app import search
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if not search.is_supported(connection):
+        return
+
+    search.create_index(connection)
+    search.rebuild_index(
+        [
+            apps.get_model("app", name)
+            for name in ("Client", "Pet", "Medicine", "Vet", "Product")
+        ],
+        connection,
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if search.is_supported(schema_editor.connection):
+        search.drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_pet_weight'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.4 on 2026-10-18 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['name'], name='app_client_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['email'], name='app_client_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['phone'], name='app_client_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicine',
+            index=models.Index(fields=['name'], name='app_medicine_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['name'], name='app_pet_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['breed', 'name'], name='app_pet_breed_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name'], name='app_product_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['type', 'name'], name='app_product_type_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(fields=['name'], name='app_vet_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(fields=['email'], name='app_vet_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(fields=['phone'], name='app_vet_phone_idx'),
+        ),
+    ]
@@ -1,103 +1,201 @@
-import re
-from datetime import datetime
+from asgiref.sync import sync_to_async
+from django.db import models, transaction
+from django.utils import timezone
 
-from django.db import models
+from . import search, validation, versioning
+
+# Los validadores se mantienen importables desde ``app.models``.
+from .validation import (  # noqa: F401
+    validate_date_of_birthday,
+    validate_phone,
+    validate_vetsoft_email,
+    validate_vetsoft_name,
+)
 
 
 def validate_fields(data, required_fields):
     """
     Valida los campos de datos según los requisitos especificados.
     """
-    errors = {}
-
-    for key, value in required_fields.items():
-        field_value = data.get(key, "")
-
-        if field_value == "":
-            errors[key] = f"Por favor ingrese un {value}"
-        elif key == 'name':
-            name_error = validate_vetsoft_name(field_value)
-            if name_error:
-                errors["name"] = name_error
-        elif key == 'email':
-            email_error = validate_vetsoft_email(field_value)
-            if email_error:
-                errors["email"] = email_error
-        elif key == 'price' and  float(field_value) <0.0:
-            errors["price"] = "El precio debe ser mayor a cero"
-        elif key == 'weight' and int(field_value) < 0:
-            errors["weight"] = "El peso de la mascota no puede ser negativo"
-        elif key == 'birthday':
-            birthday_error = validate_date_of_birthday(field_value)
-            if birthday_error:
-                errors["birthday"] = birthday_error
-        elif key =='dose' and (int(field_value) < 1 or int(field_value) > 10):
-            errors["dose"] = "La dosis debe estar entre 1 y 10"
-        elif key =='phone':
-            phone_error = validate_phone(field_value)
-            print(phone_error)
-            if phone_error:
-                errors["phone"] = phone_error
-    return errors
-
-def validate_date_of_birthday(date_str):
-    """
-    Valida si una fecha de nacimiento es válida y está en el formato correcto.
-    """
-    try:
-        birth_date = datetime.strptime(date_str, '%Y-%m-%d')
-        today = datetime.today()
-        if birth_date > today:
-            return "La fecha no puede ser mayor al dia de hoy"
-        return None
-    except ValueError:
-        return "Formato de fecha incorrecto"
-    
-def validate_vetsoft_name(value):
-    """
-    Valida si un nombre contiene solo letras, espacios y caracteres especiales comunes en español.
-    """
-    regex = r'^[a-zA-ZáéíóúÁÉÍÓÚ\s]+$'
-    if not re.match(regex, value):
-        return "El nombre solo debe contener letras y espacios"
-    return None
+    return validation.validate_one(data, required_fields)
 
-def validate_phone(number):
-    """
-    Valida si un número de teléfono es válido y contiene solo dígitos.
-    """
-    if not(number.isnumeric()):
-        return "El teléfono indicado debe contener sólo números"
-    
-    regex = r'^54'
-
-    if not re.match(regex, number):
-        return "El teléfono debe comenzar siempre con 54"
-    return None 
-    
-def validate_vetsoft_email(value):
+
+class VetsoftModel(models.Model):
     """
-    Valida si una dirección de correo electrónico cumple con el formato de Vetsoft.
+    Base de los modelos de Vetsoft que se crean y actualizan a partir de datos de formulario.
+
+    Cada modelo declara sus campos requeridos en ``get_required_fields`` y sus campos
+    opcionales en ``optional_fields``; la validación, el guardado, la indexación
+    para la búsqueda y la versión usada por el GET condicional se resuelven aquí
+    una sola vez.
     """
-    regex = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
-    if not re.match(regex, value):
-        return "Por favor ingrese un email valido"
 
-    regex = r'^[a-zA-Z0-9._%+-]+@vetsoft\.com$'
-    if not re.match(regex, value):
-        return "El email debe finalizar con @vetsoft.com"
+    updated_at = models.DateTimeField(auto_now=True)
+
+    optional_fields = ()
+
+    schema = validation.compile_schema({})
+
+    class Meta:
+        abstract = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.schema = validation.compile_schema(cls.get_required_fields())
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def get_required_fields():
+        """
+        Devuelve un diccionario que mapea los campos requeridos a sus descripciones en español."""
+        return {}
+
+    @classmethod
+    def editable_fields(cls):
+        """
+        Devuelve los campos que se completan desde el formulario."""
+        return [*cls.get_required_fields(), *cls.optional_fields]
+
+    @classmethod
+    def validate(cls, data):
+        """
+        Valida los datos recibidos según los campos requeridos del modelo."""
+        return cls.schema.validate_one(data)
+
+    @classmethod
+    def validate_many(cls, rows):
+        """
+        Valida varias filas y devuelve la lista de errores de cada una."""
+        return cls.schema.validate_many(rows)
+
+    @classmethod
+    def fields_from_data(cls, data):
+        """
+        Extrae de los datos recibidos los valores de los campos del modelo."""
+        values = {field: data.get(field) for field in cls.get_required_fields()}
+        values.update({field: data.get(field, "") for field in cls.optional_fields})
+        return values
+
+    def assign_data(self, data):
+        """
+        Asigna los datos recibidos a la instancia, conservando los valores actuales
+        de los campos requeridos que lleguen vacíos."""
+        for field in self.get_required_fields():
+            setattr(self, field, data.get(field, "") or getattr(self, field))
+        for field in self.optional_fields:
+            setattr(self, field, data.get(field, ""))
+
+    @classmethod
+    def create_from_data(cls, data):
+        """
+        Crea un nuevo registro utilizando los datos proporcionados."""
+        errors = cls.validate(data)
+
+        if len(errors.keys()) > 0:
+            return False, errors
+
+        with transaction.atomic():
+            instance = cls.objects.create(**cls.fields_from_data(data))
+            search.index_instance(instance)
+        versioning.bump_version(cls)
+
+        return True, None
+
+    @classmethod
+    async def acreate_from_data(cls, data):
+        """
+        Versión asíncrona de ``create_from_data``.
+
+        Delega en la versión sincrónica para que el registro y su documento de
+        búsqueda se escriban en la misma transacción."""
+        return await sync_to_async(cls.create_from_data)(data)
+
+    def changed_fields(self, data):
+        """
+        Compara los datos recibidos con los valores actuales y devuelve sólo los
+        campos que cambiaron, ya convertidos al tipo de cada columna."""
+        current = {field: getattr(self, field) for field in self.editable_fields()}
+        self.assign_data(data)
+
+        changed = {}
+        for name, old_value in current.items():
+            field = self._meta.get_field(name)
+            new_value = field.to_python(getattr(self, name))
+            setattr(self, name, new_value)
+            if new_value != field.to_python(old_value):
+                changed[name] = new_value
+        return changed
+
+    def update_from_data(self, data):
+        """
+        Actualiza el registro con la información proporcionada.
+
+        Sólo se escriben las columnas que cambiaron, con un único
+        ``UPDATE ... WHERE id = ...``; si no cambió nada no se ejecuta ninguna consulta."""
+        errors = self.validate(data)
+
+        if len(errors.keys()) > 0:
+            return False, errors
+
+        changed = self.changed_fields(data)
+        if not changed:
+            return True, None
+
+        self.updated_at = timezone.now()
+        with transaction.atomic():
+            type(self).objects.filter(pk=self.pk).update(updated_at=self.updated_at, **changed)
+            search.index_instance(self)
+        versioning.bump_version(type(self))
 
-    return None
+        return True, None
+
+    async def aupdate_from_data(self, data):
+        """
+        Versión asíncrona de ``update_from_data``, que también escribe el registro
+        y su documento de búsqueda en una sola transacción."""
+        return await sync_to_async(self.update_from_data)(data)
+
+    @classmethod
+    def delete_ids(cls, ids):
+        """
+        Elimina los registros indicados y devuelve cuántos se borraron.
+
+        Los modelos de Vetsoft no tienen señales ni relaciones en cascada, así que
+        Django resuelve el borrado con un único ``DELETE ... WHERE id IN`` sin
+        cargar las instancias; el índice de búsqueda se actualiza en la misma
+        transacción."""
+        with transaction.atomic():
+            deleted, _detail = cls.objects.filter(pk__in=ids).delete()
+            search.remove_documents(cls._meta.model_name, ids)
+        if deleted:
+            versioning.bump_version(cls)
+
+        return deleted
 
-class Client(models.Model):
+    @classmethod
+    async def adelete_ids(cls, ids):
+        """
+        Versión asíncrona de ``delete_ids``."""
+        return await sync_to_async(cls.delete_ids)(ids)
+
+
+class Client(VetsoftModel):
     name = models.CharField(max_length=100)
     phone = models.CharField(max_length=15)
     email = models.EmailField()
     address = models.CharField(max_length=100, blank=True)
 
-    def __str__(self):
-        return self.name
-    
+    optional_fields = ("address",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="app_client_name_idx"),
+            models.Index(fields=["email"], name="app_client_email_idx"),
+            models.Index(fields=["phone"], name="app_client_phone_idx"),
+        ]
+
     @staticmethod
     def get_required_fields():
         """
@@ -112,53 +210,44 @@ class Client(models.Model):
     def save_client(cls, client_data):
         """
         Crea un nuevo cliente utilizando los datos proporcionados"""
-        errors = validate_fields(client_data, Client.get_required_fields())
-
-        if len(errors.keys()) > 0:
-            return False, errors
+        return cls.create_from_data(client_data)
 
-        Client.objects.create(
-            name=client_data.get("name"),
-            phone=client_data.get("phone"),
-            email=client_data.get("email"),
-            address=client_data.get("address"),
-        )
-
-        return True, None
+    @classmethod
+    async def asave_client(cls, client_data):
+        """
+        Versión asíncrona de ``save_client``."""
+        return await cls.acreate_from_data(client_data)
 
     def update_client(self, client_data):
         """
         Actualiza los datos del cliente con la información proporcionada."""
-        errors = validate_fields(client_data, Client.get_required_fields())
-
-        if len(errors.keys()) > 0:
-            return False, errors
-
-        self.name = client_data.get("name", "") or self.name
-        self.email = client_data.get("email", "") or self.email
-        self.phone = client_data.get("phone", "") or self.phone
-        self.address = client_data.get("address", "")
+        return self.update_from_data(client_data)
 
-        self.save()
+    async def aupdate_client(self, client_data):
+        """
+        Versión asíncrona de ``update_client``."""
+        return await self.aupdate_from_data(client_data)
 
-        return True, None
 
-class Pet(models.Model):
+class Pet(VetsoftModel):
     name = models.CharField(max_length=100)
     breed = models.CharField(max_length=50)
     birthday = models.DateField()
     weight = models.IntegerField()
 
-    def __str__(self):
-        return self.name
-    
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="app_pet_name_idx"),
+            models.Index(fields=["breed", "name"], name="app_pet_breed_name_idx"),
+        ]
+
     @staticmethod
     def get_required_fields():
         """
-    Devuelve un diccionario que mapea los campos requeridos a sus descripciones en español."""
+        Devuelve un diccionario que mapea los campos requeridos a sus descripciones en español."""
         return {
             "name": "nombre",
-            "breed": "raza", 
+            "breed": "raza",
             "birthday": "fecha de nacimiento",
             "weight": "peso",
         }
@@ -166,151 +255,125 @@ class Pet(models.Model):
     @classmethod
     def save_pet(cls, pet_data):
         """
-        Crea una nueva mascota utilizando los datos proporcionados.
-"""
-        errors = validate_fields(pet_data, Pet.get_required_fields())
+        Crea una nueva mascota utilizando los datos proporcionados."""
+        return cls.create_from_data(pet_data)
 
-        if len(errors.keys()) > 0:
-            return False, errors
-
-
-        Pet.objects.create(
-            name=pet_data.get("name"),
-            breed=pet_data.get("breed"),
-            birthday=pet_data.get("birthday"),
-            weight=pet_data.get("weight"),
-        )
+    @classmethod
+    async def asave_pet(cls, pet_data):
+        """
+        Versión asíncrona de ``save_pet``."""
+        return await cls.acreate_from_data(pet_data)
 
-        return True, None
-    
     def update_pet(self, pet_data):
         """
         Actualiza los datos de la mascota con la información proporcionada."""
-        errors = validate_fields(pet_data, Pet.get_required_fields())
-
-        if len(errors.keys()) > 0:
-            return False, errors
+        return self.update_from_data(pet_data)
 
-        self.name = pet_data.get("name", "") or self.name
-        self.breed = pet_data.get("breed", "") or self.breed
-        self.birthday = pet_data.get("birthday", "") or self.birthday
-        self.weight = pet_data.get("weight", "") or self.weight
-
-        self.save()
+    async def aupdate_pet(self, pet_data):
+        """
+        Versión asíncrona de ``update_pet``."""
+        return await self.aupdate_from_data(pet_data)
 
-        return True, None
 
-class Medicine(models.Model):
+class Medicine(VetsoftModel):
     name = models.CharField(max_length=100)
     description = models.CharField(max_length=50)
     dose = models.IntegerField()
 
-    def __str__(self):
-        return self.name
-    
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="app_medicine_name_idx"),
+        ]
+
     @staticmethod
     def get_required_fields():
         """
         Devuelve un diccionario que mapea los campos requeridos a sus descripciones en español."""
         return {
             "name": "nombre",
-            "description": "descripción", 
+            "description": "descripción",
             "dose": "dosis",
         }
-    
+
     @classmethod
     def save_medicine(cls, medicine_data):
         """
         Crea un nuevo medicamento utilizando los datos proporcionados."""
-        errors = validate_fields(medicine_data, Medicine.get_required_fields())
-
-        if len(errors.keys()) > 0:
-            return False, errors
+        return cls.create_from_data(medicine_data)
 
-        Medicine.objects.create(
-            name=medicine_data.get("name"),
-            description=medicine_data.get("description"),
-            dose=medicine_data.get("dose"),
-        ),
-    
-        return True, None
+    @classmethod
+    async def asave_medicine(cls, medicine_data):
+        """
+        Versión asíncrona de ``save_medicine``."""
+        return await cls.acreate_from_data(medicine_data)
 
     def update_medicine(self, medicine_data):
         """
         Actualiza los datos del medicamento con la información proporcionada."""
-        errors = validate_fields(medicine_data, Medicine.get_required_fields())
+        return self.update_from_data(medicine_data)
 
-        if len(errors.keys()) > 0:
-            return False, errors
-
-        self.name = medicine_data.get("name", "") or self.name
-        self.description = medicine_data.get("description", "") or self.description
-        self.dose = medicine_data.get("dose", 1) or self.dose
-
-        self.save()
+    async def aupdate_medicine(self, medicine_data):
+        """
+        Versión asíncrona de ``update_medicine``."""
+        return await self.aupdate_from_data(medicine_data)
 
-        return True, None
 
-class Vet(models.Model):
+class Vet(VetsoftModel):
     name = models.CharField(max_length=100)
     email = models.EmailField()
     phone = models.CharField(max_length=15)
 
-    def __str__(self):
-        return self.name
-    
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="app_vet_name_idx"),
+            models.Index(fields=["email"], name="app_vet_email_idx"),
+            models.Index(fields=["phone"], name="app_vet_phone_idx"),
+        ]
+
     @staticmethod
     def get_required_fields():
         """
         Devuelve un diccionario que mapea los campos requeridos a sus descripciones en español."""
         return {
             "name": "nombre",
-            "email": "email", 
+            "email": "email",
             "phone": "phone",
         }
-    
+
     @classmethod
     def save_vet(cls, vet_data):
         """
         Crea un nuevo veterinario utilizando los datos proporcionados."""
-        errors = validate_fields(vet_data, Vet.get_required_fields())
+        return cls.create_from_data(vet_data)
 
-        if len(errors.keys()) > 0:
-            return False, errors
-
-        Vet.objects.create(
-            name=vet_data.get("name"),
-            email=vet_data.get("email"),
-            phone=vet_data.get("phone"),
-        )
+    @classmethod
+    async def asave_vet(cls, vet_data):
+        """
+        Versión asíncrona de ``save_vet``."""
+        return await cls.acreate_from_data(vet_data)
 
-        return True, None
-    
-    
     def update_vet(self, vet_data):
         """
         Actualiza los datos del veterinario con la información proporcionada."""
-        errors = validate_fields(vet_data, Vet.get_required_fields())
-
-        if len(errors.keys()) > 0:
-            return False, errors
+        return self.update_from_data(vet_data)
 
-        self.name = vet_data.get("name", "") or self.name
-        self.email = vet_data.get("email", "") or self.email
-        self.phone = vet_data.get("phone", "") or self.phone
+    async def aupdate_vet(self, vet_data):
+        """
+        Versión asíncrona de ``update_vet``."""
+        return await self.aupdate_from_data(vet_data)
 
-        self.save()
 
-        return True, None
-class Product(models.Model):
+class Product(VetsoftModel):
     name = models.CharField(max_length=100)
     type = models.CharField(max_length=15)
-    price =models.FloatField()
+    price = models.FloatField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="app_product_name_idx"),
+            models.Index(fields=["type", "name"], name="app_product_type_name_idx"),
+        ]
 
-    def __str__(self):
-        return self.name
-    
     @staticmethod
     def get_required_fields():
         """
@@ -322,34 +385,23 @@ class Product(models.Model):
         }
 
     @classmethod
-    def save_product(prod, product_data):
+    def save_product(cls, product_data):
         """
         Crea un nuevo producto utilizando los datos proporcionados."""
-        errors = validate_fields(product_data, Product.get_required_fields())
+        return cls.create_from_data(product_data)
 
-        if len(errors.keys()) > 0:
-            return False, errors
-
-        Product.objects.create(
-            name=product_data.get("name"),
-            type=product_data.get("type"),
-            price=product_data.get("price"),
-        )
-
-        return True, None
+    @classmethod
+    async def asave_product(cls, product_data):
+        """
+        Versión asíncrona de ``save_product``."""
+        return await cls.acreate_from_data(product_data)
 
     def update_product(self, product_data):
         """
         Actualiza los atributos del producto con los datos proporcionados."""
-        errors = validate_fields(product_data, Product.get_required_fields())
-
-        if len(errors.keys()) > 0:
-            return False, errors
+        return self.update_from_data(product_data)
 
-        self.name = product_data.get("name", "") or self.name
-        self.type= product_data.get("type", "") or self.type
-        self.price = product_data.get("price", 0.0) or self.price
-
-        self.save()
-
-        return True, None
+    async def aupdate_product(self, product_data):
+        """
+        Versión asíncrona de ``update_product``."""
+        return await self.aupdate_from_data(product_data)
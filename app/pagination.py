@@ -0,0 +1,255 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGE_SIZE = 500
+
+
+class KeysetPage:
+    """
+    Página de resultados obtenida mediante paginación por cursor (keyset).
+
+    En lugar de un número de página guarda el valor de la clave del primer y
+    último registro, de modo que la página siguiente se obtiene con un
+    ``WHERE clave > cursor`` sobre una columna indexada y no con un OFFSET.
+    """
+
+    def __init__(self, object_list, params, page_size, next_cursor=None,
+                 previous_cursor=None, count=None, count_is_estimate=False):
+        self.object_list = object_list
+        self.params = params
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_is_estimate = count_is_estimate
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        """Indica si existe una página posterior a la actual."""
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        """Indica si existe una página anterior a la actual."""
+        return self.previous_cursor is not None
+
+    @property
+    def next_query(self):
+        """Devuelve la query string que apunta a la página siguiente."""
+        return self._query(after=self.next_cursor)
+
+    @property
+    def previous_query(self):
+        """Devuelve la query string que apunta a la página anterior."""
+        return self._query(before=self.previous_cursor)
+
+    def _query(self, **cursor):
+        params = self.params.copy()
+        for key in ("after", "before"):
+            params.pop(key, None)
+        for key, value in cursor.items():
+            if value is not None:
+                params[key] = value
+        return params.urlencode()
+
+
+def get_page_size(request):
+    """
+    Obtiene el tamaño de página pedido en la solicitud, acotado al máximo configurado.
+    """
+    default = getattr(settings, "REPOSITORY_PAGE_SIZE", DEFAULT_PAGE_SIZE)
+    maximum = getattr(settings, "REPOSITORY_MAX_PAGE_SIZE", DEFAULT_MAX_PAGE_SIZE)
+
+    try:
+        page_size = int(request.GET.get("page_size", default))
+    except ValueError:
+        page_size = default
+
+    return max(1, min(page_size, maximum))
+
+
+def _parse_cursor(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def page_queryset(queryset, request, key="id"):
+    """
+    Construye la consulta de una página a partir de los cursores de la solicitud.
+
+    Devuelve la consulta limitada a ``page_size + 1`` filas (la fila extra indica
+    si hay más resultados) junto con los parámetros necesarios para armar la página.
+    """
+    page_size = get_page_size(request)
+    after = _parse_cursor(request.GET.get("after"))
+    before = _parse_cursor(request.GET.get("before"))
+
+    if before is not None:
+        queryset = queryset.filter(**{f"{key}__lt": before}).order_by(f"-{key}")
+    else:
+        if after is not None:
+            queryset = queryset.filter(**{f"{key}__gt": after})
+        queryset = queryset.order_by(key)
+
+    return queryset[:page_size + 1], page_size, after, before
+
+
+def build_page(rows, request, page_size, after, before, key="id", count=None,
+               count_is_estimate=False):
+    """
+    Arma una ``KeysetPage`` con las filas obtenidas por ``page_queryset``.
+    """
+    has_more = len(rows) > page_size
+    rows = list(rows[:page_size])
+    next_cursor = previous_cursor = None
+
+    if before is not None:
+        rows.reverse()
+        if rows:
+            next_cursor = getattr(rows[-1], key)
+            if has_more:
+                previous_cursor = getattr(rows[0], key)
+    elif rows:
+        if has_more:
+            next_cursor = getattr(rows[-1], key)
+        if after is not None:
+            previous_cursor = getattr(rows[0], key)
+
+    return KeysetPage(
+        rows,
+        request.GET,
+        page_size,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+        count=count,
+        count_is_estimate=count_is_estimate,
+    )
+
+
+def wants_exact_count(request):
+    """
+    Indica si la solicitud pidió el total exacto de registros (``?count=1``).
+    """
+    if request.GET.get("count") == "1":
+        return True
+    return getattr(settings, "REPOSITORY_EXACT_COUNT", False)
+
+
+def estimate_counts(models, using="default"):
+    """
+    Devuelve una estimación del total de filas de la tabla de cada modelo, sin
+    recorrerlas y con una sola consulta.
+
+    En Postgres se usa ``pg_class.reltuples`` y en SQLite la tabla ``sqlite_stat1``
+    que genera ``ANALYZE``. Los modelos sin estadísticas disponibles no se incluyen.
+    """
+    connection = connections[using]
+    tables = {model._meta.db_table: model for model in models}
+    if not tables:
+        return {}
+
+    if connection.vendor == "postgresql":
+        placeholders = ", ".join(["to_regclass(%s)"] * len(tables))
+        sql = f"SELECT relname, reltuples::bigint FROM pg_class WHERE oid IN ({placeholders})"
+    elif connection.vendor == "sqlite":
+        # Hay una fila por índice; todas empiezan con la cantidad de filas de la tabla.
+        placeholders = ", ".join(["%s"] * len(tables))
+        sql = f"SELECT tbl, stat FROM sqlite_stat1 WHERE tbl IN ({placeholders})"
+    else:
+        return {}
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, list(tables))
+            rows = cursor.fetchall()
+    except DatabaseError:
+        return {}
+
+    estimates = {}
+    for table, stat in rows:
+        estimate = int(str(stat).split()[0])
+        if table in tables and estimate >= 0:
+            estimates[tables[table]] = estimate
+    return estimates
+
+
+def bounded_counts(models, limit, using="default"):
+    """
+    Cuenta las filas de la tabla de cada modelo hasta ``limit``, con una sola consulta.
+
+    Cada tabla se recorre como mucho ``limit`` filas, así que el costo no depende
+    de su tamaño; una tabla con más filas se informa con ``limit``.
+    """
+    models = list(models)
+    if not models:
+        return {}
+
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    sql = " UNION ALL ".join(
+        f"SELECT {index}, COUNT(*) FROM "
+        f"(SELECT 1 FROM {quote(model._meta.db_table)} LIMIT {int(limit)}) AS bounded_{index}"
+        for index, model in enumerate(models)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return {models[index]: count for index, count in cursor.fetchall()}
+
+
+def estimate_count(model, using="default"):
+    """
+    Devuelve una estimación del total de filas de la tabla del modelo sin recorrerla,
+    o None si no hay estadísticas disponibles.
+    """
+    return estimate_counts([model], using).get(model)
+
+
+def paginate(queryset, request, key="id"):
+    """
+    Pagina una consulta por cursor sobre la columna ``key``.
+
+    Las páginas profundas cuestan lo mismo que la primera porque nunca se usa
+    OFFSET. El total de registros sólo se cuenta con ``COUNT(*)`` cuando se pide
+    explícitamente; en otro caso se informa una estimación si existe.
+    """
+    page_qs, page_size, after, before = page_queryset(queryset, request, key)
+    rows = list(page_qs)
+
+    if wants_exact_count(request):
+        count, count_is_estimate = queryset.count(), False
+    else:
+        count, count_is_estimate = estimate_count(queryset.model, queryset.db), True
+
+    return build_page(
+        rows, request, page_size, after, before, key,
+        count=count, count_is_estimate=count_is_estimate,
+    )
+
+
+async def apaginate(queryset, request, key="id"):
+    """
+    Versión asíncrona de ``paginate`` para las vistas servidas por ASGI.
+    """
+    page_qs, page_size, after, before = page_queryset(queryset, request, key)
+    rows = [instance async for instance in page_qs]
+
+    if wants_exact_count(request):
+        count, count_is_estimate = await queryset.acount(), False
+    else:
+        count = await sync_to_async(estimate_count)(queryset.model, queryset.db)
+        count_is_estimate = True
+
+    return build_page(
+        rows, request, page_size, after, before, key,
+        count=count, count_is_estimate=count_is_estimate,
+    )
@@ -0,0 +1,281 @@
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_MIN_SIZE = 1
+DEFAULT_MAX_SIZE = 10
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CHECK_INTERVAL = 30.0
+DEFAULT_MAX_LIFETIME = 3600.0
+
+# Pools del proceso, por alias y parámetros de conexión. Un proceso hijo creado
+# con fork no debe usar las conexiones heredadas: ``pools_pid`` indica de quién son.
+pools = {}
+pools_pid = os.getpid()
+pools_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    """
+    No se pudo obtener una conexión del pool dentro del tiempo de espera.
+    """
+
+
+class PooledConnection:
+    """
+    Conexión del pool junto con los datos necesarios para decidir si reutilizarla.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.returned_at = self.created_at
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones thread-safe con tamaño mínimo y máximo.
+
+    - ``connect`` crea una conexión nueva.
+    - ``check`` verifica una conexión que estuvo inactiva más de ``check_interval``
+      segundos antes de entregarla; si falla, se descarta y se usa otra.
+    - ``reset`` deja la conexión en estado limpio (sin transacción abierta ni
+      parámetros de sesión) cada vez que se entrega.
+    - ``close`` cierra una conexión descartada.
+
+    Las conexiones inactivas se reutilizan en orden LIFO, así las menos usadas
+    envejecen y se cierran al superar ``max_lifetime``. Es seguro usarlo desde
+    varios threads, que es como Django ejecuta el ORM tanto en las vistas
+    sincrónicas como en las asíncronas (``sync_to_async``).
+    """
+
+    def __init__(self, connect, check=None, reset=None, close=None,
+                 min_size=DEFAULT_MIN_SIZE, max_size=DEFAULT_MAX_SIZE,
+                 timeout=DEFAULT_TIMEOUT, check_interval=DEFAULT_CHECK_INTERVAL,
+                 max_lifetime=DEFAULT_MAX_LIFETIME):
+        if min_size > max_size:
+            raise ValueError("min_size no puede ser mayor que max_size")
+
+        self._connect = connect
+        self._check = check
+        self._reset = reset
+        self._close = close or (lambda connection: connection.close())
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.max_lifetime = max_lifetime
+
+        self.closed = False
+        self._idle = deque()
+        self._in_use = {}
+        self._pending = 0
+        self._waiting = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "timeouts": 0,
+            "failed_checks": 0,
+            "wait_time": 0.0,
+            "max_wait_time": 0.0,
+        }
+
+        for _ in range(min_size):
+            self._idle.append(self._open())
+
+    @property
+    def size(self):
+        """Cantidad total de conexiones abiertas (en uso e inactivas)."""
+        return len(self._idle) + len(self._in_use) + self._pending
+
+    def _open(self, connect=None):
+        connection = PooledConnection((connect or self._connect)())
+        with self._condition:
+            self._stats["connections_created"] += 1
+        return connection
+
+    def _discard(self, pooled):
+        with self._condition:
+            self._stats["connections_closed"] += 1
+        try:
+            self._close(pooled.connection)
+        except Exception:
+            # La conexión ya estaba rota; no hay nada más que cerrar.
+            pass
+
+    def _usable(self, pooled, now):
+        if now - pooled.created_at > self.max_lifetime:
+            return False
+        if self._check is None or now - pooled.returned_at < self.check_interval:
+            return True
+        try:
+            self._check(pooled.connection)
+        except Exception:
+            with self._condition:
+                self._stats["failed_checks"] += 1
+            return False
+        return True
+
+    def acquire(self, timeout=None, connect=None):
+        """
+        Entrega una conexión, esperando a que se libere una si el pool está completo.
+
+        Si hace falta abrir una conexión nueva se usa ``connect`` en lugar de la
+        función del pool, cuando se indica.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._condition:
+            self._waiting += 1
+            try:
+                while not self._idle and self.size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No hay conexiones libres después de {timeout:.1f}s "
+                            f"({self.max_size} en uso)",
+                        )
+                    self._condition.wait(remaining)
+                pooled = self._idle.pop() if self._idle else None
+                # El lugar queda reservado mientras se verifica o se abre la conexión.
+                self._pending += 1
+            finally:
+                self._waiting -= 1
+
+        try:
+            if pooled is not None and not self._usable(pooled, time.monotonic()):
+                self._discard(pooled)
+                pooled = None
+            if pooled is None:
+                pooled = self._open(connect)
+            if self._reset is not None:
+                try:
+                    self._reset(pooled.connection)
+                except Exception:
+                    self._discard(pooled)
+                    raise
+        except Exception:
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify()
+            raise
+
+        wait = time.monotonic() - start
+        with self._condition:
+            self._pending -= 1
+            self._in_use[id(pooled.connection)] = pooled
+            self._stats["checkouts"] += 1
+            self._stats["wait_time"] += wait
+            self._stats["max_wait_time"] = max(self._stats["max_wait_time"], wait)
+        return pooled.connection
+
+    def release(self, connection, broken=False):
+        """
+        Devuelve una conexión al pool, o la cierra si está rota o el pool se cerró.
+        """
+        with self._condition:
+            pooled = self._in_use.pop(id(connection), None)
+            if pooled is None:
+                return
+            keep = not broken and not self.closed and len(self._idle) < self.max_size
+            if keep:
+                pooled.returned_at = time.monotonic()
+                self._idle.append(pooled)
+            self._condition.notify()
+
+        if not keep:
+            self._discard(pooled)
+
+    def close(self):
+        """
+        Cierra todas las conexiones inactivas del pool; las que están en uso se
+        cierran cuando se devuelven.
+        """
+        with self._condition:
+            self.closed = True
+            idle, self._idle = list(self._idle), deque()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self):
+        """
+        Devuelve el estado del pool: conexiones en uso, inactivas, en espera y
+        los tiempos de espera acumulados.
+        """
+        with self._condition:
+            return {
+                "size": self.size,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                **self._stats,
+            }
+
+
+def forget_inherited_pools():
+    """
+    Descarta, sin cerrarlos, los pools heredados del proceso padre.
+
+    Las conexiones heredadas con fork comparten el socket con las del padre:
+    usarlas o cerrarlas desde el hijo corrompería las sesiones del padre. Se
+    llama con ``pools_lock`` tomado.
+    """
+    global pools_pid
+
+    if pools_pid != os.getpid():
+        pools.clear()
+        pools_pid = os.getpid()
+
+
+def get_pool(alias, key, factory):
+    """
+    Devuelve el pool del alias para los parámetros de conexión ``key``,
+    creándolo con ``factory()`` la primera vez.
+
+    Si los parámetros del alias cambiaron (por ejemplo, al crear o borrar la base
+    de tests se cambia ``NAME``), los pools anteriores del alias se cierran: sus
+    conexiones apuntan a una base que ya no es la configurada.
+    """
+    with pools_lock:
+        forget_inherited_pools()
+        pool = pools.get((alias, key))
+        if pool is None:
+            pool = pools[(alias, key)] = factory()
+        stale = [
+            pools.pop(other) for other in list(pools)
+            if other[0] == alias and other[1] != key
+        ]
+    for other in stale:
+        other.close()
+    return pool
+
+
+def close_pools(alias=None):
+    """
+    Cierra y descarta los pools del alias, o todos los del proceso.
+    """
+    with pools_lock:
+        forget_inherited_pools()
+        closed = [
+            pools.pop(key) for key in list(pools)
+            if alias is None or key[0] == alias
+        ]
+    for pool in closed:
+        pool.close()
+
+
+def all_stats():
+    """
+    Devuelve las estadísticas de todos los pools del proceso, por alias.
+    """
+    with pools_lock:
+        forget_inherited_pools()
+        return {alias: pool.stats() for (alias, _key), pool in pools.items()}
@@ -0,0 +1,223 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils.decorators import sync_and_async_middleware
+
+from . import index_advisor, timing
+
+logger = logging.getLogger("app.queries")
+
+MODES = ("warn", "fail")
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+DEFAULT_SLOW_QUERY_MS = 100
+
+current_queries = ContextVar("current_queries", default=None)
+
+# Los savepoints de ``transaction.atomic()`` anidado (por ejemplo, dentro de la
+# transacción de cada test) no son consultas de la vista y no se cuentan.
+TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+# Indica si las consultas en curso son los lotes de una operación masiva.
+in_bulk_operation = ContextVar("in_bulk_operation", default=False)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Una solicitud superó su presupuesto de consultas o repitió una consulta (N+1).
+    """
+
+
+class RequestQueries:
+    """
+    Consultas ejecutadas durante una solicitud, con su duración en segundos.
+    """
+
+    __slots__ = ("queries", "bulk")
+
+    def __init__(self):
+        self.queries = []
+        self.bulk = []
+
+    @property
+    def count(self):
+        """Cantidad de consultas ejecutadas."""
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        """Tiempo total de las consultas, en segundos."""
+        return sum(duration for _sql, duration in self.queries)
+
+    def repeated(self, threshold):
+        """
+        Devuelve las consultas SELECT con la misma forma que se ejecutaron al menos
+        ``threshold`` veces, el síntoma típico de un N+1.
+        """
+        shapes = Counter(
+            index_advisor.normalize(sql)
+            for sql, _duration in self.queries
+            if sql.lstrip().upper().startswith("SELECT")
+        )
+        return [(sql, count) for sql, count in shapes.most_common() if count >= threshold]
+
+
+@contextmanager
+def bulk_operation():
+    """
+    Las consultas ejecutadas dentro del bloque no cuentan para el presupuesto ni
+    para la detección de N+1.
+
+    Se usa en las operaciones masivas (``bulk_create``, ``bulk_update``,
+    ``in_bulk``): Django las divide en tantas consultas como exija el límite de
+    parámetros de la base, así que su cantidad crece con el tamaño del lote y no
+    indica un problema de la vista.
+    """
+    token = in_bulk_operation.set(True)
+    try:
+        yield
+    finally:
+        in_bulk_operation.reset(token)
+
+
+def get_mode():
+    """
+    Devuelve el modo de control de consultas: ``"warn"``, ``"fail"`` o None (apagado).
+    """
+    mode = getattr(settings, "QUERY_BUDGET_MODE", None)
+    return mode if mode in MODES else None
+
+
+def get_budgets():
+    """
+    Devuelve la cantidad máxima de consultas de cada nombre de URL, declarada en
+    ``app/urls.py``.
+    """
+    from . import urls
+
+    return urls.query_budgets
+
+
+def log_slow_query(sql, params, duration, connection):
+    """
+    Registra una consulta lenta con sus parámetros y su plan de ejecución.
+    """
+    plan = []
+    if sql.lstrip().upper().startswith(index_advisor.EXPLAINABLE):
+        # El EXPLAIN no debe registrarse como una consulta más de la solicitud.
+        token = current_queries.set(None)
+        try:
+            plan = index_advisor.explain(sql, connection, params)
+        except DatabaseError:
+            pass
+        finally:
+            current_queries.reset(token)
+
+    logger.warning(
+        "Consulta lenta (%.1f ms): %s; params=%r\n%s",
+        duration * 1000, sql, params, "\n".join(plan),
+    )
+
+
+def inspect_queries(execute, sql, params, many, context):
+    """
+    Envoltorio de ejecución que registra cada consulta de la solicitud en curso y
+    las que superan ``SLOW_QUERY_MS``.
+    """
+    queries = current_queries.get()
+    if queries is None or sql.startswith(TRANSACTION_CONTROL):
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        (queries.bulk if in_bulk_operation.get() else queries.queries).append((sql, duration))
+        slow = getattr(settings, "SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS)
+        if slow is not None and duration * 1000 >= slow and not many:
+            log_slow_query(sql, params, duration, context["connection"])
+
+
+def install_query_inspector(sender, connection, **kwargs):
+    """
+    Receptor de ``connection_created`` que instala ``inspect_queries`` en la conexión.
+    """
+    if inspect_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(inspect_queries)
+
+
+def problems(route, queries):
+    """
+    Devuelve los problemas de la solicitud: presupuesto superado y consultas repetidas.
+    """
+    found = []
+    budget = get_budgets().get(route)
+    if budget is not None and queries.count > budget:
+        found.append(
+            f"{route} ejecutó {queries.count} consultas "
+            f"({queries.duration * 1000:.1f} ms); el presupuesto es {budget}",
+        )
+
+    threshold = getattr(settings, "N_PLUS_ONE_THRESHOLD", DEFAULT_N_PLUS_ONE_THRESHOLD)
+    for sql, count in queries.repeated(threshold):
+        found.append(f"{route} repitió {count} veces la consulta (posible N+1): {sql}")
+    return found
+
+
+def check(request, queries, mode):
+    """
+    Avisa o falla, según el modo, si la solicitud tuvo algún problema.
+    """
+    found = problems(timing.route_name(request), queries)
+    if not found:
+        return
+    if mode == "fail":
+        raise QueryBudgetExceeded("\n".join(found))
+    for problem in found:
+        logger.warning(problem)
+
+
+@sync_and_async_middleware
+def query_budget_middleware(get_response):
+    """
+    Middleware que registra las consultas de cada solicitud y controla su
+    presupuesto y las consultas repetidas. Con ``QUERY_BUDGET_MODE`` apagado
+    (producción) no hace nada.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            mode = get_mode()
+            if mode is None:
+                return await get_response(request)
+
+            queries = RequestQueries()
+            token = current_queries.set(queries)
+            try:
+                response = await get_response(request)
+            finally:
+                current_queries.reset(token)
+            check(request, queries, mode)
+            return response
+    else:
+        def middleware(request):
+            mode = get_mode()
+            if mode is None:
+                return get_response(request)
+
+            queries = RequestQueries()
+            token = current_queries.set(queries)
+            try:
+                response = get_response(request)
+            finally:
+                current_queries.reset(token)
+            check(request, queries, mode)
+            return response
+
+    return middleware
@@ -0,0 +1,124 @@
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.utils.decorators import sync_and_async_middleware
+
+PRIMARY = "default"
+
+# Sólo los modelos de Vetsoft se leen de las réplicas; las sesiones, los usuarios
+# y el resto de las aplicaciones de Django siempre usan la base principal.
+REPLICATED_APPS = ("app",)
+
+PIN_COOKIE = "vetsoft_primary"
+
+DEFAULT_PIN_SECONDS = 5
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Indica si la solicitud en curso debe leer de la base principal.
+pinned_to_primary = ContextVar("pinned_to_primary", default=False)
+
+
+def get_replicas():
+    """
+    Devuelve los alias de las réplicas de lectura configuradas.
+    """
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def get_pin_seconds():
+    """
+    Devuelve durante cuántos segundos, después de una escritura, se lee de la base
+    principal (el retraso de replicación que se tolera).
+    """
+    return getattr(settings, "REPLICA_PIN_SECONDS", DEFAULT_PIN_SECONDS)
+
+
+def written_recently(timestamp):
+    """
+    Indica si hubo una escritura hace menos de ``REPLICA_PIN_SECONDS``, es decir,
+    si las réplicas todavía podrían no tenerla.
+    """
+    if not get_replicas():
+        return False
+    # ``timestamp`` está truncado a segundos: se suma uno para no quedarse corto.
+    return time.time() < timestamp + get_pin_seconds() + 1
+
+
+class ReplicaRouter:
+    """
+    Envía las escrituras a la base principal y reparte las lecturas de los modelos
+    de Vetsoft entre las réplicas, salvo que la solicitud esté fijada a la
+    principal o la lectura ocurra dentro de una transacción.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Elige la base para una lectura."""
+        replicas = get_replicas()
+        if (
+            not replicas
+            or model._meta.app_label not in REPLICATED_APPS
+            or pinned_to_primary.get()
+            or transaction.get_connection(PRIMARY).in_atomic_block
+        ):
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        """Las escrituras van siempre a la base principal."""
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """La principal y sus réplicas tienen los mismos datos."""
+        return True
+
+
+def must_pin(request):
+    """
+    Indica si la solicitud debe leer de la principal: las que escriben y las que
+    llegan poco después de una escritura (por ejemplo, la redirección al
+    repositorio después de guardar un formulario).
+    """
+    return request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES
+
+
+def finish(request, response):
+    """
+    Después de una escritura marca al cliente para que lea de la principal
+    mientras las réplicas se ponen al día.
+    """
+    if request.method not in SAFE_METHODS and get_replicas():
+        response.set_cookie(
+            PIN_COOKIE, "1", max_age=get_pin_seconds(), httponly=True, samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def replica_pin_middleware(get_response):
+    """
+    Middleware que fija a la base principal las escrituras y las lecturas que las
+    siguen, para que el usuario siempre vea sus propios cambios.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = pinned_to_primary.set(must_pin(request))
+            try:
+                response = await get_response(request)
+            finally:
+                pinned_to_primary.reset(token)
+            return finish(request, response)
+    else:
+        def middleware(request):
+            token = pinned_to_primary.set(must_pin(request))
+            try:
+                response = get_response(request)
+            finally:
+                pinned_to_primary.reset(token)
+            return finish(request, response)
+
+    return middleware
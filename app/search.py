@@ -0,0 +1,222 @@
+import re
+
+from django.db import connection
+from django.urls import reverse
+
+SEARCH_TABLE = "app_search"
+
+# Cada documento del índice se identifica con ``object_id * 8 + código``, de modo
+# que la actualización y el borrado se resuelven por clave primaria.
+KIND_CODES = {
+    "client": 1,
+    "pet": 2,
+    "medicine": 3,
+    "vet": 4,
+    "product": 5,
+}
+
+CODE_KINDS = {code: kind for kind, code in KIND_CODES.items()}
+
+SEARCH_FIELDS = {
+    "client": ("email", "phone", "address"),
+    "pet": ("breed",),
+    "medicine": ("description",),
+    "vet": ("email", "phone"),
+    "product": ("type",),
+}
+
+RESULT_LINKS = {
+    "client": ("Cliente", "clients_edit"),
+    "pet": ("Animal", "pets_edit"),
+    "medicine": ("Medicamento", "medicines_edit"),
+    "vet": ("Veterinario", "vets_edit"),
+    "product": ("Producto", "products_edit"),
+}
+
+SQLITE_SCHEMA = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "title, body, tokenize='unicode61 remove_diacritics 2')",
+]
+
+POSTGRES_SCHEMA = [
+    f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+    "doc_id bigint PRIMARY KEY, "
+    "title text NOT NULL, "
+    "body text NOT NULL, "
+    "document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', "
+    "regexp_replace(body, '[^[:alnum:]]+', ' ', 'g')), 'B')) STORED)",
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx "
+    f"ON {SEARCH_TABLE} USING GIN (document)",
+]
+
+TOKEN_REGEX = re.compile(r"\w+")
+
+
+def is_supported(conn=None):
+    """
+    Indica si la base de datos tiene un índice de texto completo disponible.
+    """
+    return (conn or connection).vendor in ("sqlite", "postgresql")
+
+
+def create_index(conn):
+    """
+    Crea la tabla del índice de búsqueda para el motor de la conexión.
+    """
+    statements = SQLITE_SCHEMA if conn.vendor == "sqlite" else POSTGRES_SCHEMA
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def drop_index(conn):
+    """
+    Elimina la tabla del índice de búsqueda.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def document_id(kind, object_id):
+    """
+    Devuelve el identificador del documento de un registro dentro del índice.
+    """
+    return int(object_id) * 8 + KIND_CODES[kind]
+
+
+def build_document(instance):
+    """
+    Devuelve el identificador, título y cuerpo indexable de una instancia de modelo.
+    """
+    kind = instance._meta.model_name
+    body = " ".join(
+        str(getattr(instance, field) or "") for field in SEARCH_FIELDS[kind]
+    )
+    return document_id(kind, instance.pk), instance.name, body
+
+
+def index_documents(documents, conn=None):
+    """
+    Inserta o reemplaza documentos ``(doc_id, título, cuerpo)`` en el índice.
+    """
+    conn = conn or connection
+    if not documents or not is_supported(conn):
+        return
+
+    if conn.vendor == "sqlite":
+        sql = f"INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, title, body) VALUES (%s, %s, %s)"
+    else:
+        sql = (
+            f"INSERT INTO {SEARCH_TABLE} (doc_id, title, body) VALUES (%s, %s, %s) "
+            "ON CONFLICT (doc_id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body"
+        )
+
+    with conn.cursor() as cursor:
+        cursor.executemany(sql, documents)
+
+
+def index_instance(instance):
+    """
+    Agrega o actualiza una instancia en el índice de búsqueda.
+    """
+    index_documents([build_document(instance)])
+
+
+def remove_documents(kind, object_ids, conn=None):
+    """
+    Elimina del índice los documentos de los registros indicados.
+    """
+    conn = conn or connection
+    if not object_ids or not is_supported(conn):
+        return
+
+    column = "rowid" if conn.vendor == "sqlite" else "doc_id"
+    with conn.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE {column} = %s",
+            [(document_id(kind, object_id),) for object_id in object_ids],
+        )
+
+
+def rebuild_index(models, conn=None, chunk_size=2000):
+    """
+    Reconstruye por completo el índice a partir de los modelos indicados.
+    """
+    conn = conn or connection
+    if not is_supported(conn):
+        return 0
+
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+    total = 0
+    for model in models:
+        batch = []
+        for instance in model.objects.using(conn.alias).iterator(chunk_size=chunk_size):
+            batch.append(build_document(instance))
+            if len(batch) >= chunk_size:
+                index_documents(batch, conn)
+                total += len(batch)
+                batch = []
+        index_documents(batch, conn)
+        total += len(batch)
+
+    return total
+
+
+def build_match_query(query, vendor):
+    """
+    Convierte el texto ingresado en una consulta de prefijos segura para el motor.
+    """
+    tokens = TOKEN_REGEX.findall(query.lower())
+    if not tokens:
+        return None
+
+    if vendor == "sqlite":
+        return " ".join(f'"{token}"*' for token in tokens)
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def search(query, limit=20):
+    """
+    Busca en el índice de texto completo y devuelve los resultados ordenados por relevancia.
+    """
+    if not is_supported():
+        return []
+
+    match = build_match_query(query, connection.vendor)
+    if match is None:
+        return []
+
+    if connection.vendor == "sqlite":
+        sql = (
+            f"SELECT rowid, title, body FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s "
+            f"ORDER BY bm25({SEARCH_TABLE}, 10.0, 1.0) LIMIT %s"
+        )
+    else:
+        sql = (
+            f"SELECT doc_id, title, body FROM {SEARCH_TABLE}, "
+            "to_tsquery('simple', %s) query WHERE document @@ query "
+            "ORDER BY ts_rank(document, query) DESC LIMIT %s"
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, limit])
+        rows = cursor.fetchall()
+
+    results = []
+    for doc_id, title, body in rows:
+        kind = CODE_KINDS[doc_id % 8]
+        label, url_name = RESULT_LINKS[kind]
+        results.append({
+            "kind": kind,
+            "label": label,
+            "title": title,
+            "body": body,
+            "href": reverse(url_name, kwargs={"id": doc_id // 8}),
+        })
+
+    return results
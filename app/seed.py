@@ -0,0 +1,244 @@
+import multiprocessing
+import random
+from datetime import date, timedelta
+from functools import partial
+
+from django.db import connections, router
+
+from . import imports, versioning
+from .models import Client, Medicine, Pet, Product, Vet
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Los nombres sólo usan letras aceptadas por ``validate_vetsoft_name`` (sin ñ ni ü).
+FIRST_NAMES = (
+    "Juan", "María", "José", "Ana", "Luis", "Lucía", "Carlos", "Sofía", "Jorge",
+    "Valentina", "Martín", "Camila", "Diego", "Julieta", "Pablo", "Florencia",
+    "Matías", "Agustina", "Sebastián", "Martina", "Tomás", "Victoria", "Nicolás",
+    "Paula", "Facundo", "Rocío", "Andrés", "Carolina", "Ramón", "Inés",
+)
+
+LAST_NAMES = (
+    "González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez",
+    "Pérez", "García", "Sánchez", "Romero", "Sosa", "Álvarez", "Torres", "Ruiz",
+    "Ramírez", "Flores", "Acosta", "Benítez", "Medina", "Herrera", "Suárez",
+    "Aguirre", "Giménez", "Gutiérrez", "Pereyra", "Rojas", "Molina", "Castro",
+)
+
+PET_NAMES = (
+    "Firulais", "Luna", "Toby", "Mora", "Rocco", "Lola", "Simba", "Nala", "Coco",
+    "Milo", "Kira", "Bruno", "Olivia", "Tango", "Pipa", "Manchas", "Pelusa",
+)
+
+BREEDS = (
+    "Mestizo", "Labrador", "Caniche", "Golden Retriever", "Ovejero Alemán",
+    "Bulldog Francés", "Beagle", "Siamés", "Persa", "Maine Coon", "Dogo Argentino",
+)
+
+MEDICINES = (
+    ("Amoxicilina", "Antibiótico de amplio espectro"),
+    ("Meloxicam", "Antiinflamatorio no esteroide"),
+    ("Ivermectina", "Antiparasitario interno y externo"),
+    ("Prednisolona", "Corticoide"),
+    ("Tramadol", "Analgésico"),
+    ("Enrofloxacina", "Antibiótico"),
+    ("Metronidazol", "Antiprotozoario"),
+    ("Furosemida", "Diurético"),
+    ("Omeprazol", "Protector gástrico"),
+    ("Praziquantel", "Antiparasitario interno"),
+)
+
+MEDICINE_VARIANTS = ("Forte", "Plus", "Junior", "Gotas", "Comprimidos", "Inyectable")
+
+PRODUCTS = (
+    ("Alimento balanceado", "alimento"),
+    ("Piedras sanitarias", "higiene"),
+    ("Collar antipulgas", "accesorio"),
+    ("Shampoo", "higiene"),
+    ("Hueso de cuero", "juguete"),
+    ("Pelota", "juguete"),
+    ("Cucha", "accesorio"),
+    ("Rascador", "accesorio"),
+    ("Snacks", "alimento"),
+)
+
+PRODUCT_VARIANTS = ("chico", "mediano", "grande", "premium", "cachorro", "adulto")
+
+STREETS = tuple(range(1, 150))
+
+ACCENTS = str.maketrans("áéíóúÁÉÍÓÚ", "aeiouAEIOU")
+
+
+def email_for(name, index):
+    """
+    Arma un email de Vetsoft único a partir del nombre y el número de fila.
+    """
+    local = ".".join(name.translate(ACCENTS).lower().split())
+    return f"{local}.{index}@vetsoft.com"
+
+
+def phone(rng):
+    """
+    Devuelve un teléfono argentino con el prefijo 54 que exige la validación.
+    """
+    return f"54{rng.randrange(10**9, 10**10)}"
+
+
+def full_name(rng):
+    """
+    Devuelve un nombre y apellido al azar.
+    """
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def client_row(rng, index, today):
+    """Datos de un cliente."""
+    name = full_name(rng)
+    return {
+        "name": name,
+        "phone": phone(rng),
+        "email": email_for(name, index),
+        "address": f"{rng.choice(STREETS)} y {rng.choice(STREETS)}",
+    }
+
+
+def pet_row(rng, index, today):
+    """Datos de una mascota, nacida en los últimos veinte años."""
+    return {
+        "name": rng.choice(PET_NAMES),
+        "breed": rng.choice(BREEDS),
+        "birthday": today - timedelta(days=rng.randint(1, 20 * 365)),
+        "weight": rng.randint(1, 80),
+    }
+
+
+def medicine_row(rng, index, today):
+    """Datos de un medicamento."""
+    name, description = rng.choice(MEDICINES)
+    return {
+        "name": f"{name} {rng.choice(MEDICINE_VARIANTS)}",
+        "description": description,
+        "dose": rng.randint(1, 10),
+    }
+
+
+def vet_row(rng, index, today):
+    """Datos de un veterinario."""
+    name = full_name(rng)
+    return {
+        "name": name,
+        "email": email_for(name, index),
+        "phone": phone(rng),
+    }
+
+
+def product_row(rng, index, today):
+    """Datos de un producto."""
+    name, kind = rng.choice(PRODUCTS)
+    return {
+        "name": f"{name} {rng.choice(PRODUCT_VARIANTS)}",
+        "type": kind,
+        "price": round(rng.uniform(100, 50000), 2),
+    }
+
+
+GENERATORS = {
+    "clients": (Client, client_row),
+    "pets": (Pet, pet_row),
+    "medicines": (Medicine, medicine_row),
+    "vets": (Vet, vet_row),
+    "products": (Product, product_row),
+}
+
+
+def generate(kind, start, stop, seed, today=None):
+    """
+    Genera los datos de las filas ``start`` a ``stop`` (sin incluir) de un modelo.
+
+    Cada lote usa su propio generador, derivado de la semilla, el modelo y la
+    primera fila, así el resultado no depende de cuántos procesos participen ni
+    del orden en que se ejecuten los lotes.
+    """
+    _model, make_row = GENERATORS[kind]
+    today = today or date.today()
+    rng = random.Random(f"{seed}:{kind}:{start}")
+    return [make_row(rng, index, today) for index in range(start, stop)]
+
+
+def plan_batches(counts, batch_size, seed):
+    """
+    Divide las cantidades pedidas por modelo en lotes ``(modelo, inicio, fin, semilla)``.
+    """
+    return [
+        (kind, start, min(start + batch_size, count), seed)
+        for kind, count in counts.items()
+        for start in range(0, count, batch_size)
+    ]
+
+
+def generate_batch(batch):
+    """
+    Genera los datos de un lote ``(modelo, inicio, fin, semilla)``.
+    """
+    kind, start, stop, seed = batch
+    return kind, generate(kind, start, stop, seed)
+
+
+def insert_rows(kind, rows, index=True):
+    """
+    Inserta las filas generadas de un modelo con ``bulk_create`` y, si se pide, las
+    indexa para la búsqueda; devuelve el modelo y la cantidad de filas creadas.
+    """
+    model, _make_row = GENERATORS[kind]
+    instances = [model(**row) for row in rows]
+    if index:
+        return kind, imports.insert_batch(model, instances)
+    return kind, len(model.objects.bulk_create(instances))
+
+
+def seed_batch(batch, index=True):
+    """
+    Genera e inserta un lote.
+    """
+    kind, rows = generate_batch(batch)
+    return insert_rows(kind, rows, index)
+
+
+def seed(counts, seed=0, batch_size=DEFAULT_BATCH_SIZE, workers=1, index=True, progress=None):
+    """
+    Carga datos de prueba válidos en la base.
+
+    Con ``workers > 1`` los lotes se reparten entre procesos, cada uno con su
+    propia conexión. SQLite admite una sola escritura a la vez, así que con SQLite
+    los procesos sólo generan los lotes y el proceso principal los inserta.
+    ``progress(kind, created)`` se llama al terminar cada lote. Devuelve la
+    cantidad de filas creadas por modelo.
+    """
+    batches = plan_batches(counts, batch_size, seed)
+    task = partial(seed_batch, index=index)
+    created = dict.fromkeys(counts, 0)
+
+    def record(results):
+        for kind, count in results:
+            created[kind] += count
+            if progress is not None:
+                progress(kind, count)
+
+    if workers > 1:
+        # Los procesos hijos no deben heredar las conexiones abiertas del padre.
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            if connections[router.db_for_write(Client)].vendor == "sqlite":
+                record(
+                    insert_rows(kind, rows, index)
+                    for kind, rows in pool.imap_unordered(generate_batch, batches)
+                )
+            else:
+                record(pool.imap_unordered(task, batches))
+    else:
+        record(map(task, batches))
+
+    for kind, count in created.items():
+        if count:
+            versioning.bump_version(GENERATORS[kind][0])
+    return created
@@ -0,0 +1,91 @@
+import time
+
+from django.conf import settings
+from django.db import OperationalError
+
+# Perfil de alto rendimiento para SQLite, pensado para varios workers de uvicorn
+# sobre el mismo archivo: WAL permite lecturas concurrentes con una escritura, y
+# ``busy_timeout`` hace que una escritura espere el lock en lugar de fallar.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 0.05
+
+
+def is_enabled():
+    """
+    Indica si el perfil de rendimiento de SQLite está activado en la configuración.
+    """
+    return getattr(settings, "SQLITE_PERFORMANCE_PROFILE", False)
+
+
+def get_pragmas():
+    """
+    Devuelve los PRAGMA del perfil, con los valores sobrescritos en ``SQLITE_PRAGMAS``.
+    """
+    return {**DEFAULT_PRAGMAS, **getattr(settings, "SQLITE_PRAGMAS", {})}
+
+
+def apply_pragmas(cursor, pragmas):
+    """
+    Ejecuta los PRAGMA indicados sobre un cursor de SQLite.
+    """
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+class BusyRetry:
+    """
+    Envoltorio de ejecución que reintenta las consultas que fallan con
+    ``database is locked``, esperando cada vez el doble.
+
+    Sólo reintenta fuera de un bloque ``atomic``: dentro de una transacción el
+    lock suele deberse a otra escritura en curso y reintentar la sentencia no
+    resuelve el conflicto.
+    """
+
+    def __init__(self, connection, attempts=DEFAULT_RETRY_ATTEMPTS, delay=DEFAULT_RETRY_DELAY):
+        self.connection = connection
+        self.attempts = attempts
+        self.delay = delay
+
+    def __call__(self, execute, sql, params, many, context):
+        """Ejecuta la consulta, reintentándola si la base está bloqueada."""
+        for attempt in range(self.attempts + 1):
+            try:
+                return execute(sql, params, many, context)
+            except OperationalError as error:
+                retry = (
+                    "locked" in str(error)
+                    and not self.connection.in_atomic_block
+                    and attempt < self.attempts
+                )
+                if not retry:
+                    raise
+                time.sleep(self.delay * 2 ** attempt)
+
+
+def configure_connection(sender, connection, **kwargs):
+    """
+    Receptor de ``connection_created`` que aplica el perfil a cada conexión nueva
+    de SQLite.
+    """
+    if connection.vendor != "sqlite" or not is_enabled():
+        return
+
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, get_pragmas())
+
+    if not any(isinstance(wrapper, BusyRetry) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(BusyRetry(
+            connection,
+            attempts=getattr(settings, "SQLITE_RETRY_ATTEMPTS", DEFAULT_RETRY_ATTEMPTS),
+            delay=getattr(settings, "SQLITE_RETRY_DELAY", DEFAULT_RETRY_DELAY),
+        ))
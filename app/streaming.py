@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Marcadores que las plantillas de repositorio emiten alrededor de las filas
+# cuando se renderizan en modo streaming.
+ROWS_START = "<!--stream-rows-->"
+ROWS_END = "<!--/stream-rows-->"
+
+
+def wants_streaming(request):
+    """
+    Indica si la solicitud pidió el repositorio completo en modo streaming (``?stream=1``).
+    """
+    return request.GET.get("stream") == "1"
+
+
+def get_chunk_size():
+    """
+    Devuelve la cantidad de filas que se leen y envían por cada bloque.
+    """
+    return getattr(settings, "REPOSITORY_STREAM_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def split_template(template_name, list_name, request, context=None):
+    """
+    Renderiza la plantilla del repositorio sin filas y la divide en tres partes.
+
+    Devuelve el encabezado, el contenido que se muestra cuando no hay filas y el
+    cierre de la página.
+    """
+    html = render_to_string(
+        template_name, {**(context or {}), list_name: [], "streaming": True},
+        request=request,
+    )
+    head, rest = html.split(ROWS_START, 1)
+    empty, tail = rest.split(ROWS_END, 1)
+    return head, empty, tail
+
+
+async def stream_rows(queryset, render_row, csrf_token, chunk_size):
+    """
+    Recorre la consulta por bloques con un cursor del lado del servidor y renderiza
+    cada fila con ``render_row``, entregando un bloque de HTML por cada bloque leído.
+    """
+    buffer = []
+    async for instance in queryset.aiterator(chunk_size=chunk_size):
+        buffer.append(render_row(instance, csrf_token))
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_repository(request, queryset, template_name, list_name, render_row,
+                      context=None):
+    """
+    Devuelve el repositorio completo como un ``StreamingHttpResponse``.
+
+    El encabezado de la página se envía antes de consultar la base de datos y las
+    filas se renderizan a medida que se leen, por lo que el tiempo hasta el primer
+    byte y la memoria usada no dependen del tamaño de la tabla.
+    """
+    head, empty, tail = split_template(template_name, list_name, request, context)
+    csrf_token = get_token(request)
+    chunk_size = get_chunk_size()
+
+    async def content():
+        yield head
+        has_rows = False
+        async for chunk in stream_rows(
+            queryset.order_by("id"), render_row, csrf_token, chunk_size,
+        ):
+            has_rows = True
+            yield chunk
+        if not has_rows:
+            yield empty
+        yield tail
+
+    return StreamingHttpResponse(content(), content_type="text/html; charset=utf-8")
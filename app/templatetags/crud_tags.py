@@ -0,0 +1,16 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@register.filter
+def field(instance, name):
+    """Devuelve el valor del campo ``name`` de una instancia."""
+    return getattr(instance, name)
+
+
+@register.simple_tag(takes_context=True)
+def render_row(context, instance):
+    """Renderiza la fila de una instancia usando la caché de fragmentos del CRUD."""
+    return mark_safe(context["crud"].render_row(instance, str(context.get("csrf_token", ""))))
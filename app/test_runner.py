@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class VetsoftTestRunner(DiscoverRunner):
+    """
+    Runner de tests de Vetsoft.
+
+    - Hace fallar las solicitudes que superan su presupuesto de consultas o
+      repiten una consulta (N+1).
+    - Guarda las versiones de los modelos en una caché en memoria propia de cada
+      proceso, en lugar de la caché en disco que comparten los workers del
+      servidor de desarrollo.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        """Activa el control de consultas en modo ``fail`` y aísla la caché de versiones."""
+        super().setup_test_environment(**kwargs)
+        self._query_budget_mode = getattr(settings, "QUERY_BUDGET_MODE", None)
+        settings.QUERY_BUDGET_MODE = "fail"
+        self._isolated_caches = override_settings(CACHES={
+            **settings.CACHES,
+            settings.VERSION_CACHE_ALIAS: {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "vetsoft-test-versions",
+            },
+        })
+        self._isolated_caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        """Restaura el modo de control de consultas y la caché de versiones."""
+        self._isolated_caches.disable()
+        settings.QUERY_BUDGET_MODE = self._query_budget_mode
+        super().teardown_test_environment(**kwargs)
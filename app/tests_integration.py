@@ -1,9 +1,41 @@
+import asyncio
+import csv
+import glob
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+import time
 from datetime import date, datetime
+from unittest import mock
 
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.template.backends.django import Template as BaseTemplate
+from django.test import Client as DjangoClient
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
-from app.models import Client, Medicine, Pet, Product
+from app import (
+    crud,
+    fragments,
+    imports,
+    index_advisor,
+    metrics,
+    pool,
+    query_budget,
+    search,
+    seed,
+    timing,
+    urls,
+    versioning,
+)
+from app.models import Client, Medicine, Pet, Product, Vet
 
 
 class HomePageTest(TestCase):
@@ -12,6 +44,269 @@ class HomePageTest(TestCase):
         self.assertTemplateUsed(response, "home.html")
 
 
+class ServerTimingTest(TestCase):
+    def setUp(self):
+        timing.histograms.clear()
+
+    def test_response_has_server_timing_header(self):
+        client = Client.objects.create(
+            name="Juan Sebastian Veron",
+            phone="54221555232",
+            address="13 y 44",
+            email="brujita75@vetsoft.com",
+        )
+
+        response = self.client.get(reverse("clients_edit", kwargs={"id": client.id}))
+
+        header = response["Server-Timing"]
+        self.assertRegex(header, r'^db;dur=[\d.]+;desc="[1-9]\d* consultas", ')
+        self.assertRegex(header, r"tpl;dur=[\d.]+, total;dur=[\d.]+$")
+
+    def test_nested_renders_are_counted_once(self):
+        for i in range(3):
+            Client.objects.create(name=f"Cliente {i}", phone=f"5422100000{i}")
+        render = BaseTemplate.render
+
+        def slow_render(self, context=None, request=None):
+            time.sleep(0.02)
+            return render(self, context, request)
+
+        with mock.patch.object(BaseTemplate, "render", slow_render):
+            response = self.client.get(reverse("clients_repo"))
+
+        durations = dict(re.findall(r"(tpl|total);dur=([\d.]+)", response["Server-Timing"]))
+        self.assertGreaterEqual(float(durations["tpl"]), 80)
+        self.assertLessEqual(float(durations["tpl"]), float(durations["total"]))
+
+    def test_requests_are_recorded_per_route(self):
+        for _ in range(3):
+            self.client.get(reverse("clients_form"))
+        self.client.get(reverse("home"))
+
+        stats = timing.histograms.snapshot()
+        self.assertEqual(stats["clients_form"]["total"]["count"], 3)
+        self.assertEqual(stats["home"]["total"]["count"], 1)
+        self.assertIsNotNone(stats["clients_form"]["tpl"]["p99"])
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        timing.histograms.clear()
+
+    def test_metrics_are_exposed_in_prometheus_format(self):
+        Client.objects.create(
+            name="Juan Sebastian Veron",
+            phone="54221555232",
+            address="13 y 44",
+            email="brujita75@vetsoft.com",
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.client.get(reverse("clients_form"))
+        self.client.get(reverse("clients_form"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("metrics"))
+
+        counts = [q["sql"].upper() for q in queries if "COUNT(" in q["sql"].upper()]
+        self.assertTrue(all("LIMIT" in sql for sql in counts))
+
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        content = response.content.decode()
+        self.assertIn('vetsoft_requests_total{view="clients_form"} 2', content)
+        self.assertIn('vetsoft_request_duration_seconds_bucket{view="clients_form",le="+Inf"} 2', content)
+        self.assertIn("# TYPE vetsoft_db_duration_seconds histogram", content)
+        self.assertIn('vetsoft_model_rows{model="Client"} 1', content)
+        self.assertIn("vetsoft_fragment_cache_hit_ratio", content)
+        self.assertIn(f'vetsoft_process_resident_memory_bytes{{pid="{os.getpid()}"}}', content)
+
+    @override_settings(METRICS_ROW_COUNT_LIMIT=2)
+    def test_rows_without_statistics_are_counted_up_to_the_limit(self):
+        Vet.objects.create(name="Veterinario", phone="54221555232", email="vet@vetsoft.com")
+        for i in range(3):
+            Client.objects.create(name=f"Cliente {i}", phone=f"5422100000{i}")
+
+        # Sin estadísticas, como una base SQLite en la que nunca se ejecutó ANALYZE.
+        with mock.patch("app.metrics.estimate_counts", return_value={}), \
+                CaptureQueriesContext(connection) as queries:
+            content = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn('vetsoft_model_rows{model="Client"} 2', content)
+        self.assertIn('vetsoft_model_rows{model="Vet"} 1', content)
+        self.assertIn('vetsoft_model_rows{model="Pet"} 0', content)
+        self.assertEqual(len([q for q in queries if "COUNT(" in q["sql"].upper()]), 1)
+
+    def test_metrics_are_aggregated_across_workers(self):
+        self.client.get(reverse("clients_form"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            worker = metrics.process_state()
+            worker["pid"] = -1
+            with open(os.path.join(directory, "other.json"), "w") as file:
+                json.dump(worker, file)
+
+            with override_settings(METRICS_DIR=directory):
+                response = self.client.get(reverse("metrics"))
+
+            self.assertTrue(os.path.exists(os.path.join(directory, f"{os.getpid()}.json")))
+
+        content = response.content.decode()
+        self.assertIn('vetsoft_requests_total{view="clients_form"} 2', content)
+        self.assertNotIn('pid="-1"', content)
+
+    def test_finished_workers_are_folded_into_one_file(self):
+        self.client.get(reverse("clients_form"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            for pid in (-1, -2):
+                worker = metrics.process_state()
+                worker["pid"] = pid
+                with open(os.path.join(directory, f"worker{pid}.json"), "w") as file:
+                    json.dump(worker, file)
+
+            with override_settings(METRICS_DIR=directory):
+                first = self.client.get(reverse("metrics")).content.decode()
+                files = sorted(glob.glob(os.path.join(directory, "*.json")))
+                second = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertEqual(files, [
+            os.path.join(directory, f"{os.getpid()}.json"),
+            os.path.join(directory, metrics.FINISHED_FILE),
+        ])
+        self.assertIn('vetsoft_requests_total{view="clients_form"} 3', first)
+        self.assertIn('vetsoft_requests_total{view="clients_form"} 3', second)
+
+    def test_connection_pool_stats_are_exported(self):
+        self.addCleanup(pool.close_pools, "metrics-test")
+        connection_pool = pool.ConnectionPool(mock.Mock, min_size=1, max_size=4)
+        pool.get_pool("metrics-test", "vetsoft", lambda: connection_pool)
+        connection_pool.acquire()
+
+        content = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn('vetsoft_db_pool_checkouts_total{database="metrics-test"} 1', content)
+        self.assertIn('vetsoft_db_pool_connections_in_use{database="metrics-test"} 1', content)
+        self.assertIn('vetsoft_db_pool_max_size{database="metrics-test"} 4', content)
+
+
+class QueryBudgetTest(TestCase):
+    def setUp(self):
+        self.client_record = Client.objects.create(
+            name="Juan Sebastian Veron",
+            phone="54221555232",
+            address="13 y 44",
+            email="brujita75@vetsoft.com",
+        )
+
+    def test_exceeding_the_budget_fails_in_tests(self):
+        with mock.patch.dict(urls.query_budgets, {"clients_repo": 0}):
+            with self.assertRaisesMessage(query_budget.QueryBudgetExceeded, "clients_repo ejecutó"):
+                self.client.get(reverse("clients_repo"))
+
+    @override_settings(QUERY_BUDGET_MODE="warn")
+    def test_exceeding_the_budget_warns_in_staging(self):
+        with mock.patch.dict(urls.query_budgets, {"clients_repo": 0}):
+            with self.assertLogs("app.queries", "WARNING") as logs:
+                response = self.client.get(reverse("clients_repo"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("el presupuesto es 0", logs.output[0])
+
+    @override_settings(QUERY_BUDGET_MODE="warn", SLOW_QUERY_MS=0)
+    def test_slow_queries_are_logged_with_params_and_plan(self):
+        with self.assertLogs("app.queries", "WARNING") as logs:
+            self.client.get(reverse("clients_edit", kwargs={"id": self.client_record.id}))
+
+        self.assertIn("Consulta lenta", logs.output[0])
+        self.assertIn(f"params=({self.client_record.id},", logs.output[0])
+        # El plan depende de la base y de sus estadísticas; sólo se verifica que esté.
+        _message, plan = logs.output[0].split("\n", 1)
+        self.assertIn("app_client", plan)
+
+    @override_settings(QUERY_BUDGET_MODE=None)
+    def test_disabled_mode_does_not_inspect_queries(self):
+        with mock.patch.dict(urls.query_budgets, {"clients_repo": 0}):
+            response = self.client.get(reverse("clients_repo"))
+
+        self.assertEqual(response.status_code, 200)
+
+
+class RepositoryStreamingTest(TestCase):
+    async def get_streamed_content(self, url):
+        response = await self.async_client.get(url, {"stream": 1})
+        self.assertTrue(response.streaming)
+        return "".join([chunk.decode() async for chunk in response.streaming_content])
+
+    @override_settings(REPOSITORY_PAGE_SIZE=1, REPOSITORY_STREAM_CHUNK_SIZE=2)
+    async def test_stream_renders_every_row(self):
+        await Product.objects.abulk_create(
+            Product(name=f"Producto {i}", type="alimento", price=i) for i in range(5)
+        )
+
+        content = await self.get_streamed_content(reverse("products_repo"))
+
+        for i in range(5):
+            self.assertIn(f"Producto {i}", content)
+        self.assertNotIn("No existen productos", content)
+        self.assertNotIn("stream-rows", content)
+        self.assertTrue(content.strip().endswith("</html>"))
+
+    async def test_stream_shows_empty_message(self):
+        content = await self.get_streamed_content(reverse("clients_repo"))
+
+        self.assertIn("No existen clientes", content)
+
+
+class SearchTest(TestCase):
+    def test_search_use_results_template(self):
+        response = self.client.get(reverse("search"), {"q": "juan"})
+        self.assertTemplateUsed(response, "search/results.html")
+
+    def test_search_finds_saved_client_by_prefix(self):
+        Client.save_client(
+            {
+                "name": "Juan Sebastian Veron",
+                "phone": "54221555232",
+                "address": "13 y 44",
+                "email": "brujita75@vetsoft.com",
+            },
+        )
+        client = Client.objects.get(name="Juan Sebastian Veron")
+
+        response = self.client.get(reverse("search"), {"q": "sebas ver"})
+
+        self.assertEqual(len(response.context["results"]), 1)
+        self.assertContains(response, reverse("clients_edit", kwargs={"id": client.id}))
+
+    def test_search_reflects_updated_pet(self):
+        Pet.save_pet({"name": "Nami", "breed": "Siames", "birthday": "2020-05-22", "weight": 30})
+        pet = Pet.objects.get(name="Nami")
+
+        pet.update_pet({
+            "name": "Luffy",
+            "breed": pet.breed,
+            "birthday": "2020-05-22",
+            "weight": 30,
+        })
+
+        self.assertEqual(self.client.get(reverse("search"), {"q": "nami"}).context["results"], [])
+        results = self.client.get(reverse("search"), {"q": "luffy"}).context["results"]
+        self.assertEqual([result["title"] for result in results], ["Luffy"])
+
+    def test_search_forgets_deleted_product(self):
+        Product.save_product({"name": "Collar", "type": "accesorio", "price": "10"})
+        product = Product.objects.get(name="Collar")
+
+        self.client.post(reverse("products_delete"), data={"product_id": product.id})
+
+        response = self.client.get(reverse("search"), {"q": "collar"})
+        self.assertEqual(response.context["results"], [])
+
+    def test_search_without_query_shows_no_results(self):
+        response = self.client.get(reverse("search"), {"q": "  ** "})
+        self.assertContains(response, "No se encontraron resultados")
+
+
 class ClientsTest(TestCase):
     def test_repo_use_repo_template(self):
         response = self.client.get(reverse("clients_repo"))
@@ -45,6 +340,27 @@ class ClientsTest(TestCase):
 
         self.assertRedirects(response, reverse("clients_repo"))
 
+    async def test_can_create_client_concurrently(self):
+        responses = await asyncio.gather(*[
+            self.async_client.post(
+                reverse("clients_form"),
+                data={
+                    "name": "Juan Sebastian Veron",
+                    "phone": f"5422155523{i}",
+                    "email": f"brujita{i}@vetsoft.com",
+                },
+            )
+            for i in range(3)
+        ])
+
+        self.assertEqual([response.status_code for response in responses], [302] * 3)
+        self.assertEqual(await Client.objects.acount(), 3)
+
+    def test_delete_of_missing_client_is_not_found(self):
+        response = self.client.post(reverse("clients_delete"), data={"client_id": 999})
+
+        self.assertEqual(response.status_code, 404)
+
     def test_validation_errors_create_client(self):
         response = self.client.post(
             reverse("clients_form"),
@@ -166,6 +482,557 @@ class ClientsTest(TestCase):
         self.assertEqual(editedClient.email, client.email)
 
 
+class CrudEngineTest(TestCase):
+    def test_every_model_is_registered_with_its_routes(self):
+        self.assertEqual(
+            sorted(crud.registry), ["clients", "medicines", "pets", "products", "vets"],
+        )
+        for config in crud.registry.values():
+            response = self.client.get(reverse(config.url_names["repo"]))
+            self.assertTemplateUsed(response, config.repository_template)
+            self.assertTemplateUsed(response, "crud/repository.html")
+
+            response = self.client.get(reverse(config.url_names["form"]))
+            self.assertTemplateUsed(response, config.form_template)
+
+    def test_can_delete_vet(self):
+        vet = Vet.objects.create(name="Ana", email="ana@vetsoft.com", phone="54221555232")
+
+        response = self.client.post(reverse("vets_delete"), data={"vet_id": vet.id})
+
+        self.assertRedirects(response, reverse("vets_repo"))
+        self.assertFalse(Vet.objects.exists())
+
+
+class ConditionalGetTest(TestCase):
+    def get_etag(self, url_name):
+        response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+        return response["ETag"]
+
+    def test_repo_answers_not_modified_without_queries(self):
+        etag = self.get_etag("products_repo")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("products_repo"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_save_invalidates_etag(self):
+        etag = self.get_etag("products_repo")
+
+        Product.save_product({"name": "Collar", "type": "accesorio", "price": "10"})
+
+        response = self.client.get(reverse("products_repo"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Collar")
+
+    def test_update_and_delete_invalidate_etag(self):
+        Client.save_client(
+            {"name": "Ana", "phone": "54221555232", "email": "ana@vetsoft.com"},
+        )
+        client = Client.objects.get()
+        etag = self.get_etag("clients_repo")
+
+        client.update_client({"name": "Ana Maria", "phone": client.phone, "email": client.email})
+        updated_etag = self.get_etag("clients_repo")
+        self.assertNotEqual(etag, updated_etag)
+
+        self.client.post(reverse("clients_delete"), data={"client_id": client.id})
+        self.assertNotEqual(updated_etag, self.get_etag("clients_repo"))
+
+    def test_deploy_invalidates_etag(self):
+        with override_settings(BUILD_ID="1.0"):
+            etag = self.get_etag("products_repo")
+        with override_settings(BUILD_ID="1.1"):
+            response = self.client.get(reverse("products_repo"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_tests_do_not_share_the_version_cache(self):
+        self.assertIsInstance(versioning.get_cache(), LocMemCache)
+
+    def test_etag_depends_on_page(self):
+        etag = self.get_etag("pets_repo")
+
+        response = self.client.get(
+            reverse("pets_repo"), {"after": 10}, HTTP_IF_NONE_MATCH=etag,
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+
+class RowFragmentCacheTest(TestCase):
+    def setUp(self):
+        fragments.row_cache.clear()
+
+    def test_repo_reuses_rendered_rows(self):
+        Client.save_client({"name": "Ana", "phone": "54221555232", "email": "ana@vetsoft.com"})
+        self.client.get(reverse("clients_repo"))
+
+        response = self.client.get(reverse("clients_repo"))
+
+        self.assertEqual(fragments.row_cache.stats()["hits"], 1)
+        self.assertContains(response, "ana@vetsoft.com")
+        self.assertNotContains(response, fragments.CSRF_PLACEHOLDER)
+        self.assertContains(response, 'name="csrfmiddlewaretoken"')
+
+    def test_repo_rerenders_only_changed_row(self):
+        for name in ("Ana", "Luis"):
+            Client.save_client(
+                {"name": name, "phone": "54221555232", "email": "ana@vetsoft.com"},
+            )
+        self.client.get(reverse("clients_repo"))
+
+        client = Client.objects.get(name="Ana")
+        client.update_client({"name": "Ana Maria", "phone": client.phone, "email": client.email})
+        response = self.client.get(reverse("clients_repo"))
+
+        self.assertEqual(fragments.row_cache.stats()["hits"], 1)
+        self.assertContains(response, "Ana Maria")
+
+
+class ExportTest(TestCase):
+    async def get_export(self, url_name, **params):
+        response = await self.async_client.get(reverse(url_name), params)
+        self.assertTrue(response.streaming)
+        return response, b"".join([chunk async for chunk in response.streaming_content])
+
+    async def test_export_clients_as_csv(self):
+        await Client.objects.acreate(
+            name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com",
+        )
+
+        response, content = await self.get_export("clients_export", format="csv")
+
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["name"], "Juan Sebastian Veron")
+        self.assertEqual(rows[0]["email"], "brujita75@vetsoft.com")
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    async def test_export_products_as_gzipped_jsonl(self):
+        await Product.objects.abulk_create(
+            Product(name=f"Producto {i}", type="alimento", price=i) for i in range(5)
+        )
+
+        response, content = await self.get_export("products_export", format="jsonl", gzip=1)
+
+        lines = gzip.decompress(content).decode().splitlines()
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn("productos.jsonl.gz", response["Content-Disposition"])
+        self.assertEqual([json.loads(line)["name"] for line in lines], [f"Producto {i}" for i in range(5)])
+
+    async def test_export_unknown_format(self):
+        response = await self.async_client.get(reverse("pets_export"), {"format": "xml"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_command_writes_file(self):
+        Pet.objects.create(name="Nami", breed="Siames", birthday="2020-05-22", weight=30)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pets.jsonl")
+            call_command("export", "pets", format="jsonl", output=path)
+            with open(path) as output:
+                pet = json.loads(output.readline())
+
+        self.assertEqual(pet["name"], "Nami")
+        self.assertEqual(pet["birthday"], "2020-05-22")
+
+
+class BulkDeleteTest(TestCase):
+    def test_bulk_delete_runs_one_delete(self):
+        products = Product.objects.bulk_create(
+            Product(name=f"Producto {i}", type="alimento", price=i) for i in range(4)
+        )
+        ids = [products[0].id, products[2].id, products[3].id]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("products_bulk_delete"), {"ids": ids})
+
+        deletes = [q for q in queries if q["sql"].startswith('DELETE FROM "app_product"')]
+        self.assertRedirects(response, reverse("products_repo"))
+        self.assertEqual(len(deletes), 1)
+        self.assertEqual(list(Product.objects.values_list("id", flat=True)), [products[1].id])
+
+    def test_bulk_delete_reports_count_once(self):
+        client = Client.objects.create(name="Carlos Tevez", phone="54221232555", email="apache@vetsoft.com")
+
+        response = self.client.post(
+            reverse("clients_bulk_delete"), {"ids": [client.id, client.id + 100]}, follow=True,
+        )
+
+        self.assertContains(response, "Se eliminaron 1 de 2 clientes seleccionados")
+        self.assertNotIn("ETag", response)
+        self.assertFalse(search.search("Tevez"))
+
+        response = self.client.get(reverse("clients_repo"))
+        self.assertNotContains(response, "Se eliminaron")
+        self.assertIn("ETag", response)
+
+
+class SeedTest(TestCase):
+    def test_seed_command_fills_every_model_in_batches(self):
+        stdout = io.StringIO()
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "seed", "--clients=7", "--pets=5", "--medicines=3", "--vets=2",
+                "--products=4", "--batch-size=3", "--seed=1", stdout=stdout,
+            )
+
+        self.assertEqual(
+            [model.objects.count() for model in (Client, Pet, Medicine, Vet, Product)],
+            [7, 5, 3, 2, 4],
+        )
+        inserts = [query for query in queries.captured_queries if query["sql"].startswith("INSERT INTO \"app_")]
+        self.assertEqual(len(inserts), 3 + 2 + 1 + 1 + 2)
+        self.assertEqual(len(search.search("vetsoft", limit=100)), 9)
+        self.assertIn("21 registros generados", stdout.getvalue())
+
+    def test_seed_without_index(self):
+        created = seed.seed({"clients": 3}, index=False)
+
+        self.assertEqual(created, {"clients": 3})
+        self.assertEqual(search.search("vetsoft"), [])
+
+
+class ImportTest(TestCase):
+    def test_import_command_reports_invalid_rows(self):
+        content = (
+            "name,phone,email,address\n"
+            "Juan Sebastian Veron,54221555232,brujita75@vetsoft.com,13 y 44\n"
+            "Guido Carrillo,221555232,goleador@vetsoft.com,\n"
+            "Carlos Tevez,54221232555,apache@vetsoft.com,\n"
+        )
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "clients.csv")
+            with open(path, "w") as file:
+                file.write(content)
+            call_command("importdata", "clients", path, stdout=stdout, stderr=stderr)
+
+        self.assertEqual(
+            list(Client.objects.order_by("id").values_list("name", "address")),
+            [("Juan Sebastian Veron", "13 y 44"), ("Carlos Tevez", "")],
+        )
+        self.assertIn("2 registros importados, 1 filas con errores", stdout.getvalue())
+        self.assertIn("Línea 3: phone: El teléfono debe comenzar siempre con 54", stderr.getvalue())
+
+    def test_import_inserts_in_batches(self):
+        rows = [
+            (i + 1, {"name": "Producto", "type": "alimento", "price": str(i)})
+            for i in range(5)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            result = imports.import_rows(Product, rows, batch_size=2)
+
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "app_product"')]
+        self.assertEqual(result, imports.ImportResult(5, []))
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(len(search.search("alimento")), 5)
+
+    def test_import_view_accepts_jsonl_upload(self):
+        content = (
+            '{"name": "Amoxicilina", "description": "Antibiotico", "dose": 5}\n'
+            '{"name": "Ibuprofeno", "description": "Antiinflamatorio", "dose": 20}\n'
+            "no es json\n"
+        )
+        upload = SimpleUploadedFile("medicamentos.jsonl", content.encode())
+
+        response = self.client.post(reverse("medicines_import"), {"file": upload})
+
+        self.assertEqual(Medicine.objects.get().name, "Amoxicilina")
+        self.assertEqual(response.context["result"].created, 1)
+        self.assertContains(response, "La dosis debe estar entre 1 y 10")
+        self.assertContains(response, "La línea no es un objeto JSON válido")
+
+    def test_import_view_reports_badly_encoded_file(self):
+        content = "name,phone,email\nJosé Pérez,54221555232,jose@vetsoft.com\n"
+        upload = SimpleUploadedFile("clientes.csv", content.encode("latin-1"))
+
+        response = self.client.post(reverse("clients_import"), {"file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["errors"], {"file": "El archivo debe estar codificado en UTF-8"})
+        self.assertFalse(Client.objects.exists())
+
+    def test_import_view_reports_malformed_csv(self):
+        content = (
+            "name,phone,email\n"
+            "Juan Sebastian Veron,54221555232,brujita75@vetsoft.com\n"
+            '"Carlos" Tevez,54221232555,apache@vetsoft.com\n'
+        )
+        upload = SimpleUploadedFile("clientes.csv", content.encode())
+
+        response = self.client.post(reverse("clients_import"), {"file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("mal formado en la línea 3", response.context["errors"]["file"])
+        self.assertContains(response, "mal formado en la línea 3")
+
+    def test_import_command_fails_on_badly_encoded_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "medicines.jsonl")
+            with open(path, "wb") as file:
+                file.write('{"name": "Ácido", "description": "x", "dose": 5}\n'.encode("latin-1"))
+
+            with self.assertRaisesMessage(CommandError, "codificado en UTF-8"):
+                call_command("importdata", "medicines", path)
+
+
+class ApiTest(TestCase):
+    def send(self, method, name, data):
+        return getattr(self.client, method)(
+            reverse("api", args=[name]), json.dumps(data), content_type="application/json",
+        )
+
+    def test_batch_create_in_one_insert(self):
+        data = [
+            {"name": "Juan Sebastian Veron", "phone": "54221555232", "email": "brujita75@vetsoft.com"},
+            {"name": "Carlos Tevez", "phone": "54221232555", "email": "apache@vetsoft.com", "address": "1 y 57"},
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.send("post", "clients", data)
+
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "app_client"')]
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual([c["name"] for c in response.json()["results"]], ["Juan Sebastian Veron", "Carlos Tevez"])
+        self.assertEqual(Client.objects.get(name="Carlos Tevez").address, "1 y 57")
+
+    def test_batch_with_errors_writes_nothing(self):
+        data = [
+            {"name": "Amoxicilina", "description": "Antibiotico", "dose": 5},
+            {"name": "Ibuprofeno", "description": "Antiinflamatorio", "dose": 20},
+        ]
+
+        response = self.send("post", "medicines", data)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"], {"1": {"dose": "La dosis debe estar entre 1 y 10"}})
+        self.assertFalse(Medicine.objects.exists())
+
+    def test_batch_update_and_delete(self):
+        products = Product.objects.bulk_create(
+            Product(name=f"Producto {i}", type="alimento", price=i) for i in range(3)
+        )
+
+        response = self.send("patch", "products", [
+            {"id": products[0].id, "name": "Balanceado", "type": "alimento", "price": 10},
+            {"id": products[1].id, "name": "Collar", "type": "accesorio", "price": 5},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Product.objects.get(pk=products[1].id).type, "accesorio")
+
+        response = self.send("delete", "products", [products[0].id, products[2].id])
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertEqual(list(Product.objects.values_list("name", flat=True)), ["Collar"])
+
+    @override_settings(REPOSITORY_PAGE_SIZE=2)
+    def test_list_is_paginated_by_cursor(self):
+        Vet.objects.bulk_create(
+            Vet(name=f"Veterinario {i}", email=f"vet{i}@vetsoft.com", phone="54221555232")
+            for i in "abc"
+        )
+
+        first = self.client.get(reverse("api", args=["vets"])).json()
+        second = self.client.get(reverse("api", args=["vets"]), {"after": first["next"]}).json()
+
+        self.assertEqual(len(first["results"]), 2)
+        self.assertEqual([v["name"] for v in second["results"]], ["Veterinario c"])
+        self.assertIsNone(second["next"])
+
+    def test_unknown_resource(self):
+        self.assertEqual(self.client.get(reverse("api", args=["owners"])).status_code, 404)
+
+    def test_writes_require_the_csrf_token(self):
+        client = DjangoClient(enforce_csrf_checks=True)
+        data = [{"name": "Juan Sebastian Veron", "phone": "54221555232", "email": "brujita75@vetsoft.com"}]
+
+        response = client.post(reverse("api", args=["clients"]), json.dumps(data), content_type="text/plain")
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Client.objects.exists())
+
+        client.get(reverse("clients_form"))
+        response = client.post(
+            reverse("api", args=["clients"]), json.dumps(data), content_type="application/json",
+            headers={"X-CSRFToken": client.cookies["csrftoken"].value},
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_get_issues_the_csrf_cookie_for_writes(self):
+        client = DjangoClient(enforce_csrf_checks=True)
+        vet = Vet.objects.create(name="Veterinario", phone="54221555232", email="vet@vetsoft.com")
+
+        response = client.get(reverse("api", args=["vets"]))
+        self.assertIn("csrftoken", response.cookies)
+
+        response = client.delete(
+            reverse("api", args=["vets"]), json.dumps([vet.id]), content_type="application/json",
+            headers={"X-CSRFToken": response.cookies["csrftoken"].value},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Vet.objects.exists())
+
+    def test_patch_keeps_the_fields_that_are_not_sent(self):
+        client = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com", address="13 y 44",
+        )
+
+        response = self.send("patch", "clients", [{"id": client.id, "phone": "54221232555"}])
+
+        self.assertEqual(response.status_code, 200)
+        client.refresh_from_db()
+        self.assertEqual((client.phone, client.address), ("54221232555", "13 y 44"))
+
+    def test_put_replaces_the_whole_object(self):
+        client = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com", address="13 y 44",
+        )
+
+        response = self.send("put", "clients", [
+            {"id": client.id, "name": "Juan Sebastian Veron", "phone": "54221555232", "email": "brujita75@vetsoft.com"},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        client.refresh_from_db()
+        self.assertEqual(client.address, "")
+
+    def test_update_of_missing_record_is_rejected(self):
+        response = self.send("patch", "clients", [{"id": 999, "name": "Carlos Tevez"}, {"name": "Sin id"}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"], {"1": {"id": "Se esperaba el id del registro"}})
+
+    def test_large_batches_stay_within_the_query_budget(self):
+        data = [
+            {field: str(value) for field, value in row.items()}
+            for row in seed.generate("pets", 0, 3000, seed=0)
+        ]
+
+        response = self.send("post", "pets", data)
+        self.assertEqual(response.status_code, 201)
+
+        ids = [pet["id"] for pet in response.json()["results"]]
+        response = self.send("patch", "pets", [{"id": pet_id, "weight": 3} for pet_id in ids])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Pet.objects.filter(weight=3).count(), 3000)
+
+    def test_delete_rejects_booleans_as_ids(self):
+        response = self.send("delete", "clients", [True])
+
+        self.assertEqual(response.status_code, 400)
+
+
+class AdviseIndexesTest(TestCase):
+    log = [
+        """(0.150) SELECT "app_client"."id", "app_client"."name" FROM "app_client" """
+        """WHERE "app_client"."address" = '13 y 44' ORDER BY "app_client"."name" ASC; """
+        """args=('13 y 44',); alias=default""",
+        """(0.090) SELECT "app_client"."id" FROM "app_client" """
+        """WHERE "app_client"."email" = 'brujita75@vetsoft.com'; """
+        """args=('brujita75@vetsoft.com',); alias=default""",
+        """(0.050) SELECT "app_client"."id", "app_client"."name" FROM "app_client" """
+        """WHERE "app_client"."address" = '1 y 57' ORDER BY "app_client"."name" ASC; """
+        """args=('1 y 57',); alias=default""",
+        "Una línea que no es una consulta",
+    ]
+
+    def test_slowest_queries_are_grouped_by_shape(self):
+        stats = index_advisor.slowest_queries(index_advisor.read_query_log(self.log))
+
+        self.assertEqual([stat.calls for stat in stats], [2, 1])
+        self.assertAlmostEqual(stats[0].total, 0.2)
+        self.assertIn("13 y 44", stats[0].query.sql)
+
+    def test_command_suggests_only_missing_indexes(self):
+        stdout = io.StringIO()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "queries.log")
+            with open(path, "w") as file:
+                file.write("\n".join(self.log))
+            call_command("advise_indexes", path, stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertIn("app_client (address, name)", output)
+        self.assertIn('models.Index(fields=["address", "name"]', output)
+        self.assertNotIn("app_client (email)", output)
+
+
+class RepositoryPaginationTest(TestCase):
+    def create_clients(self, amount):
+        return Client.objects.bulk_create(
+            Client(
+                name=f"Cliente {i}",
+                phone=f"54221{i:06d}",
+                email=f"cliente{i}@vetsoft.com",
+            )
+            for i in range(amount)
+        )
+
+    @override_settings(REPOSITORY_PAGE_SIZE=2)
+    def test_repo_shows_only_first_page(self):
+        self.create_clients(3)
+
+        response = self.client.get(reverse("clients_repo"))
+
+        self.assertEqual(len(response.context["clients"]), 2)
+        self.assertTrue(response.context["page"].has_next)
+        self.assertFalse(response.context["page"].has_previous)
+
+    @override_settings(REPOSITORY_PAGE_SIZE=2)
+    def test_repo_can_navigate_with_cursors(self):
+        clients = self.create_clients(5)
+        last_id = Client.objects.order_by("id").values_list("id", flat=True)[1]
+
+        response = self.client.get(reverse("clients_repo"), {"after": last_id})
+        page = response.context["page"]
+
+        self.assertEqual([c.name for c in page], [clients[2].name, clients[3].name])
+        self.assertTrue(page.has_previous)
+
+        response = self.client.get(reverse("clients_repo"), {"before": page.previous_cursor})
+        previous_page = response.context["page"]
+
+        self.assertEqual([c.name for c in previous_page], [clients[0].name, clients[1].name])
+        self.assertFalse(previous_page.has_previous)
+        self.assertTrue(previous_page.has_next)
+
+    def test_repo_page_size_is_configurable_by_query(self):
+        self.create_clients(3)
+
+        response = self.client.get(reverse("clients_repo"), {"page_size": 1})
+
+        self.assertEqual(len(response.context["clients"]), 1)
+        self.assertIn("page_size=1", response.context["page"].next_query)
+
+    def test_repo_does_not_use_offset_nor_count_by_default(self):
+        self.create_clients(3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("clients_repo"), {"after": 1})
+
+        sql = " ".join(query["sql"] for query in queries.captured_queries).upper()
+        self.assertNotIn("OFFSET", sql)
+        self.assertNotIn("COUNT(", sql)
+
+    def test_repo_exact_count_on_demand(self):
+        self.create_clients(3)
+
+        response = self.client.get(reverse("clients_repo"), {"count": 1})
+
+        self.assertEqual(response.context["page"].count, 3)
+        self.assertFalse(response.context["page"].count_is_estimate)
+
+
 class PetsTest(TestCase):
     def test_repo_use_repo_template(self):
         response = self.client.get(reverse("pets_repo"))
@@ -1,7 +1,30 @@
+import os
+import tempfile
+import threading
+import time
 from datetime import date, datetime
-
-from django.test import TestCase
-
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.sessions.models import Session
+from django.db import OperationalError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from app import (
+    columnar,
+    context_processors,
+    pool,
+    query_budget,
+    routers,
+    seed,
+    sqlite_profile,
+    timing,
+    validation,
+)
+from app.fragments import FragmentCache
 from app.models import (
     Client,
     Medicine,
@@ -74,6 +97,70 @@ class ClientModelTest(TestCase):
 
         self.assertEqual(client_updated.phone, "54221555232")
 
+    async def test_can_asave_and_aupdate_client(self):
+        saved, errors = await Client.asave_client(
+            {
+                "name": "Juan Sebastian Veron",
+                "phone": "54221555232",
+                "address": "13 y 44",
+                "email": "brujita75@vetsoft.com",
+            }
+        )
+        self.assertTrue(saved)
+        self.assertIsNone(errors)
+
+        client = await Client.objects.aget(name="Juan Sebastian Veron")
+        await client.aupdate_client({
+            "name": client.name,
+            "phone": "54221555233",
+            "email": client.email,
+        })
+
+        client_updated = await Client.objects.aget(pk=client.pk)
+        self.assertEqual(client_updated.phone, "54221555233")
+
+    def test_update_client_writes_only_changed_columns(self):
+        client = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com",
+        )
+        data = {"name": client.name, "phone": "54221555233", "email": client.email}
+
+        with CaptureQueriesContext(connection) as queries:
+            client.update_client(data)
+
+        update = next(q["sql"] for q in queries if q["sql"].startswith("UPDATE"))
+        self.assertIn('"phone"', update)
+        self.assertNotIn('"email"', update)
+        self.assertEqual(Client.objects.get(pk=client.pk).phone, "54221555233")
+
+    def test_update_client_without_changes_runs_no_queries(self):
+        client = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com",
+        )
+
+        with self.assertNumQueries(0):
+            saved, errors = client.update_client(
+                {"name": client.name, "phone": client.phone, "email": client.email},
+            )
+
+        self.assertTrue(saved)
+
+    async def test_asave_client_with_error(self):
+        saved, errors = await Client.asave_client({"name": "Juan123"})
+
+        self.assertFalse(saved)
+        self.assertIn("name", errors)
+        self.assertEqual(await Client.objects.acount(), 0)
+
+    async def test_asave_client_does_not_keep_unindexed_rows(self):
+        with patch("app.search.index_documents", side_effect=OperationalError("índice")):
+            with self.assertRaises(OperationalError):
+                await Client.asave_client(
+                    {"name": "Juan Sebastian Veron", "phone": "54221555232", "email": "brujita75@vetsoft.com"},
+                )
+
+        self.assertEqual(await Client.objects.acount(), 0)
+
     def test_not_valid_email(self):
         self.assertEqual(validate_vetsoft_email("email"), "Por favor ingrese un email valido")
 
@@ -206,6 +293,16 @@ class PetModelTest(TestCase):
 
         self.assertEqual(pet_updated.weight, 50)
 
+    def test_update_pet_compares_typed_values(self):
+        pet = Pet.objects.create(name="Nami", breed="Siames", birthday="2020-05-22", weight=50)
+        pet.refresh_from_db()
+
+        with self.assertNumQueries(0):
+            pet.update_pet({"name": "Nami", "breed": "Siames", "birthday": "2020-05-22", "weight": "50"})
+
+        pet.update_pet({"name": "Nami", "breed": "Siames", "birthday": "2020-05-22", "weight": "55"})
+        self.assertEqual(Pet.objects.get(pk=pet.pk).weight, 55)
+
     def test_valid_date(self):
         date_str = '2020-05-22'
         self.assertIsNone(validate_date_of_birthday(date_str))
@@ -261,3 +358,437 @@ class ProductModelTest(TestCase):
         self.assertEqual(products[0].type, "alimento")
         self.assertEqual(products[0].price, 6.5)
 
+
+
+class FragmentCacheTest(SimpleTestCase):
+    def test_evicts_least_recently_used_entry(self):
+        cache = FragmentCache(max_entries=2, max_bytes=1000)
+        cache.set("a", "<tr>a</tr>")
+        cache.set("b", "<tr>b</tr>")
+        cache.get("a")
+        cache.set("c", "<tr>c</tr>")
+
+        self.assertEqual(cache.get("a"), "<tr>a</tr>")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_size_is_bounded(self):
+        cache = FragmentCache(max_entries=100, max_bytes=10)
+        cache.set("a", "x" * 6)
+        cache.set("b", "y" * 6)
+        cache.set("c", "z" * 20)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.stats()["bytes"], 6)
+
+
+class ValidationSchemaTest(SimpleTestCase):
+    def test_schema_is_compiled_once_per_model(self):
+        self.assertIs(Client.schema, validation.compile_schema(Client.get_required_fields()))
+        self.assertIsNot(Client.schema, Product.schema)
+
+    def test_validate_many_reports_each_row(self):
+        errors = Product.validate_many([
+            {"name": "Collar", "type": "accesorio", "price": "10"},
+            {"name": "Collar 2", "type": "", "price": "-1"},
+        ])
+
+        self.assertEqual(errors, [
+            {},
+            {
+                "name": "El nombre solo debe contener letras y espacios",
+                "type": "Por favor ingrese un tipo",
+                "price": "El precio debe ser mayor a cero",
+            },
+        ])
+
+    def test_validate_one_matches_model_validate(self):
+        data = {"name": "Nami", "breed": "Siames", "birthday": "22-05-2020", "weight": "-1"}
+
+        self.assertEqual(
+            validation.validate_one(data, Pet.get_required_fields()),
+            {
+                "birthday": "Formato de fecha incorrecto",
+                "weight": "El peso de la mascota no puede ser negativo",
+            },
+        )
+        self.assertEqual(Pet.validate(data), validation.validate_one(data, Pet.get_required_fields()))
+
+
+class ColumnarValidationTest(SimpleTestCase):
+    rows = [
+        {"name": "Nami", "breed": "Siames", "birthday": "2020-05-22", "weight": "30"},
+        {"name": "Nami 2", "breed": "", "birthday": "22-05-2020", "weight": "-1"},
+        {"name": "Loki", "breed": "Mestizo", "birthday": "2020-05-22", "weight": "diez"},
+        {"name": "Nami", "breed": "Siames", "birthday": "2020-05-22", "weight": "30"},
+    ]
+
+    def columns(self):
+        return {field: [row[field] for row in self.rows] for field in Pet.get_required_fields()}
+
+    def test_columnar_messages_match_row_by_row(self):
+        expected = {1: Pet.validate(self.rows[1])}
+
+        result = columnar.validate_columns(self.columns(), Pet.get_required_fields())
+
+        self.assertEqual(result.mask, [False, True, True, False])
+        self.assertEqual(result.errors[1], expected[1])
+        self.assertEqual(result.errors[2], {"weight": validation.INVALID_NUMBER})
+
+    def test_invalid_numbers_match_row_by_row(self):
+        rows = [
+            {"name": "Collar", "type": "accesorio", "price": "caro"},
+            {"name": "Correa", "type": "accesorio", "price": "1,5"},
+            {"name": "Pelota", "type": "juguete", "price": "-3"},
+        ]
+        fields = Product.get_required_fields()
+        columns = {field: [row[field] for row in rows] for field in fields}
+
+        result = columnar.validate_columns(columns, fields)
+
+        self.assertEqual(
+            [result.errors.get(row, {}) for row in range(len(rows))],
+            [Product.validate(row) for row in rows],
+        )
+        self.assertEqual(result.errors[0], {"price": validation.INVALID_NUMBER})
+
+    def test_missing_column_is_reported_as_empty(self):
+        result = columnar.validate_columns({"name": ["Collar"]}, Product.get_required_fields())
+
+        self.assertEqual(result.errors, {0: {
+            "type": "Por favor ingrese un tipo",
+            "price": "Por favor ingrese un precio",
+        }})
+
+
+class SqliteProfileTest(SimpleTestCase):
+    def locked_execute(self, failures):
+        calls = []
+
+        def execute(sql, params, many, context):
+            calls.append(sql)
+            if len(calls) <= failures:
+                raise OperationalError("database is locked")
+            return "ok"
+
+        return execute, calls
+
+    def test_profile_is_applied_to_new_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = {**connection.settings_dict, "NAME": os.path.join(directory, "db.sqlite3")}
+            wrapper = DatabaseWrapper(settings_dict, alias="sqlite_profile")
+
+            with override_settings(SQLITE_PERFORMANCE_PROFILE=True):
+                wrapper.ensure_connection()
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    journal_mode = cursor.fetchone()[0]
+                    cursor.execute("PRAGMA busy_timeout")
+                    busy_timeout = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(busy_timeout, 5000)
+        retries = [w for w in wrapper.execute_wrappers if isinstance(w, sqlite_profile.BusyRetry)]
+        self.assertEqual(len(retries), 1)
+
+    def test_busy_retry_retries_locked_statements(self):
+        execute, calls = self.locked_execute(failures=2)
+        retry = sqlite_profile.BusyRetry(SimpleNamespace(in_atomic_block=False), delay=0)
+
+        self.assertEqual(retry(execute, "UPDATE", None, False, {}), "ok")
+        self.assertEqual(len(calls), 3)
+
+    def test_busy_retry_does_not_retry_inside_transactions(self):
+        execute, calls = self.locked_execute(failures=1)
+        retry = sqlite_profile.BusyRetry(SimpleNamespace(in_atomic_block=True), delay=0)
+
+        with self.assertRaises(OperationalError):
+            retry(execute, "UPDATE", None, False, {})
+        self.assertEqual(len(calls), 1)
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.resets = 0
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def make_pool(self, **options):
+        created = []
+
+        def connect():
+            created.append(FakeConnection(len(created)))
+            return created[-1]
+
+        def reset(connection):
+            connection.resets += 1
+
+        return pool.ConnectionPool(connect, reset=reset, **options), created
+
+    def test_connections_are_reused_and_reset_on_checkout(self):
+        connection_pool, created = self.make_pool(min_size=1, max_size=2)
+
+        first = connection_pool.acquire()
+        self.assertEqual(connection_pool.stats()["in_use"], 1)
+        connection_pool.release(first)
+        second = connection_pool.acquire()
+
+        self.assertIs(first, second)
+        self.assertEqual(len(created), 1)
+        self.assertEqual(second.resets, 2)
+        self.assertEqual(connection_pool.stats()["checkouts"], 2)
+
+    def test_acquire_times_out_when_pool_is_exhausted(self):
+        connection_pool, _created = self.make_pool(min_size=0, max_size=1)
+        connection_pool.acquire()
+
+        with self.assertRaises(pool.PoolTimeout):
+            connection_pool.acquire(timeout=0.01)
+        self.assertEqual(connection_pool.stats()["timeouts"], 1)
+
+    def test_failed_health_check_replaces_connection(self):
+        def check(connection):
+            raise OSError("server closed the connection unexpectedly")
+
+        connection_pool, created = self.make_pool(max_size=1, check_interval=0)
+        connection_pool._check = check
+
+        connection = connection_pool.acquire()
+
+        self.assertEqual(connection.number, 1)
+        self.assertTrue(created[0].closed)
+        self.assertEqual(connection_pool.stats()["failed_checks"], 1)
+
+    def test_broken_connections_are_not_returned(self):
+        connection_pool, _created = self.make_pool(min_size=0, max_size=1)
+        connection = connection_pool.acquire()
+
+        connection_pool.release(connection, broken=True)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(connection_pool.stats()["size"], 0)
+
+    def test_pool_never_exceeds_max_size_across_threads(self):
+        connection_pool, created = self.make_pool(min_size=0, max_size=2)
+        in_use = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            for _ in range(50):
+                connection = connection_pool.acquire()
+                with lock:
+                    in_use.append(connection)
+                    peak.append(len(in_use))
+                with lock:
+                    in_use.remove(connection)
+                connection_pool.release(connection)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(max(peak), 2)
+        self.assertLessEqual(len(created), 2)
+        self.assertEqual(connection_pool.stats()["checkouts"], 400)
+
+    def test_changed_connection_parameters_close_the_previous_pool(self):
+        self.addCleanup(pool.close_pools, "pool-test")
+        old_pool, old_created = self.make_pool(min_size=2)
+        in_use = old_pool.acquire()
+        pool.get_pool("pool-test", "test_vetsoft", lambda: old_pool)
+
+        new_pool, _created = self.make_pool(min_size=0)
+        self.assertIs(pool.get_pool("pool-test", "vetsoft", lambda: new_pool), new_pool)
+
+        self.assertTrue(old_pool.closed)
+        self.assertTrue(old_created[0].closed)
+        self.assertEqual(list(pool.all_stats()).count("pool-test"), 1)
+        old_pool.release(in_use)
+        self.assertTrue(in_use.closed)
+        self.assertEqual(old_pool.stats()["size"], 0)
+
+    def test_close_pools_closes_idle_connections(self):
+        connection_pool, created = self.make_pool(min_size=2)
+        pool.get_pool("pool-test", "vetsoft", lambda: connection_pool)
+
+        pool.close_pools("pool-test")
+
+        self.assertTrue(all(connection.closed for connection in created))
+        self.assertNotIn("pool-test", pool.all_stats())
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"], REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTest(SimpleTestCase):
+    def run_middleware(self, request):
+        seen = []
+
+        def view(request):
+            seen.append(routers.ReplicaRouter().db_for_read(Client))
+            return HttpResponse()
+
+        response = routers.replica_pin_middleware(view)(request)
+        return seen[0], response
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        router = routers.ReplicaRouter()
+
+        self.assertEqual(router.db_for_read(Client), "replica1")
+        self.assertEqual(router.db_for_write(Client), "default")
+
+    def test_only_vetsoft_models_are_read_from_replicas(self):
+        self.assertEqual(routers.ReplicaRouter().db_for_read(Session), "default")
+
+    def test_recent_writes_are_read_from_primary(self):
+        self.assertTrue(routers.written_recently(int(time.time())))
+        self.assertFalse(routers.written_recently(int(time.time()) - 10))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_from_primary(self):
+        self.assertEqual(routers.ReplicaRouter().db_for_read(Client), "default")
+
+    def test_writes_pin_the_following_reads_to_primary(self):
+        factory = RequestFactory()
+
+        database, response = self.run_middleware(factory.post("/clientes/nuevo/"))
+        self.assertEqual(database, "default")
+        self.assertEqual(response.cookies[routers.PIN_COOKIE]["max-age"], 5)
+
+        request = factory.get("/clientes/")
+        request.COOKIES[routers.PIN_COOKIE] = "1"
+        database, _response = self.run_middleware(request)
+        self.assertEqual(database, "default")
+
+        database, response = self.run_middleware(factory.get("/clientes/"))
+        self.assertEqual(database, "replica1")
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+
+
+class LatencyHistogramTest(SimpleTestCase):
+    def test_percentiles_use_the_bucket_upper_bound(self):
+        histogram = timing.Histogram()
+        for milliseconds in [1] * 90 + [50] * 9 + [2000]:
+            histogram.observe(milliseconds)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertLessEqual(1, histogram.percentile(0.50))
+        self.assertLess(histogram.percentile(0.50), 1.25)
+        self.assertLessEqual(50, histogram.percentile(0.95))
+        self.assertLess(histogram.percentile(0.95), 62.5)
+        self.assertLessEqual(50, histogram.percentile(0.99))
+        self.assertIsNone(timing.Histogram().percentile(0.5))
+
+    def test_number_of_routes_is_bounded(self):
+        histograms = timing.RouteHistograms(max_routes=2)
+        request_timing = timing.RequestTiming()
+
+        for route in ["clientes/", "mascotas/", "productos/", "proveedores/"]:
+            histograms.observe(route, request_timing, 0.01)
+
+        stats = histograms.snapshot()
+        self.assertEqual(len(stats), 3)
+        self.assertEqual(stats[timing.UNMATCHED_ROUTE]["total"]["count"], 2)
+
+    def test_queries_are_timed_only_inside_a_request(self):
+        def execute(sql, params, many, context):
+            return "ok"
+
+        self.assertEqual(timing.time_queries(execute, "SELECT 1", None, False, {}), "ok")
+
+        request_timing = timing.RequestTiming()
+        token = timing.current_timing.set(request_timing)
+        try:
+            timing.time_queries(execute, "SELECT 1", None, False, {})
+            timing.time_queries(execute, "SELECT 2", None, False, {})
+        finally:
+            timing.current_timing.reset(token)
+
+        self.assertEqual(request_timing.queries, 2)
+        self.assertGreaterEqual(request_timing.db, 0)
+
+
+class NPlusOneDetectorTest(SimpleTestCase):
+    def test_repeated_select_shapes_are_reported(self):
+        queries = query_budget.RequestQueries()
+        for pet_id in range(6):
+            queries.queries.append((f'SELECT * FROM "app_client" WHERE "id" = {pet_id}', 0.001))
+        queries.queries.append(('SELECT * FROM "app_pet"', 0.001))
+        for _ in range(6):
+            queries.queries.append(("SAVEPOINT s1", 0.0))
+
+        self.assertEqual(
+            queries.repeated(threshold=5),
+            [('SELECT * FROM "app_client" WHERE "id" = ?', 6)],
+        )
+
+        found = query_budget.problems("pets_repo", queries)
+        self.assertEqual(len(found), 2)
+        self.assertIn("pets_repo ejecutó 13 consultas", found[0])
+        self.assertIn("repitió 6 veces la consulta (posible N+1)", found[1])
+
+
+class SeedDataTest(SimpleTestCase):
+    def test_generated_rows_pass_validation(self):
+        for kind, (model, _make_row) in seed.GENERATORS.items():
+            for row in seed.generate(kind, 0, 200, seed=7):
+                data = {field: str(value) for field, value in row.items()}
+                self.assertEqual(model.validate(data), {}, (kind, data))
+
+    def test_generation_is_deterministic(self):
+        self.assertEqual(
+            seed.generate("clients", 100, 110, seed=3),
+            seed.generate("clients", 100, 110, seed=3),
+        )
+        self.assertNotEqual(
+            seed.generate("clients", 100, 110, seed=3),
+            seed.generate("clients", 100, 110, seed=4),
+        )
+
+    def test_batches_cover_every_row_once(self):
+        batches = seed.plan_batches({"clients": 7, "pets": 0}, batch_size=3, seed=0)
+
+        self.assertEqual(
+            batches,
+            [("clients", 0, 3, 0), ("clients", 3, 6, 0), ("clients", 6, 7, 0)],
+        )
+
+
+class ContextProcessorsTest(SimpleTestCase):
+    def active_labels(self, path):
+        context = context_processors.navbar(RequestFactory().get(path))
+        return [link["label"] for link in context["links"] if link["active"]]
+
+    def test_active_link_is_found_by_section(self):
+        self.assertEqual(self.active_labels("/"), ["Home"])
+        self.assertEqual(self.active_labels("/clientes/"), ["Clientes"])
+        self.assertEqual(self.active_labels("/clientes/nuevo/"), ["Clientes"])
+        self.assertEqual(self.active_labels("/productos/editar/3/"), ["Productos"])
+
+    def test_unknown_sections_have_no_active_link(self):
+        self.assertEqual(self.active_labels("/clientes"), [])
+        self.assertEqual(self.active_labels("/metrics"), [])
+        self.assertEqual(self.active_labels("/otra/clientes/"), [])
+
+    def test_links_are_not_rebuilt_per_request(self):
+        request = RequestFactory().get("/clientes/")
+        list(context_processors.navbar(request)["links"])
+        list(context_processors.home_items(request)["home_items"])
+
+        with patch("app.context_processors.reverse") as reverse:
+            links = list(context_processors.navbar(request)["links"])
+            items = list(context_processors.home_items(request)["home_items"])
+
+        reverse.assert_not_called()
+        self.assertEqual(len(links), 6)
+        self.assertEqual([item["label"] for item in items][:2], ["Clientes", "Animales"])
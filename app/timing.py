@@ -0,0 +1,291 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.template.backends.django import DjangoTemplates as BaseDjangoTemplates
+from django.template.backends.django import Template as BaseTemplate
+from django.utils.decorators import sync_and_async_middleware
+
+# Límites superiores (en milisegundos) de los buckets de los histogramas: crecen
+# un 25% cada uno, desde 0,1 ms hasta unos 100 s.
+BUCKETS = []
+_bound = 0.1
+while _bound < 100_000:
+    BUCKETS.append(round(_bound, 3))
+    _bound *= 1.25
+BUCKETS.append(float("inf"))
+
+UNMATCHED_ROUTE = "<sin ruta>"
+
+current_timing = ContextVar("current_timing", default=None)
+
+
+class RequestTiming:
+    """
+    Tiempos acumulados de una solicitud: consultas, renderizado de plantillas y total.
+    """
+
+    __slots__ = ("start", "db", "queries", "templates", "rendering")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.templates = 0.0
+        self.rendering = 0
+
+    @property
+    def total(self):
+        """Tiempo transcurrido desde el inicio de la solicitud, en segundos."""
+        return time.perf_counter() - self.start
+
+    def header(self, total):
+        """Valor del encabezado ``Server-Timing``."""
+        return (
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} consultas", '
+            f"tpl;dur={self.templates * 1000:.1f}, "
+            f"total;dur={total * 1000:.1f}"
+        )
+
+
+class Histogram:
+    """
+    Histograma de latencias con buckets fijos, de tamaño constante sin importar
+    cuántas solicitudes se registren.
+    """
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, milliseconds):
+        """Registra una duración en milisegundos."""
+        self.counts[bisect.bisect_left(BUCKETS, milliseconds)] += 1
+        self.count += 1
+        self.sum += milliseconds
+
+    def percentile(self, fraction):
+        """Devuelve el límite superior del bucket que contiene el percentil pedido."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return BUCKETS[-1]
+
+
+class RouteStats:
+    """
+    Histogramas de una ruta (total, base de datos y plantillas) y la cantidad de
+    consultas que ejecutó.
+    """
+
+    __slots__ = ("total", "db", "tpl", "queries")
+
+    def __init__(self):
+        self.total = Histogram()
+        self.db = Histogram()
+        self.tpl = Histogram()
+        self.queries = 0
+
+    def histograms(self):
+        """Devuelve los histogramas de la ruta por nombre."""
+        return {"total": self.total, "db": self.db, "tpl": self.tpl}
+
+
+class RouteHistograms:
+    """
+    Histogramas de latencia por ruta, identificada por el nombre de su URL.
+
+    La cantidad de rutas está acotada por ``max_routes``; las solicitudes de rutas
+    nuevas por encima del límite se registran en ``UNMATCHED_ROUTE``.
+    """
+
+    def __init__(self, max_routes=100):
+        self.max_routes = max_routes
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, timing, total):
+        """Registra los tiempos de una solicitud."""
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                if len(self._routes) >= self.max_routes:
+                    route = UNMATCHED_ROUTE
+                stats = self._routes.setdefault(route, RouteStats())
+            stats.total.observe(total * 1000)
+            stats.db.observe(timing.db * 1000)
+            stats.tpl.observe(timing.templates * 1000)
+            stats.queries += timing.queries
+
+    def snapshot(self):
+        """Devuelve, por ruta, la cantidad de solicitudes y los percentiles 50, 95 y 99."""
+        with self._lock:
+            return {
+                route: {
+                    "queries": stats.queries,
+                    **{
+                        name: {
+                            "count": histogram.count,
+                            "sum": histogram.sum,
+                            "p50": histogram.percentile(0.50),
+                            "p95": histogram.percentile(0.95),
+                            "p99": histogram.percentile(0.99),
+                        }
+                        for name, histogram in stats.histograms().items()
+                    },
+                }
+                for route, stats in self._routes.items()
+            }
+
+    def export(self):
+        """Devuelve, por ruta, los contadores crudos de cada bucket para agregarlos."""
+        with self._lock:
+            return {
+                route: {
+                    "queries": stats.queries,
+                    **{
+                        name: {
+                            "counts": list(histogram.counts),
+                            "count": histogram.count,
+                            "sum": histogram.sum,
+                        }
+                        for name, histogram in stats.histograms().items()
+                    },
+                }
+                for route, stats in self._routes.items()
+            }
+
+    def clear(self):
+        """Descarta todos los histogramas."""
+        with self._lock:
+            self._routes.clear()
+
+
+histograms = RouteHistograms()
+
+
+def time_queries(execute, sql, params, many, context):
+    """
+    Envoltorio de ejecución que suma el tiempo de cada consulta a la solicitud en curso.
+    """
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.db += time.perf_counter() - start
+        timing.queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """
+    Receptor de ``connection_created`` que instala ``time_queries`` en la conexión.
+    """
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+class Template(BaseTemplate):
+    """
+    Plantilla que suma su tiempo de renderizado a la solicitud en curso.
+
+    Sólo se mide el renderizado más externo: las plantillas que se renderizan
+    dentro de otra (por ejemplo, las filas del repositorio) ya están incluidas en
+    el tiempo de la plantilla que las contiene.
+    """
+
+    def render(self, context=None, request=None):
+        """Renderiza la plantilla midiendo el tiempo."""
+        timing = current_timing.get()
+        if timing is None:
+            return super().render(context, request)
+
+        outermost = not timing.rendering
+        timing.rendering += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timing.rendering -= 1
+            if outermost:
+                timing.templates += time.perf_counter() - start
+
+
+class DjangoTemplates(BaseDjangoTemplates):
+    """
+    Backend de plantillas de Django que mide el tiempo de renderizado.
+    """
+
+    def from_string(self, template_code):
+        """Compila una plantilla desde un texto."""
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        """Carga una plantilla por nombre."""
+        template = super().get_template(template_name)
+        return Template(template.template, self)
+
+
+def route_name(request):
+    """
+    Devuelve el nombre de la URL de la solicitud (por ejemplo ``clients_repo``), o
+    la ruta tal como está declarada si la URL no tiene nombre.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    return match.view_name or match.route
+
+
+def finish(request, response, timing, token):
+    """
+    Agrega el encabezado ``Server-Timing`` y registra los tiempos de la solicitud.
+    """
+    current_timing.reset(token)
+    total = timing.total
+    response["Server-Timing"] = timing.header(total)
+    histograms.observe(route_name(request), timing, total)
+    return response
+
+
+@sync_and_async_middleware
+def server_timing_middleware(get_response):
+    """
+    Middleware que mide cada solicitud (total, consultas y plantillas), agrega el
+    encabezado ``Server-Timing`` y registra los histogramas por ruta.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            timing = RequestTiming()
+            token = current_timing.set(timing)
+            try:
+                response = await get_response(request)
+            except BaseException:
+                current_timing.reset(token)
+                raise
+            return finish(request, response, timing, token)
+    else:
+        def middleware(request):
+            timing = RequestTiming()
+            token = current_timing.set(timing)
+            try:
+                response = get_response(request)
+            except BaseException:
+                current_timing.reset(token)
+                raise
+            return finish(request, response, timing, token)
+
+    return middleware
@@ -0,0 +1,182 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+NAME_REGEX = re.compile(r'^[a-zA-ZáéíóúÁÉÍÓÚ\s]+$')
+EMAIL_REGEX = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b')
+VETSOFT_EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@vetsoft\.com$')
+PHONE_PREFIX = "54"
+
+# Las reglas numéricas lanzan ValueError con valores no numéricos; el esquema lo
+# informa como error del campo, igual fila por fila que en modo columnar.
+INVALID_NUMBER = "El valor debe ser numérico"
+
+
+def validate_date_of_birthday(date_str):
+    """
+    Valida si una fecha de nacimiento es válida y está en el formato correcto.
+    """
+    try:
+        birth_date = datetime.strptime(date_str, '%Y-%m-%d')
+        today = datetime.today()
+        if birth_date > today:
+            return "La fecha no puede ser mayor al dia de hoy"
+        return None
+    except ValueError:
+        return "Formato de fecha incorrecto"
+
+
+def validate_vetsoft_name(value):
+    """
+    Valida si un nombre contiene solo letras, espacios y caracteres especiales comunes en español.
+    """
+    if not NAME_REGEX.match(value):
+        return "El nombre solo debe contener letras y espacios"
+    return None
+
+
+def validate_phone(number):
+    """
+    Valida si un número de teléfono es válido y contiene solo dígitos.
+    """
+    if not number.isnumeric():
+        return "El teléfono indicado debe contener sólo números"
+
+    if not number.startswith(PHONE_PREFIX):
+        return "El teléfono debe comenzar siempre con 54"
+    return None
+
+
+def validate_vetsoft_email(value):
+    """
+    Valida si una dirección de correo electrónico cumple con el formato de Vetsoft.
+    """
+    if not EMAIL_REGEX.match(value):
+        return "Por favor ingrese un email valido"
+
+    if not VETSOFT_EMAIL_REGEX.match(value):
+        return "El email debe finalizar con @vetsoft.com"
+
+    return None
+
+
+def validate_price(value):
+    """
+    Valida que el precio no sea negativo.
+    """
+    if float(value) < 0.0:
+        return "El precio debe ser mayor a cero"
+    return None
+
+
+def validate_weight(value):
+    """
+    Valida que el peso de la mascota no sea negativo.
+    """
+    if int(value) < 0:
+        return "El peso de la mascota no puede ser negativo"
+    return None
+
+
+def validate_dose(value):
+    """
+    Valida que la dosis esté entre 1 y 10.
+    """
+    if int(value) < 1 or int(value) > 10:
+        return "La dosis debe estar entre 1 y 10"
+    return None
+
+
+# Regla que se aplica a cada campo según su nombre; los campos sin regla sólo
+# se validan como requeridos.
+FIELD_CHECKS = {
+    "name": validate_vetsoft_name,
+    "email": validate_vetsoft_email,
+    "price": validate_price,
+    "weight": validate_weight,
+    "birthday": validate_date_of_birthday,
+    "dose": validate_dose,
+    "phone": validate_phone,
+}
+
+
+def numeric_safe(check):
+    """
+    Envuelve una regla para que los valores no numéricos se informen como error.
+    """
+    def run(value):
+        try:
+            return check(value)
+        except ValueError:
+            return INVALID_NUMBER
+    return run
+
+
+class Schema:
+    """
+    Esquema de validación compilado a partir de los campos requeridos de un modelo.
+
+    Al construirse resuelve, para cada campo, el mensaje de campo vacío y la regla
+    que le corresponde, de modo que validar una fila es recorrer una tupla de
+    ``(campo, mensaje, regla)`` sin volver a decidir qué regla aplicar. Las reglas
+    ya están envueltas con ``numeric_safe``.
+    """
+
+    def __init__(self, required_fields):
+        self.required_fields = dict(required_fields)
+        self.checks = tuple(
+            (key, f"Por favor ingrese un {label}", self.compile_check(key))
+            for key, label in self.required_fields.items()
+        )
+
+    @staticmethod
+    def compile_check(key):
+        """Devuelve la regla del campo envuelta con ``numeric_safe``, o None si no tiene."""
+        check = FIELD_CHECKS.get(key)
+        return numeric_safe(check) if check is not None else None
+
+    def validate_one(self, data):
+        """Valida una fila y devuelve sus errores por campo."""
+        errors = {}
+        for key, empty_message, check in self.checks:
+            value = data.get(key, "")
+            if value == "":
+                errors[key] = empty_message
+            elif check is not None:
+                error = check(value)
+                if error:
+                    errors[key] = error
+        return errors
+
+    def validate_many(self, rows):
+        """Valida varias filas y devuelve la lista de errores de cada una, en orden."""
+        validate_one = self.validate_one
+        return [validate_one(data) for data in rows]
+
+
+@lru_cache(maxsize=None)
+def _compile(required_items):
+    return Schema(required_items)
+
+
+def compile_schema(required_fields):
+    """
+    Devuelve el esquema compilado para un diccionario de campos requeridos.
+
+    Los esquemas se guardan, así que cada combinación de campos se compila una sola vez.
+    """
+    return _compile(tuple(required_fields.items()))
+
+
+def validate_one(data, required_fields):
+    """
+    Valida una fila según los campos requeridos especificados.
+    """
+    return compile_schema(required_fields).validate_one(data)
+
+
+def validate_many(rows, required_fields):
+    """
+    Valida varias filas según los campos requeridos especificados.
+    """
+    return compile_schema(required_fields).validate_many(rows)
@@ -0,0 +1,138 @@
+import hashlib
+import time
+import uuid
+from collections import namedtuple
+from functools import cache
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+Version = namedtuple("Version", ["token", "timestamp"])
+
+
+def get_cache():
+    """
+    Devuelve la caché compartida donde se guardan las versiones de los modelos.
+    """
+    return caches[getattr(settings, "VERSION_CACHE_ALIAS", "default")]
+
+
+def version_key(model):
+    """
+    Devuelve la clave de caché de la versión de un modelo.
+    """
+    return f"vetsoft:version:{model._meta.label_lower}"
+
+
+def new_version():
+    """
+    Genera una versión nueva con un token aleatorio y la hora actual.
+    """
+    return Version(uuid.uuid4().hex, int(time.time()))
+
+
+def bump_version(model):
+    """
+    Marca el modelo como modificado para invalidar las respuestas condicionales.
+    """
+    get_cache().set(version_key(model), tuple(new_version()), timeout=None)
+
+
+def get_version(model):
+    """
+    Devuelve la versión actual del modelo, creándola si todavía no existe.
+    """
+    cache = get_cache()
+    key = version_key(model)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, tuple(new_version()), timeout=None)
+        value = cache.get(key)
+    return Version(*value)
+
+
+async def aget_version(model):
+    """
+    Versión asíncrona de ``get_version``.
+    """
+    cache = get_cache()
+    key = version_key(model)
+    value = await cache.aget(key)
+    if value is None:
+        await cache.aadd(key, tuple(new_version()), timeout=None)
+        value = await cache.aget(key)
+    return Version(*value)
+
+
+@cache
+def source_fingerprint():
+    """
+    Devuelve una huella del código y las plantillas de la aplicación.
+
+    Es la misma en todos los workers de un despliegue y cambia con cada despliegue
+    que modifica una vista o una plantilla.
+    """
+    root = Path(__file__).resolve().parent
+    digest = hashlib.md5(usedforsecurity=False)
+    for path in sorted(root.rglob("*")):
+        if path.suffix in (".py", ".html") and path.is_file():
+            digest.update(path.relative_to(root).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def get_build_id():
+    """
+    Devuelve el identificador de la versión desplegada: ``BUILD_ID`` o, si no está
+    definido, la huella del código.
+    """
+    return getattr(settings, "BUILD_ID", None) or source_fingerprint()
+
+
+def make_etag(version, request):
+    """
+    Calcula el ETag de una página a partir de la versión del modelo.
+
+    Incluye la URL completa (los cursores de paginación) y el secreto CSRF, porque
+    la página contiene formularios con el token de la sesión. Se toma de
+    ``request.META`` para contemplar también el secreto que se genera al renderizar
+    la primera página y que recién se envía como cookie en esa respuesta. La
+    versión del modelo sobrevive a los reinicios, así que también se incluye la
+    versión desplegada: el HTML puede cambiar sin que cambien los datos.
+    """
+    csrf_secret = request.META.get("CSRF_COOKIE") or request.COOKIES.get(
+        settings.CSRF_COOKIE_NAME, "",
+    )
+    digest = hashlib.md5(usedforsecurity=False)
+    for part in (
+        get_build_id(),
+        version.token,
+        request.get_full_path(),
+        csrf_secret,
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def conditional_response(request, version):
+    """
+    Devuelve una respuesta 304 si el cliente ya tiene la versión actual, o None.
+    """
+    return get_conditional_response(
+        request, etag=make_etag(version, request), last_modified=version.timestamp,
+    )
+
+
+def set_conditional_headers(response, request, version):
+    """
+    Agrega ETag y Last-Modified a la respuesta y obliga a revalidarla en cada uso.
+    """
+    response["ETag"] = make_etag(version, request)
+    response["Last-Modified"] = http_date(version.timestamp)
+    response["Cache-Control"] = "private, no-cache"
+    patch_vary_headers(response, ["Cookie"])
+    return response
@@ -0,0 +1,70 @@
+"""
+Benchmark de la validación columnar frente a la validación fila por fila.
+
+Uso: ``python -m benchmarks.columnar [--rows N] [--repeat N]``
+"""
+import argparse
+import timeit
+
+from app import columnar, validation
+
+PRODUCT_FIELDS = {"name": "nombre", "type": "tipo", "price": "precio"}
+CLIENT_FIELDS = {"name": "nombre", "email": "email", "phone": "teléfono"}
+
+
+def build_columns(amount):
+    """
+    Genera columnas de productos y clientes, con una fila de cada diez inválida.
+    """
+    products = {
+        "name": ["Producto" if i % 10 else "Producto 1" for i in range(amount)],
+        "type": ["alimento"] * amount,
+        "price": [str(i % 100 - (i % 10 == 0)) for i in range(amount)],
+    }
+    clients = {
+        "name": ["Cliente Número" if i % 10 else "" for i in range(amount)],
+        "email": [f"cliente{i % 5000}@vetsoft.com" for i in range(amount)],
+        "phone": [f"54221{i:06d}" if i % 10 else "221" for i in range(amount)],
+    }
+    return (products, PRODUCT_FIELDS), (clients, CLIENT_FIELDS)
+
+
+def timed(function, repeat):
+    """
+    Ejecuta una función varias veces y devuelve su resultado y el mejor tiempo.
+    """
+    return function(), min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime el tiempo de cada modo de validación.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for columns, fields in build_columns(args.rows):
+        print(f"campos: {', '.join(fields)}")
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        expected = {
+            row: errors
+            for row, errors in enumerate(validation.compile_schema(fields).validate_many(rows))
+            if errors
+        }
+
+        _result, row_elapsed = timed(
+            lambda: validation.compile_schema(fields).validate_many(rows), args.repeat,
+        )
+        result, columnar_elapsed = timed(
+            lambda: columnar.validate_columns(columns, fields), args.repeat,
+        )
+        assert result.errors == expected
+
+        for name, elapsed in (("fila por fila", row_elapsed), ("columnar", columnar_elapsed)):
+            print(f"{name:>13}: {elapsed * 1000:8.1f} ms  ({args.rows / elapsed:,.0f} filas/s)")
+
+
+if __name__ == "__main__":
+    main()
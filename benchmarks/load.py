@@ -0,0 +1,519 @@
+"""
+Generador de carga de punta a punta contra ``vetsoft.asgi:application``.
+
+Levanta la aplicación real con gunicorn y workers de uvicorn, como el
+Dockerfile (o con uvicorn solo), sobre una base SQLite temporal cargada con
+``manage.py seed``, y la somete a una mezcla configurable de GET de
+repositorios, altas por formulario y eliminaciones.
+
+La carga puede ser de lazo cerrado (``--concurrency`` usuarios que envían una
+solicitud apenas reciben la respuesta anterior) o de lazo abierto (``--rps``
+solicitudes por segundo con a lo sumo ``--concurrency`` en curso). En lazo
+abierto la latencia se mide desde el momento en que la solicitud debía salir,
+así las esperas por saturación no desaparecen de los percentiles.
+
+Con ``ENVIRONMENT=development`` el servidor usa la base PostgreSQL configurada
+(que debe estar migrada; ``--rows`` carga datos en ella). Con ``--url`` no se
+levanta ningún servidor y se prueba uno ya en ejecución.
+
+Uso: ``python -m benchmarks.load [--server gunicorn|uvicorn] [--workers 4]
+[--concurrency 32 | --rps 200] [--duration 30] [--mix repo=80,form=15,delete=5]
+[--rows 10000] [--output load.json]``
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlsplit
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vetsoft.settings")
+django.setup()
+
+from app import crud, seed  # noqa: E402
+
+OPERATIONS = ("repo", "form", "delete")
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+# Ids que se leen por modelo para las eliminaciones (la API pagina de a 500).
+DELETE_POOL_SIZE = 5000
+API_PAGE_SIZE = 500
+
+
+class HttpConnection:
+    """
+    Conexión HTTP/1.1 persistente (keep-alive) sobre los streams de asyncio.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        """Cierra la conexión si está abierta."""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.reader = self.writer = None
+
+    async def request(self, method, path, headers=(), body=b""):
+        """
+        Envía una solicitud y devuelve ``(estado, encabezados, cuerpo)``.
+
+        Si el servidor había cerrado la conexión inactiva, reintenta una vez con
+        una conexión nueva.
+        """
+        for attempt in range(2):
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await self._send(method, path, headers, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if not reused or attempt:
+                    raise
+        raise ConnectionError("No se pudo enviar la solicitud")
+
+    async def _send(self, method, path, headers, body):
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            f"Content-Length: {len(body)}",
+            *headers,
+        ]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("El servidor cerró la conexión")
+        status = int(status_line.split()[1])
+
+        response_headers = []
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers.append((name.strip().lower(), value.strip()))
+
+        fields = dict(response_headers)
+        if fields.get("transfer-encoding", "").lower() == "chunked":
+            content = await self._read_chunked()
+        elif "content-length" in fields:
+            content = await self.reader.readexactly(int(fields["content-length"]))
+        else:
+            content = await self.reader.read()
+        if fields.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response_headers, content
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+
+class Session:
+    """
+    Usuario virtual: una conexión persistente con sus cookies y su token CSRF.
+    """
+
+    def __init__(self, host, port):
+        self.connection = HttpConnection(host, port)
+        self.cookies = {}
+        self.csrf_token = None
+
+    async def request(self, method, path, data=None):
+        """Envía una solicitud con las cookies de la sesión y devuelve estado y cuerpo."""
+        headers = []
+        body = b""
+        if self.cookies:
+            headers.append("Cookie: " + "; ".join(f"{k}={v}" for k, v in self.cookies.items()))
+        if data is not None:
+            body = urlencode(data).encode()
+            headers.append("Content-Type: application/x-www-form-urlencoded")
+
+        status, response_headers, content = await self.connection.request(method, path, headers, body)
+        for name, value in response_headers:
+            if name == "set-cookie":
+                cookie, _, _attributes = value.partition(";")
+                key, _, cookie_value = cookie.partition("=")
+                self.cookies[key.strip()] = cookie_value.strip()
+        return status, content
+
+    async def post(self, path, data, token_page):
+        """Envía un formulario, obteniendo antes el token CSRF si hace falta."""
+        if self.csrf_token is None:
+            _status, content = await self.request("GET", token_page)
+            match = CSRF_INPUT.search(content.decode())
+            if match is None:
+                raise RuntimeError(f"{token_page} no tiene token CSRF")
+            self.csrf_token = match.group(1)
+        return await self.request("POST", path, {**data, "csrfmiddlewaretoken": self.csrf_token})
+
+
+class Workload:
+    """
+    Elige y ejecuta las operaciones según la mezcla pedida.
+    """
+
+    def __init__(self, mix, rng, delete_ids):
+        self.operations = list(mix)
+        self.weights = [mix[operation] for operation in self.operations]
+        self.rng = rng
+        self.delete_ids = delete_ids
+        self.entries = list(crud.registry.values())
+        self.created = Counter()
+
+    def choose(self):
+        """Devuelve la próxima operación y el modelo sobre el que actúa."""
+        operation = self.rng.choices(self.operations, self.weights)[0]
+        entry = self.rng.choice(self.entries)
+        if operation == "delete" and not self.delete_ids.get(entry.name):
+            operation = "repo"
+        return operation, entry
+
+    async def run(self, session, operation, entry):
+        """Ejecuta una operación y devuelve el estado HTTP."""
+        repo = f"/{entry.path}/"
+        if operation == "repo":
+            status, _content = await session.request("GET", repo)
+        elif operation == "form":
+            index = self.created[entry.name]
+            self.created[entry.name] += 1
+            row = seed.generate(entry.name, index, index + 1, seed="carga")[0]
+            data = {field: str(value) for field, value in row.items()}
+            status, _content = await session.post(f"/{entry.path}/nuevo/", data, f"/{entry.path}/nuevo/")
+        else:
+            object_id = self.delete_ids[entry.name].pop()
+            status, _content = await session.post(
+                f"/{entry.path}/eliminar/", {entry.delete_field: object_id}, f"/{entry.path}/nuevo/",
+            )
+        return status
+
+
+class Recorder:
+    """
+    Acumula latencias, estados y errores por operación, salvo durante el calentamiento.
+    """
+
+    def __init__(self, measure_from):
+        self.measure_from = measure_from
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+
+    def record(self, operation, started, latency, status=None, error=None):
+        """Registra el resultado de una solicitud que salió en ``started``."""
+        if started < self.measure_from:
+            return
+        self.latencies[operation].append(latency)
+        if error is not None:
+            self.statuses[operation][type(error).__name__] += 1
+            self.errors[operation] += 1
+        else:
+            self.statuses[operation][status] += 1
+            if status >= 400:
+                self.errors[operation] += 1
+
+
+async def execute(workload, recorder, session, scheduled):
+    """Ejecuta una operación y registra su latencia desde ``scheduled``."""
+    operation, entry = workload.choose()
+    try:
+        status = await workload.run(session, operation, entry)
+    except Exception as error:
+        # Cualquier error (conexión cortada, respuesta inválida) cuenta como fallo.
+        await session.connection.close()
+        recorder.record(operation, scheduled, time.perf_counter() - scheduled, error=error)
+    else:
+        recorder.record(operation, scheduled, time.perf_counter() - scheduled, status=status)
+
+
+async def closed_loop(workload, recorder, sessions, deadline):
+    """Cada usuario envía una solicitud apenas recibe la respuesta anterior."""
+    async def user(session):
+        while time.perf_counter() < deadline:
+            await execute(workload, recorder, session, time.perf_counter())
+
+    await asyncio.gather(*(user(session) for session in sessions))
+
+
+async def open_loop(workload, recorder, sessions, deadline, rps):
+    """Envía ``rps`` solicitudes por segundo, con a lo sumo una por sesión en curso."""
+    idle = asyncio.Queue()
+    for session in sessions:
+        idle.put_nowait(session)
+
+    async def send(scheduled):
+        session = await idle.get()
+        try:
+            await execute(workload, recorder, session, scheduled)
+        finally:
+            idle.put_nowait(session)
+
+    tasks = set()
+    start = time.perf_counter()
+    sent = 0
+    while True:
+        scheduled = start + sent / rps
+        if scheduled >= deadline:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(send(scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        sent += 1
+    await asyncio.gather(*tasks)
+
+
+async def fetch_delete_ids(host, port, names, limit):
+    """
+    Lee por la API ids existentes de cada modelo para poder eliminarlos una sola vez.
+    """
+    connection = HttpConnection(host, port)
+    ids = {}
+    try:
+        for name in names:
+            ids[name] = []
+            after = ""
+            while len(ids[name]) < limit:
+                status, _headers, content = await connection.request(
+                    "GET", f"/api/{name}/?page_size={API_PAGE_SIZE}&after={after}",
+                )
+                if status != 200:
+                    break
+                page = json.loads(content)
+                ids[name].extend(item["id"] for item in page["results"])
+                if page["next"] is None:
+                    break
+                after = page["next"]
+            random.Random(name).shuffle(ids[name])
+    finally:
+        await connection.close()
+    return ids
+
+
+def summarize(recorder, elapsed):
+    """
+    Resume el throughput, las latencias y los errores de cada operación y del total.
+    """
+    def latency_stats(samples):
+        ordered = sorted(samples)
+
+        def at(fraction):
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+        return {
+            "p50_ms": at(0.50),
+            "p90_ms": at(0.90),
+            "p99_ms": at(0.99),
+            "max_ms": ordered[-1] * 1000,
+            "mean_ms": statistics.fmean(ordered) * 1000,
+        }
+
+    summary = {}
+    all_samples = []
+    for operation, samples in sorted(recorder.latencies.items()):
+        all_samples.extend(samples)
+        summary[operation] = {
+            "requests": len(samples),
+            "throughput_rps": len(samples) / elapsed,
+            "error_rate": recorder.errors[operation] / len(samples),
+            "statuses": {str(status): count for status, count in recorder.statuses[operation].items()},
+            **latency_stats(samples),
+        }
+    if all_samples:
+        summary["total"] = {
+            "requests": len(all_samples),
+            "throughput_rps": len(all_samples) / elapsed,
+            "error_rate": sum(recorder.errors.values()) / len(all_samples),
+            **latency_stats(all_samples),
+        }
+    return summary
+
+
+def print_summary(summary):
+    """
+    Imprime el resumen como tabla.
+    """
+    print(f"{'operación':<10} {'solicitudes':>11} {'req/s':>9} {'errores':>8} "
+          f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'máx ms':>9}")
+    for operation, stats in summary.items():
+        print(
+            f"{operation:<10} {stats['requests']:11} {stats['throughput_rps']:9.1f} "
+            f"{stats['error_rate']:8.1%} {stats['p50_ms']:9.2f} {stats['p90_ms']:9.2f} "
+            f"{stats['p99_ms']:9.2f} {stats['max_ms']:9.2f}",
+        )
+        if "statuses" in stats:
+            print(f"{'':<10} estados: {stats['statuses']}")
+
+
+def parse_mix(value):
+    """
+    Interpreta una mezcla como ``repo=80,form=15,delete=5``.
+    """
+    mix = {}
+    for part in value.split(","):
+        operation, _, weight = part.partition("=")
+        if operation not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Operación desconocida: {operation}")
+        mix[operation] = float(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("La mezcla no tiene operaciones")
+    return mix
+
+
+def free_port():
+    """
+    Devuelve un puerto TCP libre en la interfaz local.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(server, workers, port):
+    """
+    Devuelve el comando que levanta la aplicación, como en el Dockerfile.
+    """
+    if server == "gunicorn":
+        return [
+            sys.executable, "-m", "gunicorn", "vetsoft.asgi:application",
+            "-k", "uvicorn.workers.UvicornWorker",
+            "--workers", str(workers), "--bind", f"127.0.0.1:{port}",
+        ]
+    return [
+        sys.executable, "-m", "uvicorn", "vetsoft.asgi:application",
+        "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port),
+        "--no-access-log",
+    ]
+
+
+def prepare_database(env, rows):
+    """
+    Migra la base del servidor y la carga con ``rows`` registros por modelo.
+    """
+    subprocess.run([sys.executable, "manage.py", "migrate", "-v", "0"], env=env, check=True)
+    if rows:
+        counts = [f"--{kind}={rows}" for kind in seed.GENERATORS]
+        subprocess.run([sys.executable, "manage.py", "seed", *counts], env=env, check=True)
+
+
+def wait_until_ready(host, port, process, timeout=30.0):
+    """
+    Espera a que el servidor acepte conexiones.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"El servidor terminó con código {process.returncode}")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {timeout:.0f}s")
+
+
+async def drive(host, port, args):
+    """
+    Ejecuta la carga contra el servidor y devuelve el resumen.
+    """
+    names = [entry.name for entry in crud.registry.values()]
+    delete_ids = {}
+    if args.mix.get("delete"):
+        delete_ids = await fetch_delete_ids(host, port, names, DELETE_POOL_SIZE)
+
+    workload = Workload(args.mix, random.Random(args.seed), delete_ids)
+    sessions = [Session(host, port) for _ in range(args.concurrency)]
+    start = time.perf_counter()
+    recorder = Recorder(measure_from=start + args.warmup)
+    deadline = start + args.warmup + args.duration
+    try:
+        if args.rps:
+            await open_loop(workload, recorder, sessions, deadline, args.rps)
+        else:
+            await closed_loop(workload, recorder, sessions, deadline)
+    finally:
+        for session in sessions:
+            await session.connection.close()
+
+    return summarize(recorder, time.perf_counter() - recorder.measure_from)
+
+
+def main():
+    """
+    Levanta el servidor (salvo con ``--url``), ejecuta la carga e informa los resultados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=("gunicorn", "uvicorn"), default="gunicorn")
+    parser.add_argument("--url", help="Probar un servidor ya levantado (por ejemplo http://127.0.0.1:8000)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Usuarios simultáneos (en lazo abierto, solicitudes en curso como máximo)")
+    parser.add_argument("--rps", type=float, help="Solicitudes por segundo (lazo abierto)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos medidos")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Segundos iniciales que no se miden")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("repo=80,form=15,delete=5"))
+    parser.add_argument("--rows", type=int, default=10000, help="Registros por modelo que se cargan antes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Guardar el resumen en este archivo JSON")
+    args = parser.parse_args()
+
+    if args.url:
+        target = urlsplit(args.url)
+        summary = asyncio.run(drive(target.hostname, target.port or 80, args))
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                "DEBUG": "",
+                "SQLITE_PATH": os.path.join(directory, "load.sqlite3"),
+                # Caché de versiones propia de esta base, compartida sólo por sus workers.
+                "VERSION_CACHE_LOCATION": os.path.join(directory, "versions"),
+            }
+            prepare_database(env, args.rows)
+            port = free_port()
+            process = subprocess.Popen(server_command(args.server, args.workers, port), env=env)
+            try:
+                wait_until_ready("127.0.0.1", port, process)
+                summary = asyncio.run(drive("127.0.0.1", port, args))
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"arguments": {**vars(args), "mix": args.mix}, "summary": summary}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark de SQLite con y sin el perfil de rendimiento de ``app.sqlite_profile``.
+
+Lanza varios procesos que escriben y leen sobre el mismo archivo, como varios
+workers de uvicorn, y cuenta las operaciones por segundo y los errores
+``database is locked`` de cada configuración.
+
+Uso: ``python -m benchmarks.sqlite_profile [--workers N] [--seconds S]``
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from app.sqlite_profile import DEFAULT_PRAGMAS
+
+# Mismo timeout de conexión que usa Django por defecto con SQLite.
+DEFAULT_TIMEOUT = 5.0
+
+
+def connect(path, pragmas):
+    """
+    Abre una conexión y aplica los PRAGMA indicados.
+    """
+    connection = sqlite3.connect(path, timeout=DEFAULT_TIMEOUT)
+    for name, value in pragmas.items():
+        connection.execute(f"PRAGMA {name} = {value}")
+    return connection
+
+
+def worker(path, pragmas, seconds, write_ratio, results):
+    """
+    Ejecuta lecturas y escrituras hasta agotar el tiempo y guarda sus contadores.
+    """
+    connection = connect(path, pragmas)
+    reads = writes = locked = 0
+    deadline = time.perf_counter() + seconds
+    operation = 0
+
+    while time.perf_counter() < deadline:
+        operation += 1
+        try:
+            if operation % 100 < write_ratio * 100:
+                connection.execute(
+                    "INSERT INTO client (name, email, phone) VALUES (?, ?, ?)",
+                    ("Cliente", f"cliente{operation}@vetsoft.com", "54221555232"),
+                )
+                connection.commit()
+                writes += 1
+            else:
+                connection.execute(
+                    "SELECT id, name, email FROM client ORDER BY id DESC LIMIT 50",
+                ).fetchall()
+                reads += 1
+        except sqlite3.OperationalError:
+            connection.rollback()
+            locked += 1
+
+    connection.close()
+    results.put((reads, writes, locked))
+
+
+def run(name, pragmas, args):
+    """
+    Ejecuta una configuración con todos los workers e imprime el resultado.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite3")
+        setup = connect(path, pragmas)
+        setup.execute(
+            "CREATE TABLE client (id INTEGER PRIMARY KEY, name TEXT, email TEXT, phone TEXT)",
+        )
+        setup.commit()
+        setup.close()
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=worker, args=(path, pragmas, args.seconds, args.write_ratio, results),
+            )
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    reads, writes, locked = (sum(values) for values in zip(*totals))
+    print(
+        f"{name:>10}: {reads / args.seconds:10,.0f} lecturas/s "
+        f"{writes / args.seconds:10,.0f} escrituras/s {locked:6} bloqueos",
+    )
+
+
+def main():
+    """
+    Compara la configuración por defecto de SQLite con el perfil de rendimiento.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    run("default", {}, args)
+    run("perfil", DEFAULT_PRAGMAS, args)
+
+
+if __name__ == "__main__":
+    main()
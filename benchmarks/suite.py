@@ -0,0 +1,342 @@
+"""
+Suite de benchmarks de las rutas críticas de Vetsoft.
+
+Carga datos con ``app.seed`` en una base de datos propia (la base de tests del
+alias ``default``, nunca la de desarrollo) y mide, para cada tamaño de tabla:
+
+- los repositorios de los cinco modelos (``*_repo``),
+- el alta por formulario (POST a ``*_form``),
+- ``validate_fields`` y cada validador,
+- los context processors de la navegación.
+
+De cada caso informa los percentiles de latencia, las consultas por solicitud y
+el pico de memoria, y guarda el resultado en JSON para compararlo contra una
+corrida anterior.
+
+Uso: ``python -m benchmarks.suite [--rows 1000,100000] [--output results.json]
+[--baseline baseline.json] [--threshold 0.2]``
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vetsoft.settings")
+# Las versiones de los modelos de la base del benchmark no deben mezclarse con las
+# del servidor de desarrollo, que viven en una caché en disco compartida.
+os.environ.setdefault("VERSION_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import Client, RequestFactory  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    setup_test_environment,
+)
+from django.urls import reverse  # noqa: E402
+
+from app import context_processors, crud, seed, validation  # noqa: E402
+from app.models import validate_fields  # noqa: E402
+
+# Percentiles que se comparan contra la corrida anterior; con pocas solicitudes
+# por caso el p99 es demasiado ruidoso para decidir una regresión.
+COMPARED_METRICS = ("p50_ms", "p95_ms")
+
+# Llamadas promediadas en cada muestra de los validadores y context processors.
+MICRO_BATCH = 50
+
+VALIDATOR_SAMPLES = {
+    "validate_vetsoft_name": (validation.validate_vetsoft_name, "Juan Sebastián Verón"),
+    "validate_vetsoft_email": (validation.validate_vetsoft_email, "brujita75@vetsoft.com"),
+    "validate_phone": (validation.validate_phone, "54221555232"),
+    "validate_date_of_birthday": (validation.validate_date_of_birthday, "2020-03-15"),
+    "validate_price": (validation.validate_price, "1500.5"),
+    "validate_weight": (validation.validate_weight, "12"),
+    "validate_dose": (validation.validate_dose, "5"),
+}
+
+
+def percentiles(samples):
+    """
+    Resume una lista de latencias (en segundos) en milisegundos.
+    """
+    ordered = sorted(samples)
+
+    def at(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": at(0.50),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+    }
+
+
+def measure(function, iterations, warmup=3, batch=1):
+    """
+    Mide ``function`` ``iterations`` veces y luego una vez más con las consultas
+    capturadas y ``tracemalloc`` activo, para no sumar ese costo a la latencia.
+
+    Con ``batch > 1`` cada muestra es el promedio de ``batch`` llamadas, para que
+    las funciones de microsegundos no queden por debajo de la resolución del reloj.
+    """
+    for _ in range(warmup):
+        function()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for _ in range(batch):
+            function()
+        samples.append((time.perf_counter() - start) / batch)
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            function()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {**percentiles(samples), "queries": len(queries), "peak_kb": peak / 1024}
+
+
+def consume(response):
+    """
+    Lee la respuesta completa, incluida la de streaming, y verifica que sea exitosa.
+    """
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request['PATH_INFO']} respondió {response.status_code}")
+    if response.streaming:
+        for _chunk in response.streaming_content:
+            pass
+
+
+def bench_repositories(client, iterations):
+    """
+    Repositorio de cada modelo, con su página por defecto.
+    """
+    results = {}
+    for entry in crud.registry.values():
+        url = reverse(entry.url_names["repo"])
+        results[entry.url_names["repo"]] = measure(lambda url=url: consume(client.get(url)), iterations)
+    return results
+
+
+def bench_forms(client, iterations, offset):
+    """
+    Alta de un registro por formulario de cada modelo.
+    """
+    results = {}
+    for kind, entry in crud.registry.items():
+        url = reverse(entry.url_names["form"])
+        rows = iter(seed.generate(kind, offset, offset + iterations + 10, seed="formularios"))
+
+        def post(url=url, rows=rows):
+            data = {field: str(value) for field, value in next(rows).items()}
+            consume(client.post(url, data))
+
+        results[f"{entry.url_names['form']}_post"] = measure(post, iterations)
+    return results
+
+
+def bench_validators(iterations):
+    """
+    ``validate_fields`` con los campos de cada modelo y cada validador por separado.
+    """
+    results = {}
+    for kind, (model, _make_row) in seed.GENERATORS.items():
+        data = {field: str(value) for field, value in seed.generate(kind, 0, 1, seed=0)[0].items()}
+        fields = model.get_required_fields()
+        results[f"validate_fields[{kind}]"] = measure(
+            lambda data=data, fields=fields: validate_fields(data, fields),
+            iterations // MICRO_BATCH, batch=MICRO_BATCH,
+        )
+    for name, (validator, value) in VALIDATOR_SAMPLES.items():
+        results[name] = measure(
+            lambda validator=validator, value=value: validator(value),
+            iterations // MICRO_BATCH, batch=MICRO_BATCH,
+        )
+    return results
+
+
+def bench_context_processors(iterations):
+    """
+    Context processors globales, recorriendo los valores como lo haría una plantilla.
+    """
+    request = RequestFactory().get(reverse("clients_repo"))
+    results = {}
+    for name in ("navbar", "home_items"):
+        processor = getattr(context_processors, name)
+
+        def render(processor=processor):
+            for value in processor(request).values():
+                list(value)
+
+        results[name] = measure(render, iterations // MICRO_BATCH, batch=MICRO_BATCH)
+    return results
+
+
+def fill(size, current):
+    """
+    Completa cada tabla hasta ``size`` filas.
+    """
+    missing = size - current
+    if missing > 0:
+        print(f"Cargando {missing:,} filas por modelo...", file=sys.stderr)
+        seed.seed(dict.fromkeys(seed.GENERATORS, missing), seed=size, index=False)
+
+
+def run(sizes, iterations, micro_iterations):
+    """
+    Ejecuta todos los casos para cada tamaño de tabla y devuelve los resultados.
+    """
+    client = Client()
+    results = {}
+
+    for name, result in bench_validators(micro_iterations).items():
+        results[name] = result
+    for name, result in bench_context_processors(micro_iterations).items():
+        results[name] = result
+
+    current = 0
+    for size in sizes:
+        fill(size, current)
+        current = size
+        for name, result in bench_repositories(client, iterations).items():
+            results[f"{name}@{size}"] = result
+        for name, result in bench_forms(client, iterations, offset=size).items():
+            results[f"{name}@{size}"] = result
+        # Los formularios agregan filas: se descuentan para el próximo tamaño.
+        current += iterations + 4
+
+    return results
+
+
+def git_revision():
+    """
+    Devuelve el commit actual, si el código está en un repositorio git.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold, min_delta_ms=0.0):
+    """
+    Compara contra una corrida anterior y devuelve las regresiones encontradas.
+
+    Es regresión un p50 o p95 que empeora más de ``threshold`` (0.2 = 20%) y más
+    de ``min_delta_ms`` en términos absolutos, o cualquier consulta de más por
+    solicitud.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            worse = result[metric] > previous[metric] * (1 + threshold)
+            if previous[metric] > 0 and worse and result[metric] - previous[metric] > min_delta_ms:
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]:.3f} -> {result[metric]:.3f} "
+                    f"(+{result[metric] / previous[metric] - 1:.0%})",
+                )
+        if result["queries"] > previous["queries"]:
+            regressions.append(f"{name}: consultas {previous['queries']} -> {result['queries']}")
+    return regressions
+
+
+def print_table(results, baseline):
+    """
+    Imprime los resultados y, si hay, la variación de p50 contra la corrida anterior.
+    """
+    print(f"{'caso':<40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'consultas':>9} {'pico KB':>9}  vs base")
+    for name, result in results.items():
+        change = ""
+        previous = baseline.get(name)
+        if previous and previous["p50_ms"] > 0:
+            change = f"{result['p50_ms'] / previous['p50_ms'] - 1:+.0%}"
+        print(
+            f"{name:<40} {result['p50_ms']:9.4f} {result['p95_ms']:9.4f} {result['p99_ms']:9.4f} "
+            f"{result['queries']:9} {result['peak_kb']:9.1f}  {change}",
+        )
+
+
+def main():
+    """
+    Ejecuta la suite, guarda el JSON y termina con error si hay regresiones.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000,100000",
+                        help="Tamaños de tabla separados por comas (por ejemplo 1000,100000,1000000)")
+    parser.add_argument("--iterations", type=int, default=50, help="Solicitudes por caso")
+    parser.add_argument("--micro-iterations", type=int, default=20000,
+                        help="Llamadas por caso en validadores y context processors")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Empeoramiento relativo que se considera regresión")
+    parser.add_argument("--min-delta-ms", type=float, default=0.005,
+                        help="Diferencia absoluta mínima para considerar regresión (ruido del reloj)")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.rows.split(","))
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+
+    setup_test_environment()
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            results = run(sizes, args.iterations, args.micro_iterations)
+            vendor = connection.vendor
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": vendor,
+            "rows": sizes,
+            "iterations": args.iterations,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    print_table(results, baseline)
+    print(f"\nResultados guardados en {args.output}")
+
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print("\nRegresiones:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
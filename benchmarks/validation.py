@@ -0,0 +1,119 @@
+"""
+Microbenchmark de la validación de formularios.
+
+Compara la cadena ``if/elif`` original de ``validate_fields`` con los esquemas
+compilados de ``app.validation`` sobre un lote de filas de clientes y productos.
+
+Uso: ``python -m benchmarks.validation [--rows N] [--repeat N]``
+"""
+import argparse
+import re
+import timeit
+from datetime import datetime
+
+from app import validation
+
+CLIENT_FIELDS = {"name": "nombre", "email": "email", "phone": "teléfono"}
+PRODUCT_FIELDS = {"name": "nombre", "type": "tipo", "price": "precio"}
+
+
+def legacy_validate_fields(data, required_fields):
+    """
+    Copia de ``validate_fields`` antes de los esquemas compilados (sin el ``print``).
+    """
+    errors = {}
+
+    for key, value in required_fields.items():
+        field_value = data.get(key, "")
+
+        if field_value == "":
+            errors[key] = f"Por favor ingrese un {value}"
+        elif key == 'name':
+            if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚ\s]+$', field_value):
+                errors["name"] = "El nombre solo debe contener letras y espacios"
+        elif key == 'email':
+            if not re.match(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b', field_value):
+                errors["email"] = "Por favor ingrese un email valido"
+            elif not re.match(r'^[a-zA-Z0-9._%+-]+@vetsoft\.com$', field_value):
+                errors["email"] = "El email debe finalizar con @vetsoft.com"
+        elif key == 'price' and float(field_value) < 0.0:
+            errors["price"] = "El precio debe ser mayor a cero"
+        elif key == 'weight' and int(field_value) < 0:
+            errors["weight"] = "El peso de la mascota no puede ser negativo"
+        elif key == 'birthday':
+            try:
+                if datetime.strptime(field_value, '%Y-%m-%d') > datetime.today():
+                    errors["birthday"] = "La fecha no puede ser mayor al dia de hoy"
+            except ValueError:
+                errors["birthday"] = "Formato de fecha incorrecto"
+        elif key == 'dose' and (int(field_value) < 1 or int(field_value) > 10):
+            errors["dose"] = "La dosis debe estar entre 1 y 10"
+        elif key == 'phone':
+            if not field_value.isnumeric():
+                errors["phone"] = "El teléfono indicado debe contener sólo números"
+            elif not re.match(r'^54', field_value):
+                errors["phone"] = "El teléfono debe comenzar siempre con 54"
+    return errors
+
+
+def build_rows(amount):
+    """
+    Genera filas de clientes y productos, con una de cada diez inválida.
+    """
+    clients = [
+        {
+            "name": "Cliente Número" if i % 10 else "Cliente 1",
+            "email": f"cliente{i}@vetsoft.com" if i % 10 else f"cliente{i}@gmail.com",
+            "phone": f"54221{i:06d}",
+        }
+        for i in range(amount)
+    ]
+    products = [
+        {"name": "Producto", "type": "alimento", "price": str(i % 100 - (i % 10 == 0))}
+        for i in range(amount)
+    ]
+    return clients, products
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime el tiempo de cada implementación.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    clients, products = build_rows(args.rows)
+    client_schema = validation.compile_schema(CLIENT_FIELDS)
+    product_schema = validation.compile_schema(PRODUCT_FIELDS)
+
+    assert client_schema.validate_many(clients) == [
+        legacy_validate_fields(row, CLIENT_FIELDS) for row in clients
+    ]
+    assert product_schema.validate_many(products) == [
+        legacy_validate_fields(row, PRODUCT_FIELDS) for row in products
+    ]
+
+    def legacy():
+        for row in clients:
+            legacy_validate_fields(row, CLIENT_FIELDS)
+        for row in products:
+            legacy_validate_fields(row, PRODUCT_FIELDS)
+
+    def compiled():
+        client_schema.validate_many(clients)
+        product_schema.validate_many(products)
+
+    total_rows = 2 * args.rows
+    results = {}
+    for name, function in (("if/elif", legacy), ("esquema", compiled)):
+        best = min(timeit.repeat(function, number=1, repeat=args.repeat))
+        results[name] = best
+        print(f"{name:>10}: {best * 1000:8.1f} ms  ({total_rows / best:,.0f} filas/s)")
+
+    print(f"{'mejora':>10}: {results['if/elif'] / results['esquema']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
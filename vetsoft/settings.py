@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -47,12 +48,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "app.timing.server_timing_middleware",
+    "app.query_budget.query_budget_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "app.routers.replica_pin_middleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -60,7 +64,7 @@ ROOT_URLCONF = "vetsoft.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "app.timing.DjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -88,18 +92,129 @@ if ENVIRONMENT == 'local':
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
         },
     }
 elif ENVIRONMENT == 'development':
+    # Las conexiones se toman de un pool por proceso (app/backends/postgresql_pool);
+    # CONN_MAX_AGE = 0 hace que cada conexión vuelva al pool al terminar la solicitud.
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.postgresql',
+            'ENGINE': 'app.backends.postgresql_pool',
             'NAME': os.getenv('POSTGRES_DATABASE'),
             'USER': os.getenv('POSTGRES_USER'),
             'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
             'HOST': os.getenv('POSTGRES_HOST'),
             'PORT': os.getenv('POSTGRES_DB_PORT'),
+            'CONN_MAX_AGE': 0,
+            'POOL': {
+                'MIN_SIZE': int(os.getenv('POSTGRES_POOL_MIN_SIZE', 1)),
+                'MAX_SIZE': int(os.getenv('POSTGRES_POOL_MAX_SIZE', 10)),
+                'TIMEOUT': float(os.getenv('POSTGRES_POOL_TIMEOUT', 30)),
+            },
+        },
+    }
+
+
+# Réplicas de lectura
+# SQLITE_REPLICAS (entorno local) es una lista de archivos y POSTGRES_REPLICA_HOSTS
+# (entorno development) una lista de host[:puerto], separados por comas. Los
+# repositorios leen de las réplicas; las escrituras, y las lecturas durante los
+# REPLICA_PIN_SECONDS siguientes, usan la base principal.
+
+if ENVIRONMENT == 'local':
+    REPLICA_SETTINGS = [
+        {**DATABASES['default'], 'NAME': name}
+        for name in os.environ.get('SQLITE_REPLICAS', '').split(',') if name
+    ]
+else:
+    REPLICA_SETTINGS = [
+        {**DATABASES['default'], 'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+        for host, _, port in (
+            address.partition(':')
+            for address in os.environ.get('POSTGRES_REPLICA_HOSTS', '').split(',') if address
+        )
+    ]
+
+DATABASE_REPLICAS = []
+for number, replica in enumerate(REPLICA_SETTINGS, start=1):
+    DATABASES[f'replica{number}'] = {**replica, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['app.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+# Perfil de rendimiento de SQLite (WAL, synchronous=NORMAL, mmap, caché y busy
+# timeout con reintentos) aplicado a cada conexión; recomendado con varios workers.
+SQLITE_PERFORMANCE_PROFILE = os.environ.get('SQLITE_PERFORMANCE_PROFILE', 'False') == 'True'
+
+
+# Repository pagination
+# Los repositorios se paginan por cursor; el total exacto sólo se calcula con ?count=1
+
+REPOSITORY_PAGE_SIZE = int(os.environ.get('REPOSITORY_PAGE_SIZE', 50))
+REPOSITORY_MAX_PAGE_SIZE = int(os.environ.get('REPOSITORY_MAX_PAGE_SIZE', 500))
+REPOSITORY_EXACT_COUNT = os.environ.get('REPOSITORY_EXACT_COUNT', 'False') == 'True'
+
+# Filas leídas y enviadas por bloque cuando un repositorio se pide con ?stream=1
+REPOSITORY_STREAM_CHUNK_SIZE = int(os.environ.get('REPOSITORY_STREAM_CHUNK_SIZE', 500))
+
+
+# Cache
+# Las versiones de los modelos que usan las respuestas condicionales (ETag) deben
+# compartirse entre todos los workers, por eso viven en una caché propia.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'versions': {
+        'BACKEND': os.environ.get(
+            'VERSION_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.environ.get(
+            'VERSION_CACHE_LOCATION',
+            os.path.join(tempfile.gettempdir(), 'vetsoft-versions'),
+        ),
+    },
+}
+
+VERSION_CACHE_ALIAS = 'versions'
+
+# Identificador de la versión desplegada (por ejemplo, el commit). Se incluye en
+# los ETag para que un despliegue que cambia el HTML no siga respondiendo 304; si
+# no se define se usa una huella del código y las plantillas de la aplicación.
+BUILD_ID = os.environ.get('BUILD_ID')
+
+# Filas de los repositorios ya renderizadas, en una LRU en memoria por proceso
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 10000))
+FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+
+# Log de consultas SQL
+# Con DEBUG activo, Django registra cada consulta en el logger django.db.backends;
+# si se define QUERY_LOG_FILE se guardan en ese archivo para analizarlas con
+# `python manage.py advise_indexes <archivo>`.
+
+QUERY_LOG_FILE = os.environ.get('QUERY_LOG_FILE')
+
+if QUERY_LOG_FILE:
+    LOGGING = {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'handlers': {
+            'queries': {
+                'class': 'logging.FileHandler',
+                'filename': QUERY_LOG_FILE,
+            },
+        },
+        'loggers': {
+            'django.db.backends': {
+                'handlers': ['queries'],
+                'level': 'DEBUG',
+                'propagate': False,
+            },
         },
     }
 
@@ -144,3 +259,34 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Presupuesto de consultas
+# Con QUERY_BUDGET_MODE = warn (staging) o fail se registran las consultas de cada
+# solicitud y se avisa, o falla, si superan el presupuesto de su URL declarado en
+# app/urls.py o si repiten N_PLUS_ONE_THRESHOLD veces la misma consulta (N+1). Las
+# consultas de más de SLOW_QUERY_MS se registran con sus parámetros y su plan en
+# el logger app.queries. Los tests siempre corren en modo fail.
+
+QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE')
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+TEST_RUNNER = 'app.test_runner.VetsoftTestRunner'
+
+
+# Métricas
+# /metrics expone las métricas en el formato de Prometheus. Con varios workers,
+# METRICS_DIR debe apuntar a un directorio compartido donde cada proceso guarda
+# sus contadores (como mucho cada METRICS_FLUSH_INTERVAL segundos) para que
+# cualquier worker informe el total. Al leer /metrics, los contadores de los
+# workers que terminaron se suman a un solo archivo y se borran los suyos.
+
+#
+# vetsoft_model_rows usa las estadísticas de la base (pg_class en Postgres,
+# sqlite_stat1 en SQLite). Las tablas sin estadísticas, como las de SQLite
+# hasta que se ejecuta ANALYZE, se cuentan hasta METRICS_ROW_COUNT_LIMIT filas:
+# una tabla más grande se informa con ese valor.
+
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1.0))
+METRICS_ROW_COUNT_LIMIT = int(os.environ.get('METRICS_ROW_COUNT_LIMIT', 10_000))